@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Entity and Issue Extraction on Large Filings
+=======================================================
+Compares three approaches on synthetic multi-megabyte complaints:
+
+- legacy:   the previous main.py helpers (first 10 lines, one lower() per term)
+- per-term: the legacy scan style applied to the full extractor taxonomy
+- extractor: src.core.extractor (one lowercase copy, anchor scans, trie regex)
+
+Two corpora are generated: "dense" repeats a real complaint so issue terms
+recur throughout, "sparse" pads it with term-free filler (worst case: every
+anchor scans the whole document).
+
+Usage:
+    python benchmarks/bench_extractor.py [--sizes-mb 1 4 16] [--repeat 3]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.extractor import ISSUE_TAXONOMY, extract_parties_and_issues, normalize_case_type
+
+
+def legacy_extract_parties(complaint_text):
+    parties = []
+    lines = complaint_text.split('\n')
+    for line in lines[:10]:
+        if 'plaintiff' in line.lower() or 'defendant' in line.lower():
+            words = line.split()
+            for i, word in enumerate(words):
+                if word.lower() in ['plaintiff', 'defendant'] and i > 0:
+                    parties.append(words[i - 1])
+    return parties if parties else ["Party A", "Party B"]
+
+
+def legacy_extract_key_issues(complaint_text, case_type):
+    issues = []
+    if "IP" in case_type or "intellectual" in case_type.lower():
+        for term in ["patent", "trademark", "copyright", "trade secret", "infringement"]:
+            if term in complaint_text.lower():
+                issues.append(f"{term.title()} dispute")
+    elif "contract" in case_type.lower():
+        for term in ["breach", "performance", "termination", "damages"]:
+            if term in complaint_text.lower():
+                issues.append(f"Contract {term}")
+    if not issues:
+        issues = ["Primary legal dispute", "Damages assessment", "Remedy determination"]
+    return issues
+
+
+def per_term_extract(complaint_text, case_type):
+    case_type = normalize_case_type(case_type)
+    if case_type in ISSUE_TAXONOMY:
+        terms = ISSUE_TAXONOMY[case_type]
+    else:
+        terms = {term: label for group in ISSUE_TAXONOMY.values() for term, label in group.items()}
+    issues = []
+    for term, label in terms.items():
+        if term.rstrip("*") in complaint_text.lower() and label not in issues:
+            issues.append(label)
+    parties = []
+    for line in complaint_text.split('\n'):
+        if 'plaintiff' in line.lower() or 'defendant' in line.lower():
+            parties.append(line)
+    return parties, issues
+
+
+def build_filing(size_mb, corpus):
+    scenarios = json.loads((project_root / "test_scenarios.json").read_text())["scenarios"]
+    head = scenarios[1]["complaint_text"] + "\n\n"
+    if corpus == "dense":
+        filler = scenarios[0]["complaint_text"] + "\n\n" + head
+    else:
+        # Filler paragraphs without taxonomy terms so matchers must scan everything
+        filler = (
+            "The parties exchanged correspondence regarding the schedule of the "
+            "project and the allocation of engineering resources for the quarter.\n\n"
+        )
+    target = size_mb * 1024 * 1024
+    body = filler * (target // len(filler) + 1)
+    return (head + body)[:target]
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'corpus':>7} {'size':>6} {'case':>9} {'legacy_ms':>10} {'per_term_ms':>12} "
+          f"{'extractor_ms':>13} {'vs_per_term':>12}")
+    for corpus in ("dense", "sparse"):
+        for size_mb in args.sizes_mb:
+            text = build_filing(size_mb, corpus)
+            for case_type in ("IP", "Contract", "Other"):
+                legacy_time, _ = timed(
+                    lambda: (legacy_extract_parties(text), legacy_extract_key_issues(text, case_type)),
+                    args.repeat
+                )
+                per_term_time, _ = timed(lambda: per_term_extract(text, case_type), args.repeat)
+                new_time, _ = timed(lambda: extract_parties_and_issues(text, case_type), args.repeat)
+                print(f"{corpus:>7} {size_mb:>4}MB {case_type:>9} {legacy_time * 1000:>10.1f} "
+                      f"{per_term_time * 1000:>12.1f} {new_time * 1000:>13.1f} "
+                      f"{per_term_time / new_time:>11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Per-Section Record Memory and Allocations
+====================================================
+Builds the per-section data the agent keeps for every generated section
+and compares two representations:
+
+- dicts:   the previous report item dict, pydantic TokenUsage and audit
+           dict holding its own context and output preview copies
+- records: src.models.records SectionRecord, UsageRecord and AuditRecord
+
+Memory is what stays allocated per report (tracemalloc, section texts
+excluded since both share them); blocks are the live allocations behind
+that memory; time is the build time per report.
+
+Usage:
+    python benchmarks/bench_records.py [--reports 2000] [--sections 4]
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.blob_store import content_hash
+from src.models.legal_models import TokenUsage
+from src.models.records import AuditRecord, SectionRecord, UsageRecord
+
+SECTION_NAMES = ["Market Overview", "Competitive Analysis", "Risk Assessment", "Strategic Recommendations"]
+
+
+def build_texts(reports, sections):
+    """Distinct section contents and chain contexts, shared by both representations."""
+    paragraph = (
+        "The plaintiff alleges infringement of three patents covering the synchronization "
+        "protocol, and seeks damages and a preliminary injunction against the defendant. "
+    )
+    texts = list()
+    for r in range(reports):
+        context = f"SCENARIO:\nCase {r}\n\n" + paragraph * 4
+        report = list()
+        for s in range(sections):
+            content = f"## Section {s} of report {r}\n" + paragraph * 12
+            report.append((SECTION_NAMES[s % len(SECTION_NAMES)], content, context))
+            context += f"\n\n--- COMPLETED SECTION ---\n{content}"
+        texts.append(report)
+    return texts
+
+
+def as_dicts(report):
+    items = list()
+    for name, content, context in report:
+        usage = TokenUsage(input_tokens=1200, output_tokens=450, total_tokens=1650)
+        audit = {
+            "section": name,
+            "timestamp": datetime.now().isoformat(),
+            "latency_seconds": 2.5,
+            "cost_usd": 0.0003,
+            "tokens_used": usage.total_tokens,
+            "quality_score": 0.82,
+            "generation_mode": "sequential",
+            "model": "gemini-2.0-flash-lite",
+            "cascade_tier": 0,
+            "cascade_attempts": [],
+            "input_context_preview": context[:300] + "...",
+            "output_preview": content[:300] + "...",
+            "content_hash": content_hash(content)
+        }
+        items.append(dict(title=name, agent_type="strategic_consultant", content=content, metrics=usage, audit=audit))
+    return items
+
+
+def as_records(report):
+    items = list()
+    for name, content, context in report:
+        usage = UsageRecord(1200, 450)
+        audit = AuditRecord(
+            section=name,
+            timestamp=datetime.now().isoformat(),
+            latency_seconds=2.5,
+            cost_usd=0.0003,
+            tokens_used=usage.total_tokens,
+            quality_score=0.82,
+            generation_mode="sequential",
+            model="gemini-2.0-flash-lite",
+            cascade_tier=0,
+            cascade_attempts=[],
+            content=content,
+            context=context,
+            content_hash=content_hash(content)
+        )
+        items.append(SectionRecord(name, "strategic_consultant", content, usage, audit))
+    return items
+
+
+def measure(build, texts):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    reports = [build(report) for report in texts]
+    elapsed = time.perf_counter() - start
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = snapshot.statistics("filename")
+    retained = sum(stat.size for stat in stats)
+    blocks = sum(stat.count for stat in stats)
+    del reports
+    return retained, blocks, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reports", type=int, default=2000)
+    parser.add_argument("--sections", type=int, default=4)
+    args = parser.parse_args()
+
+    texts = build_texts(args.reports, args.sections)
+    print(f"{'representation':>15} {'bytes/report':>13} {'blocks/report':>14} {'us/report':>10}")
+    results = dict()
+    for label, build in (("dicts", as_dicts), ("records", as_records)):
+        retained, blocks, elapsed = measure(build, texts)
+        results[label] = retained
+        print(f"{label:>15} {retained / args.reports:>13.0f} {blocks / args.reports:>14.1f} "
+              f"{elapsed / args.reports * 1e6:>10.1f}")
+    print(f"records retain {results['dicts'] / results['records']:.2f}x less memory per report")
+
+
+if __name__ == "__main__":
+    main()
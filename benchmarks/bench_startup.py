@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Cold Start (Import and First Request)
+================================================
+Measures what a new worker pays before serving its first request, each
+in a fresh interpreter:
+
+- import:        `python -X importtime -c "import main"`, cumulative time
+                 of main and the slowest modules it pulls in
+- first request: importing main (and the test client), running the
+                 startup event and serving GET /health; Vertex AI is not
+                 contacted (LAZY_MODEL_INIT)
+
+The best of --repeat runs is compared with the budget stored in
+benchmarks/startup_budget.json; the script exits non-zero when either
+exceeds its budget times the stored tolerance, so it can gate CI.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 3] [--top 10] [--update]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+BUDGET_PATH = project_root / "benchmarks" / "startup_budget.json"
+
+# Allowed slowdown over the stored budget before the check fails
+DEFAULT_TOLERANCE = 1.5
+
+FIRST_REQUEST_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import main
+from fastapi.testclient import TestClient
+imported = time.perf_counter()
+with TestClient(main.app) as client:
+    response = client.get("/health")
+done = time.perf_counter()
+assert response.status_code == 200, response.text
+print(json.dumps(dict(import_ms=(imported - start) * 1000, first_request_ms=(done - start) * 1000)))
+"""
+
+
+def environment():
+    env = dict(os.environ)
+    env.update(
+        PROJECT_ID=env.get("PROJECT_ID") or "bench-project",
+        LAZY_MODEL_INIT="true",
+        REPORT_DB_PATH=":memory:",
+        AUDIT_STORE_DIR=tempfile.mkdtemp(),
+        PYTHONDONTWRITEBYTECODE="1"
+    )
+    return env
+
+
+def import_profile():
+    """(main cumulative ms, [(module, cumulative ms)]) from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=project_root, env=environment(), capture_output=True, text=True, check=True
+    )
+    modules = list()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((name.rstrip(), int(cumulative) / 1000))
+    main_ms = next(ms for name, ms in modules if name.strip() == "main")
+    return main_ms, modules
+
+
+def first_request():
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST_SCRIPT],
+        cwd=project_root, env=environment(), capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--update", action="store_true", help="Store this run as the new budget")
+    args = parser.parse_args()
+
+    runs = [import_profile() for _ in range(args.repeat)]
+    import_ms, modules = min(runs, key=lambda run: run[0])
+    first_request_ms = min(first_request()["first_request_ms"] for _ in range(args.repeat))
+
+    print(f"Slowest imports under main (cumulative, best of {args.repeat}):")
+    for name, ms in sorted(modules, key=lambda m: m[1], reverse=True)[:args.top]:
+        print(f"  {ms:>9.1f} ms  {name}")
+    measured = dict(import_ms=round(import_ms, 1), first_request_ms=round(first_request_ms, 1))
+    print(f"import main:            {measured['import_ms']:>9.1f} ms")
+    print(f"import + first request: {measured['first_request_ms']:>9.1f} ms")
+
+    if args.update or not BUDGET_PATH.exists():
+        budget = dict(measured, tolerance=DEFAULT_TOLERANCE)
+        BUDGET_PATH.write_text(json.dumps(budget, indent=4) + "\n")
+        print(f"Budget written to {BUDGET_PATH.relative_to(project_root)}")
+        return 0
+
+    budget = json.loads(BUDGET_PATH.read_text())
+    tolerance = budget.get("tolerance", DEFAULT_TOLERANCE)
+    failed = False
+    for key in ("import_ms", "first_request_ms"):
+        limit = budget[key] * tolerance
+        status = "ok" if measured[key] <= limit else "OVER BUDGET"
+        failed |= measured[key] > limit
+        print(f"{key:>17}: {measured[key]:.1f} ms (budget {budget[key]:.1f} ms x {tolerance} = {limit:.1f} ms) {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,9 +20,14 @@ Author: LexiMind Solutions Engineering Team
 
 import os
 import sys
+import asyncio
+import hmac
 import json
 import time
 import logging
+import threading
+import uuid
+from collections import Counter
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 from datetime import datetime
@@ -32,8 +37,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # FastAPI imports
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 # Add core modules to path
@@ -42,17 +47,34 @@ sys.path.append(str(Path(__file__).parent))
 # Import core components
 from src.core.agent_system import LegalIntelligenceAgent
 from src.core.quality_validator import QualityValidator
-from src.prompts.personas import LegalPersonas
+from src.core.ingestion import ComplaintIngestor, ComplaintTooLargeError
+from src.core.scheduler import SchedulerRejectedError, UrgencyScheduler
+from src.core.deadline import Deadline
+from src.core.admission import AdmissionController, AdmissionDecision
+from src.core.audit_store import AuditStore
+from src.core.dedup import NearDuplicateIndex
+from src.core.report_repository import ReportRepository
+from src.core.report_store import new_report_id
+from src.core.serialization import ReportSerializer
+from src.core.extractor import (
+    DEFAULT_ISSUES,
+    DEFAULT_PARTIES,
+    extract_parties_and_issues,
+    normalize_case_type
+)
+from src.prompts.personas import LegalPersonas, PERSONA_REGISTRY
 from src.models.legal_models import (
     LegalScenario,
     AnalysisReport,
+    ReportSection,
     AgentResponse,
     ValidationResult
 )
-from src.utils.logger import setup_logger
+from src.utils.logger import log_context, logging_stats, setup_logger, shutdown_logging
+from src.utils.profiler import MODES, ProfilerBusyError, RequestProfiler, run_in_threadpool
 
-# Initialize logging
-logger = setup_logger("legal-intelligence")
+# Initialize logging (LOG_FORMAT / LOG_ASYNC select JSON records and the queue listener)
+logger = setup_logger("legal-intelligence", os.getenv("LOG_LEVEL", "INFO"))
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -61,6 +83,26 @@ app = FastAPI(
     version="1.0.0"
 )
 
+
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    """Tag every log record of a request with its ID (taken from X-Request-ID when sent)."""
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    with log_context(request_id=request_id):
+        response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+@app.middleware("http")
+async def profiling_middleware(request: Request, call_next):
+    """Profile the request when a /debug/profile session covers it."""
+    session = profiler.claim(request.url.path)
+    if session is None:
+        return await call_next(request)
+    return await profiler.profile(session, call_next, request)
+
+
 # Global system state
 system_state = {
     "initialized": False,
@@ -76,9 +118,102 @@ CONFIG = {
     "project_id": os.getenv("PROJECT_ID", ""),
     "location": os.getenv("LOCATION", "us-central1"),
     "model": os.getenv("MODEL", "gemini-2.0-flash"),
-    "debug": os.getenv("DEBUG", "false").lower() == "true"
+    "debug": os.getenv("DEBUG", "false").lower() == "true",
+    "lazy_model_init": os.getenv("LAZY_MODEL_INIT", "true").lower() == "true",
+    "max_complaint_bytes": int(os.getenv("MAX_COMPLAINT_BYTES", str(8 * 1024 * 1024))),
+    "max_concurrent_reports": int(os.getenv("MAX_CONCURRENT_REPORTS", "4")),
+    "max_queued_reports": int(os.getenv("MAX_QUEUED_REPORTS", "64")),
+    "queue_aging_seconds": float(os.getenv("QUEUE_AGING_SECONDS", "30")),
+    "default_timeout_seconds": float(os.getenv("DEFAULT_TIMEOUT_SECONDS", "30")),
+    "admission_max_queue_depth": int(os.getenv("ADMISSION_MAX_QUEUE_DEPTH", "16")),
+    "admission_max_model_latency": float(os.getenv("ADMISSION_MAX_MODEL_LATENCY", "30")),
+    "admission_latency_window": float(os.getenv("ADMISSION_LATENCY_WINDOW_SECONDS", "60")),
+    "admission_probe_seconds": float(os.getenv("ADMISSION_PROBE_SECONDS", "5")),
+    "admission_degrade": os.getenv("ADMISSION_DEGRADE", "false").lower() == "true",
+    "degraded_sections": [name.strip() for name in os.getenv(
+        "DEGRADED_SECTIONS", "Risk Assessment,Strategic Recommendations"
+    ).split(",") if name.strip()],
+    "degraded_max_output_tokens": int(os.getenv("DEGRADED_MAX_OUTPUT_TOKENS", "1024")),
+    "report_db_path": os.getenv("REPORT_DB_PATH", "reports.db"),
+    "report_store_size": int(os.getenv("REPORT_STORE_SIZE", "500")),
+    "audit_store_dir": os.getenv("AUDIT_STORE_DIR", "audit_store"),
+    "audit_segment_size": int(os.getenv("AUDIT_SEGMENT_SIZE", "65536")),
+    "audit_flush_seconds": float(os.getenv("AUDIT_FLUSH_SECONDS", "60")),
+    "dedup_mode": os.getenv("DEDUP_MODE", "reuse").lower(),
+    "dedup_threshold": float(os.getenv("DEDUP_THRESHOLD", "0.8")),
+    "dedup_reuse_threshold": float(os.getenv("DEDUP_REUSE_THRESHOLD", "0.95")),
+    "compress_min_bytes": int(os.getenv("COMPRESS_MIN_BYTES", "1024")),
+    "serialize_offload_bytes": int(os.getenv("SERIALIZE_OFFLOAD_BYTES", "262144")),
+    "profiling_enabled": os.getenv("PROFILING_ENABLED", "false").lower() == "true",
+    "profiling_token": os.getenv("PROFILING_TOKEN", "")
 }
 
+# Seconds between client disconnect checks while a report is generated
+DISCONNECT_POLL_SECONDS = 0.5
+
+# Hands out report slots by urgency in front of the agent
+scheduler = UrgencyScheduler(
+    max_concurrency=CONFIG["max_concurrent_reports"],
+    max_queue=CONFIG["max_queued_reports"],
+    aging_seconds=CONFIG["queue_aging_seconds"]
+)
+
+# Sheds or degrades requests before they reach the scheduler queue
+admission = AdmissionController(
+    max_queue_depth=CONFIG["admission_max_queue_depth"],
+    max_model_latency=CONFIG["admission_max_model_latency"],
+    max_in_flight=CONFIG["max_concurrent_reports"],
+    concurrency=CONFIG["max_concurrent_reports"],
+    degrade=CONFIG["admission_degrade"],
+    degraded_sections=CONFIG["degraded_sections"],
+    degraded_max_output_tokens=CONFIG["degraded_max_output_tokens"],
+    probe_interval=CONFIG["admission_probe_seconds"]
+)
+
+# Generated reports by report_id (opened on first use, see _report_store), and a
+# MinHash/LSH index of their complaints
+report_store: Optional[ReportRepository] = None
+duplicate_index = NearDuplicateIndex(
+    threshold=CONFIG["dedup_threshold"],
+    max_entries=CONFIG["report_store_size"]
+)
+dedup_outcomes = Counter()
+
+# Columnar per-section audit records for /analytics (opened on first use, see _audit_store)
+audit_store: Optional[AuditStore] = None
+_store_lock = threading.Lock()
+
+# Report bodies: compiled JSON serialization with negotiated compression
+report_serializer = ReportSerializer(
+    min_compress_bytes=CONFIG["compress_min_bytes"],
+    offload_bytes=CONFIG["serialize_offload_bytes"]
+)
+
+# On-demand profiling sessions started through /debug/profile
+profiler = RequestProfiler()
+
+
+def _report_store() -> ReportRepository:
+    """The report repository, creating its database on first use rather than at import."""
+    global report_store
+    with _store_lock:
+        if report_store is None:
+            report_store = ReportRepository(CONFIG["report_db_path"], cache_size=CONFIG["report_store_size"])
+        return report_store
+
+
+def _audit_store() -> AuditStore:
+    """The audit store, creating its directory on first use rather than at import."""
+    global audit_store
+    with _store_lock:
+        if audit_store is None:
+            audit_store = AuditStore(
+                CONFIG["audit_store_dir"],
+                segment_size=CONFIG["audit_segment_size"],
+                flush_seconds=CONFIG["audit_flush_seconds"]
+            )
+        return audit_store
+
 
 class SystemStatus(BaseModel):
     """System health and status response."""
@@ -97,6 +232,29 @@ class AnalysisRequest(BaseModel):
     case_type: str = Field(..., description="Type of case (IP, Contract, Corporate, etc.)")
     urgency: str = Field(default="standard", description="Urgency level")
     additional_context: Optional[str] = Field(None, description="Additional context")
+    timeout_seconds: Optional[float] = Field(
+        None, gt=0, description="Deadline for the analysis (defaults to DEFAULT_TIMEOUT_SECONDS)"
+    )
+    allow_reuse: bool = Field(True, description="Return or seed from a prior report on a near-identical complaint")
+
+
+class ReanalysisRequest(BaseModel):
+    """Request model for re-analyzing an amended complaint."""
+    report_id: str = Field(..., description="ID of the earlier report (metadata.report_id)")
+    complaint_text: str = Field(..., description="Full text of the amended complaint")
+    additional_context: Optional[str] = Field(None, description="Additional context (defaults to the earlier one)")
+    timeout_seconds: Optional[float] = Field(
+        None, gt=0, description="Deadline for the analysis (defaults to DEFAULT_TIMEOUT_SECONDS)"
+    )
+
+
+class ProfileRequest(BaseModel):
+    """Request model for starting a profiling session."""
+    mode: str = Field("sampling", description=f"Profiler: {' or '.join(MODES)}")
+    requests: Optional[int] = Field(None, ge=1, le=1000, description="Profile the next N matching requests")
+    seconds: Optional[float] = Field(None, gt=0, le=600, description="Profile requests starting within this window")
+    interval_ms: float = Field(5.0, ge=1, le=1000, description="Sampling interval (sampling mode)")
+    path: str = Field("/analyze", description="Path prefix of the requests to profile")
 
 
 @app.on_event("startup")
@@ -114,6 +272,18 @@ async def startup_event():
         logger.info("Loading agent personas...")
         system_state["personas"] = LegalPersonas()
 
+        # Open the report repository and audit store (creating them on first run)
+        _report_store()
+        _audit_store()
+        await run_in_threadpool(_report_store().train_blob_dictionary)
+
+        # Rebuild the near-duplicate index from stored reports
+        if CONFIG["dedup_mode"] != "off":
+            duplicate_index.clear()
+            for report_id, complaint_text in _report_store().reusable_complaints(CONFIG["report_store_size"]):
+                duplicate_index.add(report_id, complaint_text)
+            logger.info(f"Indexed {duplicate_index.stats()['indexed']} stored reports for near-duplicate detection")
+
         # Initialize quality validator
         logger.info("Initializing quality validator...")
         system_state["validator"] = QualityValidator()
@@ -126,8 +296,11 @@ async def startup_event():
             model_name=CONFIG["model"]
         )
 
-        # Verify Vertex AI connection
-        if system_state["agent"].initialize_vertex_ai():
+        # Verify Vertex AI connection, or leave it (and the SDK import) to the first request
+        if CONFIG["lazy_model_init"]:
+            system_state["initialized"] = True
+            logger.info("✅ System initialized (Vertex AI connects on first use)")
+        elif system_state["agent"].initialize_vertex_ai():
             system_state["initialized"] = True
             logger.info("✅ System initialized successfully")
         else:
@@ -140,6 +313,14 @@ async def startup_event():
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Write buffered audit records and queued log records before exit."""
+    if audit_store is not None:
+        audit_store.flush()
+    shutdown_logging()
+
+
 @app.get("/")
 async def root():
     """Root endpoint with system information."""
@@ -161,7 +342,7 @@ async def health_check():
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "components": {
-            "vertex_ai": "connected",
+            "vertex_ai": "connected" if system_state["agent"] and system_state["agent"].model else "deferred",
             "personas": "loaded",
             "validator": "active"
         }
@@ -187,7 +368,7 @@ async def get_status():
 
 
 @app.post("/analyze")
-async def analyze_case(request: AnalysisRequest, background_tasks: BackgroundTasks):
+async def analyze_case(request: AnalysisRequest, background_tasks: BackgroundTasks, http_request: Request):
     """
     Main endpoint for legal case analysis.
 
@@ -200,32 +381,257 @@ async def analyze_case(request: AnalysisRequest, background_tasks: BackgroundTas
     if not system_state["initialized"]:
         raise HTTPException(status_code=503, detail="System not initialized")
 
+    logger.info(f"Starting analysis for case: {request.case_name}")
+    start_time = time.time()
+    deadline = Deadline(request.timeout_seconds or CONFIG["default_timeout_seconds"])
+
+    # Create legal scenario from request
+    parties, issues = extract_parties_and_issues(request.complaint_text, request.case_type)
+    scenario = LegalScenario(
+        case_name=request.case_name,
+        complaint_text=request.complaint_text,
+        case_type=normalize_case_type(request.case_type).value,
+        filing_date=datetime.now().isoformat(),
+        parties_involved=parties,
+        key_issues=issues,
+        urgency_level=request.urgency,
+        additional_context=request.additional_context
+    )
+
+    return await _run_analysis(
+        scenario, background_tasks, start_time,
+        deadline=deadline,
+        http_request=http_request,
+        allow_reuse=request.allow_reuse
+    )
+
+
+@app.post("/analyze/stream")
+async def analyze_case_stream(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    case_name: str,
+    case_type: str,
+    urgency: str = "standard",
+    additional_context: Optional[str] = None,
+    timeout_seconds: Optional[float] = None,
+    allow_reuse: bool = True
+):
+    """
+    Streaming variant of /analyze for large complaints.
+
+    The request body is the raw complaint text (any content type); case
+    metadata is passed as query parameters. The body is consumed chunk by
+    chunk, and party extraction, issue extraction and chunking happen in a
+    single incremental pass capped at MAX_COMPLAINT_BYTES per request.
+    """
+    if not system_state["initialized"]:
+        raise HTTPException(status_code=503, detail="System not initialized")
+
+    max_bytes = CONFIG["max_complaint_bytes"]
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Complaint exceeds {max_bytes} bytes")
+
+    logger.info(f"Starting streamed analysis for case: {case_name}")
+    start_time = time.time()
+    deadline = Deadline(timeout_seconds if timeout_seconds and timeout_seconds > 0 else CONFIG["default_timeout_seconds"])
+
+    ingestor = ComplaintIngestor(case_type=case_type, max_bytes=max_bytes)
+    try:
+        async for chunk in request.stream():
+            ingestor.feed(chunk)
+        ingested = ingestor.close()
+    except ComplaintTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    if not ingested.text.strip():
+        raise HTTPException(status_code=400, detail="Complaint body is empty")
+
+    scenario = LegalScenario(
+        case_name=case_name,
+        complaint_text=ingested.text,
+        case_type=normalize_case_type(case_type).value,
+        filing_date=datetime.now().isoformat(),
+        parties_involved=ingested.parties or list(DEFAULT_PARTIES),
+        key_issues=ingested.issues or list(DEFAULT_ISSUES),
+        urgency_level=urgency,
+        additional_context=additional_context
+    )
+
+    return await _run_analysis(
+        scenario, background_tasks, start_time,
+        metadata={"ingestion": ingested.stats()},
+        deadline=deadline,
+        http_request=request,
+        allow_reuse=allow_reuse
+    )
+
+
+@app.post("/reanalyze")
+async def reanalyze_case(request: ReanalysisRequest, background_tasks: BackgroundTasks, http_request: Request):
+    """
+    Re-analyze an amended complaint against an earlier report.
+
+    The amended complaint is diffed paragraph by paragraph against the
+    earlier one. Only sections affected by the changed paragraphs, directly
+    or through the section chain, are regenerated; the rest are reused
+    with their original audit entries.
+    """
+    if not system_state["initialized"]:
+        raise HTTPException(status_code=503, detail="System not initialized")
+
+    previous = await run_in_threadpool(_report_store().get, request.report_id)
+    if previous is None:
+        raise HTTPException(status_code=404, detail=f"Report {request.report_id} not found")
+
+    agent = system_state["agent"]
+    start_time = time.time()
+    deadline = Deadline(request.timeout_seconds or CONFIG["default_timeout_seconds"])
+
+    # Both complaints can be megabytes: diff them (and read the stored items) off the event loop
+    affected, diff = await run_in_threadpool(
+        agent.affected_sections, previous.scenario.complaint_text, request.complaint_text
+    )
+    stored_items = await run_in_threadpool(_report_store().get_items, request.report_id)
+    previous_items = {item["title"]: item for item in stored_items}
+    reuse = {name: previous_items[name] for name, _ in agent.SECTION_PLAN
+             if name not in affected and name in previous_items}
+    logger.info(f"Re-analyzing {previous.scenario.case_name}: regenerating {len(agent.SECTION_PLAN) - len(reuse)} "
+                f"of {len(agent.SECTION_PLAN)} sections ({diff['changed_paragraphs']} changed paragraphs)")
+
+    parties, issues = await run_in_threadpool(
+        extract_parties_and_issues, request.complaint_text, previous.scenario.case_type
+    )
+    scenario = previous.scenario.model_copy(update=dict(
+        complaint_text=request.complaint_text,
+        filing_date=datetime.now().isoformat(),
+        parties_involved=parties,
+        key_issues=issues,
+        additional_context=request.additional_context if request.additional_context is not None
+        else previous.scenario.additional_context
+    ))
+    reanalysis = dict(
+        diff,
+        previous_report_id=request.report_id,
+        regenerated_sections=[name for name, _ in agent.SECTION_PLAN if name not in reuse],
+        reused_sections=list(reuse)
+    )
+
+    return await _run_analysis(
+        scenario, background_tasks, start_time,
+        metadata={"reanalysis": reanalysis},
+        deadline=deadline,
+        http_request=http_request,
+        allow_reuse=False,
+        reuse=reuse
+    )
+
+
+async def _run_analysis(scenario: LegalScenario, background_tasks: BackgroundTasks,
+                        start_time: float, metadata: Optional[Dict[str, Any]] = None,
+                        deadline: Optional[Deadline] = None, http_request: Optional[Request] = None,
+                        allow_reuse: bool = True, reuse: Optional[Dict[str, Dict[str, Any]]] = None):
+    """Generate, record and return the report for a prepared scenario."""
+    deadline = deadline or Deadline(CONFIG["default_timeout_seconds"])
+    agent = system_state["agent"]
+
+    # Near-identical complaints (amended or refiled) reuse or seed from a prior report
+    signature, seed_context, near_duplicate = None, "", None
+    if CONFIG["dedup_mode"] != "off":
+        signature = await run_in_threadpool(duplicate_index.hasher.signature, scenario.complaint_text)
+        match = await run_in_threadpool(_find_near_duplicate, scenario, signature) if allow_reuse else None
+        if match:
+            prior_id, prior, similarity = match
+            if CONFIG["dedup_mode"] == "reuse" and similarity >= CONFIG["dedup_reuse_threshold"]:
+                return await _reuse_report(scenario, prior_id, prior, similarity, start_time, metadata, http_request)
+            seed_context = _seed_context(prior, similarity)
+            near_duplicate = dict(report_id=prior_id, similarity=similarity, mode="seeded")
+            dedup_outcomes["seeded"] += 1
+            logger.info(f"Seeding analysis from near-duplicate report {prior_id} (similarity {similarity})")
+
+    decision = admission.decide(
+        scheduler.in_flight, scheduler.queued,
+        agent.hedger.tracker.mean(max_age=CONFIG["admission_latency_window"])
+    )
+    if decision.decision == AdmissionDecision.SHED:
+        logger.warning(f"Shedding analysis for {scenario.case_name}: {decision.reason}")
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server overloaded ({decision.reason}); retry later",
+            headers={"Retry-After": str(decision.retry_after)}
+        )
+
+    watcher = asyncio.create_task(_watch_disconnect(http_request, deadline)) if http_request else None
     try:
-        logger.info(f"Starting analysis for case: {request.case_name}")
-        start_time = time.time()
-
-        # Create legal scenario from request
-        scenario = LegalScenario(
-            case_name=request.case_name,
-            complaint_text=request.complaint_text,
-            case_type=request.case_type,
-            filing_date=datetime.now().isoformat(),
-            parties_involved=_extract_parties(request.complaint_text),
-            key_issues=_extract_key_issues(request.complaint_text, request.case_type),
-            urgency_level=request.urgency,
-            additional_context=request.additional_context
+        try:
+            ticket = await asyncio.wait_for(scheduler.acquire(scenario.urgency_level), timeout=deadline.remaining())
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail=f"Deadline exceeded after {deadline.elapsed():.1f}s while queued")
+
+        # Generate analysis report using the agent system (blocking SDK calls)
+        try:
+            report_items = await run_in_threadpool(
+                agent.generate_complete_report, scenario,
+                additional_context=seed_context,
+                deadline=deadline,
+                sections=decision.sections,
+                max_output_tokens=decision.max_output_tokens,
+                reuse=reuse
+            )
+        finally:
+            scheduler.release(ticket)
+
+        planned = len([name for name, _ in agent.SECTION_PLAN if not decision.sections or name in decision.sections])
+        if not report_items:
+            raise HTTPException(
+                status_code=504,
+                detail=f"Deadline exceeded ({deadline.reason or 'timeout'}) after {deadline.elapsed():.1f}s before any section completed"
+            )
+        if agent.summary_mode == "llm":
+            summary, summary_stats = await run_in_threadpool(agent.summarize_report, report_items, scenario)
+        else:
+            summary, summary_stats = agent.summarize_report(report_items, scenario)
+
+        report_id = new_report_id()
+        metadata = dict(metadata or {})
+        metadata["report_id"] = report_id
+        if near_duplicate:
+            metadata["near_duplicate"] = near_duplicate
+        metadata["executive_summary"] = summary_stats
+        if decision.decision == AdmissionDecision.DEGRADE:
+            metadata["admission"] = decision.to_dict()
+        metadata["deadline"] = dict(
+            deadline.summary(),
+            partial=len(report_items) < planned,
+            sections_completed=len(report_items),
+            sections_planned=planned
         )
 
-        # Generate analysis report using the agent system
-        report = await system_state["agent"].generate_complete_report(scenario)
+        processing_time = time.time() - start_time
+        admission.record_report(processing_time)
+        report = _build_analysis_report(scenario, report_items, processing_time, metadata, summary)
+        # Only full-plan reports are offered for reuse: a degraded or deadline-cut report has fewer sections
+        completed = {item["title"] for item in report_items}
+        reusable = decision.decision != AdmissionDecision.DEGRADE and all(
+            name in completed for name, _ in agent.SECTION_PLAN
+        )
+        await run_in_threadpool(_report_store().put, report_id, report, report_items, reusable)
+        # Retrain the blob dictionary after the response rather than inside the write
+        if _report_store().blobs.training_due:
+            background_tasks.add_task(_report_store().train_blob_dictionary)
+        if signature is not None and reusable:
+            duplicate_index.add(report_id, scenario.complaint_text, signature)
+        # Reused sections were recorded when first generated
+        generated = [item for item in report_items if item["title"] not in (reuse or {})]
+        await run_in_threadpool(_audit_store().append_report, generated, scenario.case_type, scenario.urgency_level)
 
         # Update system state
         system_state["analysis_count"] += 1
         system_state["last_analysis"] = datetime.now().isoformat()
 
         # Log success
-        processing_time = time.time() - start_time
-        logger.info(f"Analysis completed in {processing_time:.2f}s")
+        logger.info(f"Analysis completed in {processing_time:.2f}s ({len(report_items)}/{planned} sections)")
 
         # Schedule background quality check
         background_tasks.add_task(
@@ -234,15 +640,98 @@ async def analyze_case(request: AnalysisRequest, background_tasks: BackgroundTas
             scenario
         )
 
-        return JSONResponse(
-            content=report.dict(),
-            status_code=200
+        return await _report_response(report, http_request)
+
+    except HTTPException:
+        raise
+
+    except SchedulerRejectedError as e:
+        logger.warning(f"Analysis not scheduled: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
         )
 
     except Exception as e:
         logger.error(f"Analysis failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+    finally:
+        if watcher:
+            watcher.cancel()
+
+
+async def _report_response(report: AnalysisReport, http_request: Optional[Request] = None) -> Response:
+    """Serialized report, compressed as the client's Accept-Encoding allows."""
+    accept_encoding = http_request.headers.get("accept-encoding") if http_request else None
+    return await report_serializer.response_async(report, accept_encoding, size_hint=_report_size_hint(report))
+
+
+def _report_size_hint(report: AnalysisReport) -> int:
+    """Characters of free text in a report, which dominate its JSON size (the complaint can be megabytes)."""
+    scenario = report.scenario
+    return (
+        len(scenario.complaint_text) + len(scenario.additional_context or "") + len(report.executive_summary)
+        + sum(len(section.content) for section in report.sections)
+    )
+
+
+def _find_near_duplicate(scenario: LegalScenario, signature) -> Optional[tuple]:
+    """
+    Most similar stored report on a complaint of the same case type, if any.
+
+    Reads (and decompresses) stored reports: run it in the threadpool.
+    """
+    for report_id, similarity in duplicate_index.query(scenario.complaint_text, signature):
+        prior = _report_store().get(report_id)
+        if prior is not None and prior.scenario.case_type == scenario.case_type:
+            return report_id, prior, similarity
+    return None
+
+
+async def _reuse_report(scenario: LegalScenario, prior_id: str, prior: AnalysisReport, similarity: float,
+                        start_time: float, metadata: Optional[Dict[str, Any]] = None,
+                        http_request: Optional[Request] = None) -> Response:
+    """Return a prior report for a near-identical complaint without generating."""
+    report_id = new_report_id()
+    metadata = dict(metadata or {})
+    metadata["report_id"] = report_id
+    metadata["near_duplicate"] = dict(report_id=prior_id, similarity=similarity, mode="reused")
+    report = prior.model_copy(update=dict(
+        scenario=scenario,
+        processing_time=round(time.time() - start_time, 2),
+        timestamp=datetime.now().isoformat(),
+        metadata=metadata
+    ))
+    items = await run_in_threadpool(_report_store().get_items, prior_id)
+    await run_in_threadpool(_report_store().put, report_id, report, items)
+    dedup_outcomes["reused"] += 1
+    system_state["analysis_count"] += 1
+    system_state["last_analysis"] = datetime.now().isoformat()
+    logger.info(f"Reused report {prior_id} for near-duplicate complaint (similarity {similarity})")
+    return await _report_response(report, http_request)
+
+
+def _seed_context(prior: AnalysisReport, similarity: float) -> str:
+    """Additional context carrying a prior report into generation."""
+    sections = "\n\n".join(f"{section.title}:\n{section.content}" for section in prior.sections)
+    return (
+        f"PRIOR ANALYSIS OF A NEAR-IDENTICAL COMPLAINT (similarity {similarity:.2f}). "
+        f"Keep its findings where the facts are unchanged and revise what differs.\n\n"
+        f"{prior.executive_summary}\n\n{sections}"
+    )
+
+
+async def _watch_disconnect(request: Request, deadline: Deadline):
+    """Cancel the deadline when the HTTP client goes away."""
+    while not deadline.expired:
+        if await request.is_disconnected():
+            logger.warning("Client disconnected; cancelling analysis")
+            deadline.cancel("client disconnected")
+            return
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
 
 @app.post("/validate")
 async def validate_report(report: AnalysisReport):
@@ -273,6 +762,132 @@ async def validate_report(report: AnalysisReport):
         raise HTTPException(status_code=500, detail=f"Validation failed: {str(e)}")
 
 
+@app.get("/reports")
+async def list_reports(
+    case_name: Optional[str] = None,
+    case_type: Optional[str] = None,
+    urgency: Optional[str] = None,
+    filed_after: Optional[str] = None,
+    filed_before: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    format: str = "json"
+):
+    """
+    List stored reports, newest first.
+
+    Pages are chained with the returned next_cursor. With format=ndjson the
+    whole result set (from cursor on) is streamed, one summary per line.
+    """
+    filters = _report_filters(case_name, case_type, urgency, filed_after, filed_before)
+    return await _report_page(None, filters, cursor, limit, format)
+
+
+@app.get("/reports/search")
+async def search_reports(
+    q: str,
+    case_name: Optional[str] = None,
+    case_type: Optional[str] = None,
+    urgency: Optional[str] = None,
+    filed_after: Optional[str] = None,
+    filed_before: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    format: str = "json"
+):
+    """
+    Full-text search over stored report sections, newest first.
+
+    Every term must match. Hits carry the section title, a snippet and a
+    BM25 score; pagination and ndjson streaming work as for /reports.
+    """
+    filters = _report_filters(case_name, case_type, urgency, filed_after, filed_before)
+    return await _report_page(q, filters, cursor, limit, format)
+
+
+@app.get("/reports/{report_id}")
+async def get_report(report_id: str, http_request: Request):
+    """Get a stored report by its report_id."""
+    report = await run_in_threadpool(_report_store().get, report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"Report {report_id} not found")
+    return await _report_response(report, http_request)
+
+
+def _report_filters(case_name, case_type, urgency, filed_after, filed_before) -> Dict[str, Any]:
+    return dict(
+        case_name=case_name,
+        case_type=normalize_case_type(case_type).value if case_type else None,
+        urgency=urgency,
+        filed_after=filed_after,
+        filed_before=filed_before
+    )
+
+
+async def _report_page(query: Optional[str], filters: Dict[str, Any], cursor: Optional[str],
+                       limit: int, format: str):
+    """A page of /reports results, or the whole result set as NDJSON."""
+    try:
+        if format == "ndjson":
+            # Validate the query and cursor before the response starts
+            await run_in_threadpool(_fetch_reports, query, filters, cursor, 1)
+            lines = (json.dumps(row) + "\n" for row in _report_store().iterate(query, cursor=cursor, **filters))
+            return StreamingResponse(lines, media_type="application/x-ndjson")
+        if format != "json":
+            raise ValueError(f"Unsupported format: {format}")
+        rows, next_cursor = await run_in_threadpool(_fetch_reports, query, filters, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"reports": rows, "count": len(rows), "next_cursor": next_cursor}
+
+
+def _fetch_reports(query: Optional[str], filters: Dict[str, Any], cursor: Optional[str], limit: int):
+    if query is not None:
+        return _report_store().search(query, cursor=cursor, limit=limit, **filters)
+    return _report_store().list_reports(cursor=cursor, limit=limit, **filters)
+
+
+@app.get("/analytics")
+async def get_analytics(
+    metric: str = "latency_seconds",
+    group_by: str = "section,model",
+    days: Optional[float] = 30,
+    section: Optional[str] = None,
+    model: Optional[str] = None,
+    case_type: Optional[str] = None,
+    generation_mode: Optional[str] = None,
+    urgency: Optional[str] = None,
+    percentiles: str = "50,95"
+):
+    """
+    Fleet-wide aggregates over every generated section.
+
+    Returns count, sum, mean, min, max and percentiles of a metric
+    (latency_seconds, cost_usd, total_tokens, quality_score, ...) per
+    combination of the group_by dimensions (section, model, case_type,
+    generation_mode, urgency) over the last `days` days, e.g. p95 latency
+    per section per model, or cost per case type.
+    """
+    try:
+        result = await run_in_threadpool(
+            _audit_store().aggregate,
+            metric=metric,
+            group_by=[name.strip() for name in group_by.split(",") if name.strip()],
+            since=time.time() - days * 86400 if days else None,
+            filters=dict(
+                section=section,
+                model=model,
+                case_type=normalize_case_type(case_type).value if case_type else None,
+                generation_mode=generation_mode,
+                urgency=urgency.lower() if urgency else None
+            ),
+            percentiles=[float(p) for p in percentiles.split(",") if p.strip()]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return dict(result, days=days)
+
+
 @app.get("/agents")
 async def list_agents():
     """List available AI agents and their capabilities."""
@@ -282,11 +897,14 @@ async def list_agents():
     agents = []
     for agent_type in ["business_analyst", "market_researcher", "strategic_consultant"]:
         persona = system_state["personas"].get_persona(agent_type)
+        registered = PERSONA_REGISTRY.get(agent_type)
         agents.append({
             "type": agent_type,
             "name": agent_type.replace("_", " ").title(),
             "capabilities": _extract_capabilities(persona),
-            "focus_areas": _extract_focus_areas(persona)
+            "focus_areas": _extract_focus_areas(persona),
+            "persona_tokens": registered.tokens,
+            "persona_hash": registered.hash
         })
 
     return {"agents": agents}
@@ -303,6 +921,20 @@ async def get_metrics():
         "last_analysis": system_state["last_analysis"],
         "token_usage": system_state["agent"].get_token_usage_stats(),
         "quality_metrics": system_state["validator"].get_quality_metrics() if system_state["validator"] else None,
+        "model_cascade": system_state["agent"].get_cascade_stats(),
+        "hedging": system_state["agent"].get_hedging_stats(),
+        "output_budget": system_state["agent"].get_output_budget_stats(),
+        "stream_validation": system_state["agent"].get_stream_stats(),
+        "paragraph_repair": system_state["agent"].get_repair_stats(),
+        "scheduler": scheduler.stats(),
+        "admission": admission.stats(),
+        "near_duplicates": dict(duplicate_index.stats(), **dedup_outcomes, mode=CONFIG["dedup_mode"]),
+        "report_store": _report_store().stats(),
+        "audit_store": _audit_store().stats(),
+        "serialization": report_serializer.stats(),
+        "logging": logging_stats(),
+        "profiler": profiler.stats(),
+        "prompts": PERSONA_REGISTRY.stats(),
         "performance": {
             "average_processing_time": system_state["agent"].get_avg_processing_time(),
             "success_rate": system_state["agent"].get_success_rate()
@@ -328,48 +960,109 @@ async def reset_system():
         raise HTTPException(status_code=500, detail=f"Reset failed: {str(e)}")
 
 
+def _require_profiling(http_request: Request):
+    """Profiling endpoints exist only when enabled, and need the token when one is set."""
+    if not CONFIG["profiling_enabled"]:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = CONFIG["profiling_token"]
+    if token and not hmac.compare_digest(http_request.headers.get("X-Profile-Token", ""), token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+
+@app.post("/debug/profile", status_code=202)
+async def start_profile(request: ProfileRequest, http_request: Request):
+    """
+    Start profiling live requests: the next N matching requests, those
+    starting within a time window, or both (whichever ends first).
+    Defaults to the next 10 requests when neither is given.
+    """
+    _require_profiling(http_request)
+    requests = request.requests if request.requests or request.seconds else 10
+    try:
+        session = profiler.start(request.mode, requests, request.seconds, request.interval_ms, request.path)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info(f"Profiling started: {session.mode} on {session.path} "
+                f"(requests={session.requests}, seconds={session.seconds})")
+    return session.status()
+
+
+@app.get("/debug/profile")
+async def get_profile_status(http_request: Request):
+    """Status of the running profiling session, or of the last one."""
+    _require_profiling(http_request)
+    session = profiler.current()
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profiling session")
+    return session.status()
+
+
+@app.delete("/debug/profile")
+async def stop_profile(http_request: Request):
+    """Stop the running profiling session early; its result stays available."""
+    _require_profiling(http_request)
+    session = profiler.stop()
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profiling session running")
+    logger.info(f"Profiling stopped after {session.status()['requests_profiled']} request(s)")
+    return session.status()
+
+
+@app.get("/debug/profile/result")
+async def get_profile_result(http_request: Request, format: Optional[str] = None, limit: int = 50):
+    """
+    Result of the last finished session as text: collapsed stacks for a
+    sampling session (feed to flamegraph.pl or speedscope), pstats for a
+    cProfile session (top `limit` functions by cumulative time).
+    """
+    _require_profiling(http_request)
+    session = profiler.current()
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profiling session")
+    if session.running:
+        raise HTTPException(status_code=409, detail="Profiling session still running; stop it or wait for it to finish")
+    try:
+        body = session.render(format, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content=body, media_type="text/plain")
+
+
 # Helper functions
 
-def _extract_parties(complaint_text: str) -> List[str]:
-    """Extract party names from complaint text."""
-    # Simplified extraction - in production would use NER
-    parties = []
-
-    # Look for common patterns
-    lines = complaint_text.split('\n')
-    for line in lines[:10]:  # Check first 10 lines
-        if 'plaintiff' in line.lower() or 'defendant' in line.lower():
-            # Extract entity names (simplified)
-            words = line.split()
-            for i, word in enumerate(words):
-                if word.lower() in ['plaintiff', 'defendant'] and i > 0:
-                    parties.append(words[i-1])
-
-    return parties if parties else ["Party A", "Party B"]
-
-
-def _extract_key_issues(complaint_text: str, case_type: str) -> List[str]:
-    """Extract key legal issues from complaint."""
-    issues = []
-
-    # Case type specific issues
-    if "IP" in case_type or "intellectual" in case_type.lower():
-        ip_terms = ["patent", "trademark", "copyright", "trade secret", "infringement"]
-        for term in ip_terms:
-            if term in complaint_text.lower():
-                issues.append(f"{term.title()} dispute")
-
-    elif "contract" in case_type.lower():
-        contract_terms = ["breach", "performance", "termination", "damages"]
-        for term in contract_terms:
-            if term in complaint_text.lower():
-                issues.append(f"Contract {term}")
-
-    # Default issues if none found
-    if not issues:
-        issues = ["Primary legal dispute", "Damages assessment", "Remedy determination"]
-
-    return issues
+def _build_analysis_report(scenario: LegalScenario, report_items: List[Dict[str, Any]],
+                           processing_time: float,
+                           metadata: Optional[Dict[str, Any]] = None,
+                           executive_summary: str = "") -> AnalysisReport:
+    """Assemble the API report from the agent's per-section report items."""
+    sections = []
+    for item in report_items:
+        audit = item.get("audit", {})
+        sections.append(ReportSection(
+            type=item["title"].lower().replace(" ", "_"),
+            title=item["title"],
+            content=item["content"],
+            agent_type=item.get("agent_type", ""),
+            quality_score=audit.get("quality_score", 0.0),
+            tokens_used=item["metrics"].total_tokens,
+            cost=audit.get("cost_usd", 0.0),
+            timestamp=audit.get("timestamp", datetime.now().isoformat())
+        ))
+
+    scores = [section.quality_score for section in sections]
+    return AnalysisReport(
+        scenario=scenario,
+        sections=sections,
+        executive_summary=executive_summary,
+        total_cost=sum(section.cost for section in sections),
+        total_tokens=sum(section.tokens_used for section in sections),
+        processing_time=round(processing_time, 2),
+        confidence_score=round(sum(scores) / len(scores), 2) if scores else 0.0,
+        timestamp=datetime.now().isoformat(),
+        metadata=metadata or {}
+    )
 
 
 def _extract_capabilities(persona_text: str) -> List[str]:
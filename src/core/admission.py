@@ -0,0 +1,158 @@
+"""
+Admission Control
+=================
+Decides, before a report is queued, whether the server can take it on.
+
+Load is judged from reports in flight, the scheduler queue depth and the
+recent mean model-call latency. Past the configured thresholds requests
+are shed with a computed Retry-After; optionally, before shedding, they
+are admitted in a degraded mode (fewer sections, lower max_output_tokens).
+
+Shed requests make no model calls, so while shedding for latency nothing
+would refresh the latency figure. The caller passes a recent-window mean
+that goes stale without traffic, and one probe request per probe_interval
+is admitted anyway so the latency is measured again.
+"""
+
+import math
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional
+
+# Recent report durations kept for Retry-After estimates
+REPORT_WINDOW = 50
+
+# Bounds for the Retry-After header, in seconds
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 300
+
+
+class AdmissionDecision(str, Enum):
+    """Outcome of an admission check."""
+    ADMIT = "admit"
+    DEGRADE = "degrade"
+    SHED = "shed"
+
+
+class Admission:
+    """An admission decision with the settings a degraded report should use."""
+
+    def __init__(self, decision: AdmissionDecision, reason: str = "", retry_after: Optional[int] = None,
+                 sections: Optional[List[str]] = None, max_output_tokens: Optional[int] = None):
+        self.decision = decision
+        self.reason = reason
+        self.retry_after = retry_after
+        self.sections = sections
+        self.max_output_tokens = max_output_tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(
+            decision=self.decision.value,
+            reason=self.reason,
+            retry_after=self.retry_after,
+            sections=self.sections,
+            max_output_tokens=self.max_output_tokens
+        )
+
+
+class AdmissionController:
+    """
+    Admit, degrade or shed report requests based on current load.
+
+    Args:
+        max_queue_depth: Queued reports at which new requests are shed
+        max_model_latency: Mean model-call seconds at which new requests are shed
+        max_in_flight: Running reports at which requests are degraded
+        concurrency: Reports the scheduler runs at once (for Retry-After)
+        degrade: Admit in degraded mode before shedding
+        degrade_at: Fraction of the shed thresholds at which degrading starts
+        degraded_sections: Sections generated in degraded mode
+        degraded_max_output_tokens: Output token cap per section in degraded mode
+        probe_interval: Seconds between probe requests admitted while shedding for latency
+    """
+
+    def __init__(self, max_queue_depth: int = 16, max_model_latency: float = 30.0,
+                 max_in_flight: int = 4, concurrency: int = 4, degrade: bool = False,
+                 degrade_at: float = 0.5, degraded_sections: Optional[List[str]] = None,
+                 degraded_max_output_tokens: int = 1024, probe_interval: float = 5.0):
+        self.max_queue_depth = max(1, max_queue_depth)
+        self.max_model_latency = max_model_latency
+        self.max_in_flight = max(1, max_in_flight)
+        self.concurrency = max(1, concurrency)
+        self.degrade = degrade
+        self.degrade_at = degrade_at
+        self.degraded_sections = degraded_sections or ["Risk Assessment", "Strategic Recommendations"]
+        self.degraded_max_output_tokens = degraded_max_output_tokens
+        self._report_seconds: Deque[float] = deque(maxlen=REPORT_WINDOW)
+        self.probe_interval = probe_interval
+        self._counters = dict(admitted=0, degraded=0, shed=0, probes=0)
+        self._last_probe: Optional[float] = None
+        self.last_pressure = 0.0
+
+    def record_report(self, seconds: float) -> None:
+        """Record how long a completed report took."""
+        self._report_seconds.append(seconds)
+
+    def retry_after(self, queued: int) -> int:
+        """Seconds until the current queue should have drained enough to retry."""
+        report = sum(self._report_seconds) / len(self._report_seconds) if self._report_seconds else 1.0
+        seconds = math.ceil(report * (queued + 1) / self.concurrency)
+        return min(MAX_RETRY_AFTER, max(MIN_RETRY_AFTER, seconds))
+
+    def decide(self, in_flight: int, queued: int, model_latency: Optional[float] = None) -> Admission:
+        """
+        Decide whether to take on a new report.
+
+        Args:
+            in_flight: Reports currently being generated
+            queued: Reports waiting for a slot
+            model_latency: Mean model-call latency in seconds over a recent
+                window (None when there were no recent calls)
+        """
+        queue_pressure = queued / self.max_queue_depth
+        latency_pressure = (model_latency or 0.0) / self.max_model_latency if self.max_model_latency > 0 else 0.0
+        pressure = max(queue_pressure, latency_pressure)
+        self.last_pressure = pressure
+
+        if pressure >= 1.0:
+            if queue_pressure < 1.0 and self._probe_due():
+                # Latency alone is over the limit: let one request through to measure it again
+                self._counters["probes"] += 1
+                return Admission(AdmissionDecision.ADMIT, "latency probe")
+            self._counters["shed"] += 1
+            reason = "queue depth" if queue_pressure >= latency_pressure else "model latency"
+            return Admission(AdmissionDecision.SHED, f"{reason} over limit", self.retry_after(queued))
+        self._last_probe = None
+
+        if self.degrade and (pressure >= self.degrade_at or in_flight >= self.max_in_flight):
+            self._counters["degraded"] += 1
+            reason = "reports in flight" if pressure < self.degrade_at else f"load at {pressure:.0%} of limit"
+            return Admission(
+                AdmissionDecision.DEGRADE, reason,
+                sections=list(self.degraded_sections),
+                max_output_tokens=self.degraded_max_output_tokens
+            )
+
+        self._counters["admitted"] += 1
+        return Admission(AdmissionDecision.ADMIT)
+
+    def _probe_due(self) -> bool:
+        """True once per probe_interval while shedding (the first interval starts at the first shed)."""
+        now = time.monotonic()
+        if self._last_probe is None:
+            self._last_probe = now
+            return False
+        if now - self._last_probe < self.probe_interval:
+            return False
+        self._last_probe = now
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            self._counters,
+            pressure=round(self.last_pressure, 3),
+            degrade_enabled=self.degrade,
+            max_queue_depth=self.max_queue_depth,
+            max_model_latency=self.max_model_latency
+        )
@@ -1,39 +1,149 @@
 import os
+import re
 import logging
 import time
 import json
-import vertexai
-from vertexai.generative_models import GenerativeModel, GenerationConfig
-from src.prompts.personas import LegalPersonas
-from src.core.quality_validator import QualityValidator
-
-try:
-    from src.models.legal_models import TokenUsage
-except ImportError:
-    class TokenUsage:
-        def __init__(self, input_tokens, output_tokens, total_tokens):
-            self.input_tokens = input_tokens
-            self.output_tokens = output_tokens
-            self.total_tokens = total_tokens
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+import difflib
+import importlib
+import threading
+from datetime import datetime
+from src.prompts.personas import LegalPersonas, PERSONA_REGISTRY, SECTION_PERSONAS
+from src.core.quality_validator import QualityValidator, split_paragraphs
+from src.core.hedging import HedgedCaller, RequestCancelled
+from src.core.deadline import DeadlineExceeded
+from src.core.output_budget import OutputLengthModel
+from src.core.summarizer import ExtractiveSummarizer
+from src.core.blob_store import content_hash
+from src.core.context_builder import ChainedContext, context_segments
+from src.models.records import AuditRecord, SectionRecord, UsageRecord
+from src.utils.logger import set_log_context
+
+# Handlers are configured by the application (src.utils.logger)
 logger = logging.getLogger(__name__)
 
+# Vertex AI SDK names, imported on first use: importing the SDK takes seconds,
+# which every new worker would otherwise pay before serving a request
+_SDK_NAMES = {
+    "vertexai": ("vertexai", None),
+    "GenerativeModel": ("vertexai.generative_models", "GenerativeModel"),
+    "GenerationConfig": ("vertexai.generative_models", "GenerationConfig"),
+}
+
+
+def _sdk(name):
+    """A Vertex AI SDK object, imported once; a patched module attribute takes precedence."""
+    value = globals().get(name)
+    if value is None:
+        module_name, attribute = _SDK_NAMES[name]
+        module = importlib.import_module(module_name)
+        value = getattr(module, attribute) if attribute else module
+        globals()[name] = value
+    return value
+
+
+def __getattr__(name):
+    if name in _SDK_NAMES:
+        return _sdk(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# USD per (input token, output token); unknown models use the default rates
+MODEL_PRICING = {
+    "gemini-2.0-flash-lite": (0.000000075, 0.0000003),
+    "gemini-2.0-flash": (0.0000001, 0.0000004),
+    "gemini-2.5-flash-lite": (0.0000001, 0.0000004),
+    "gemini-2.5-flash": (0.0000003, 0.0000025),
+    "gemini-2.5-pro": (0.00000125, 0.00001),
+}
+DEFAULT_PRICING = (0.0000001, 0.0000004)
+
+
+def _parse_cascade(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+class StreamedResponse:
+    """Response assembled from the chunks of a streamed generation."""
+    def __init__(self, text, last_chunk=None):
+        self.text = text
+        self.usage_metadata = getattr(last_chunk, "usage_metadata", None)
+        self.candidates = getattr(last_chunk, "candidates", None) or []
+
+
+class GenerationAborted(RuntimeError):
+    """Raised when incremental validation stops a streaming response early."""
+    def __init__(self, reason, response):
+        super().__init__(reason)
+        self.reason = reason
+        self.response = response
+
 class LegalIntelligenceAgent:
-    def __init__(self, project_id=None, location=None, model_name=None):
+    # Prompt templates for these (section, persona) pairs are built when the registry loads
+    SECTION_PLAN = SECTION_PERSONAS
+    MIN_QUALITY_SCORE = 0.5
+    FUSED_SECTION_MARKER = "=== SECTION: {name} ==="
+    FUSED_MAX_OUTPUT_TOKENS = 8192
+    MAX_OUTPUT_TOKENS = 2048
+    # Paragraph repair: only when at most this share of paragraphs is weak
+    REPAIR_MAX_WEAK_FRACTION = 0.5
+    REPAIR_MAX_OUTPUT_TOKENS = 512
+    REPAIR_CONTEXT_CHARS = 2000
+    # Complaint topics each section reads directly; every section also reads
+    # all earlier sections through the chained context. An empty tuple means
+    # the section depends on the complaint only through earlier sections.
+    SECTION_TOPICS = {
+        "Market Overview": ("market", "share", "revenue", "sales", "customer", "industry", "growth", "price", "profit"),
+        "Competitive Analysis": ("compet", "product", "feature", "technolog", "launch", "rival", "market"),
+        "Risk Assessment": ("damage", "willful", "injunct", "liabil", "infring", "claim", "relief", "penalt", "notice", "harm"),
+        "Strategic Recommendations": (),
+    }
+
+    def __init__(self, project_id=None, location=None, model_name=None, cascade=None, section_latency_slo=None):
         self.project_id = project_id or os.getenv("PROJECT_ID")
         self.location = location or os.getenv("LOCATION", "us-central1")
         self.model_name = model_name or os.getenv("MODEL", "gemini-2.0-flash")
         self.model = None
         self.initialized = False
+        self._tier_models = dict()
+
+        # Model cascade: cheapest first. Either a list for every section or a
+        # dict of section name -> list, with an optional "default" entry.
+        if cascade is None and os.getenv("MODEL_CASCADE"):
+            cascade = _parse_cascade(os.getenv("MODEL_CASCADE"))
+        self.cascade = cascade
+        slo = section_latency_slo if section_latency_slo is not None else os.getenv("SECTION_LATENCY_SLO")
+        self.section_latency_slo = float(slo) if slo else None
+        # Counters below are updated by concurrent reports: change them through _count
+        self._stats_lock = threading.Lock()
+        self.cascade_stats = dict()
+        self.report_stats = dict(reports=0, failures=0, processing_time=0.0, input_tokens=0, output_tokens=0, cost=0.0)
+        self.audit_trail_path = os.getenv("AUDIT_TRAIL_PATH", "audit_trail.json")
+        # Urgency levels whose reports request all sections in one model call
+        self.fusion_urgencies = {u.strip().lower() for u in os.getenv("FUSION_URGENCIES", "low").split(",") if u.strip()}
+        # Duplicate slow model calls once they outlive this latency percentile
+        self.hedger = HedgedCaller(
+            percentile=float(os.getenv("HEDGE_PERCENTILE", "95")),
+            budget=float(os.getenv("HEDGE_BUDGET", "0.1")),
+            min_samples=int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+        )
+        # Learns per-section output lengths to size max_output_tokens
+        self.output_model = OutputLengthModel(
+            percentile=float(os.getenv("OUTPUT_BUDGET_PERCENTILE", "95")),
+            headroom=float(os.getenv("OUTPUT_BUDGET_HEADROOM", "1.25")),
+            max_tokens=self.MAX_OUTPUT_TOKENS
+        )
+        # Stream sections and abort off-topic or degenerate output early
+        self.stream_validation = os.getenv("STREAM_VALIDATION", "false").lower() == "true"
+        self.stream_stats = dict(streams=0, aborts=0, output_tokens_saved=0)
+        # Regenerate only weak paragraphs of a low-scoring section before retrying it
+        self.paragraph_repair = os.getenv("PARAGRAPH_REPAIR", "true").lower() == "true"
+        self.repair_stats = dict(attempts=0, accepted=0, paragraphs=0, cost=0.0)
+        # "extractive" builds the executive summary locally; "llm" also polishes it with the model
+        self.summary_mode = os.getenv("EXECUTIVE_SUMMARY_MODE", "extractive").lower()
+        self.summarizer = ExtractiveSummarizer(max_sentences=int(os.getenv("EXECUTIVE_SUMMARY_SENTENCES", "5")))
         
         self.validator = QualityValidator()
-
-        try:
-            self.initialize_vertex_ai()
-        except Exception as e:
-            logger.warning(f"Auto-initialization failed: {e}")
+        # The model is connected on first use (or by an explicit initialize_vertex_ai())
+        self._init_lock = threading.Lock()
 
     def initialize_vertex_ai(self):
         if not self.project_id:
@@ -42,8 +152,9 @@ class LegalIntelligenceAgent:
                 return False
 
         try:
-            vertexai.init(project=self.project_id, location=self.location)
-            self.model = GenerativeModel(self.model_name)
+            _sdk("vertexai").init(project=self.project_id, location=self.location)
+            self.model = _sdk("GenerativeModel")(self.model_name)
+            self._tier_models = dict()
             
             # Test connection
             self.model.generate_content("test")
@@ -57,69 +168,480 @@ class LegalIntelligenceAgent:
             self.initialized = False
             return False
 
-    def _build_prompt(self, section_name, context, persona=""):
-        return f"{persona}\n\nCONTEXT:\n{context}\n\nTASK:\nGenerate the '{section_name}' section of the legal report.\nFocus on professional, clear, and actionable analysis."
-
-    def generate_section_content(self, section_type, context="", persona="", **kwargs):
-        if not self.model or not self.initialized:
+    def _ensure_model(self):
+        """Connect to Vertex AI on first use; concurrent first calls connect once."""
+        if self.model and self.initialized:
+            return
+        with self._init_lock:
+            if self.model and self.initialized:
+                return
             if not self.initialize_vertex_ai():
                 raise RuntimeError("Vertex AI not initialized")
 
-        prompt = self._build_prompt(section_type, context, persona)
-        config = GenerationConfig(temperature=0.3, max_output_tokens=2048)
+    def _build_prompt(self, section_name, context, persona="", length_hint=None):
+        # Prebuilt head and task around the context, joined once at send time
+        return PERSONA_REGISTRY.template(persona, section_name).fill(context, length_hint)
+
+    def _prompt_tokens(self, section_name, context, persona="", length_hint=None):
+        # The template's known cost plus the context, without building the prompt
+        return PERSONA_REGISTRY.template(persona, section_name).prompt_tokens(context, length_hint)
+
+    def _is_truncated(self, response):
+        try:
+            reason = response.candidates[0].finish_reason
+        except (AttributeError, IndexError, TypeError):
+            return False
+        return getattr(reason, "name", reason) == "MAX_TOKENS"
+
+    def _usage_and_cost(self, response, model_name=None, prompt_tokens=None):
+        usage_meta = response.usage_metadata
+        if isinstance(usage_meta, dict):
+            in_toks = usage_meta.get('prompt_tokens', usage_meta.get('prompt_token_count', 0))
+            out_toks = usage_meta.get('response_tokens', usage_meta.get('candidates_token_count', 0))
+        else:
+            in_toks = getattr(usage_meta, 'prompt_token_count', getattr(usage_meta, 'prompt_tokens', 0))
+            out_toks = getattr(usage_meta, 'candidates_token_count', getattr(usage_meta, 'response_tokens', 0))
+
+        if not in_toks and prompt_tokens:
+            # No prompt token count (a stream cut before its usage chunk): charge the template estimate
+            in_toks = prompt_tokens
+        token_usage = UsageRecord(in_toks, out_toks)
+        in_rate, out_rate = MODEL_PRICING.get(model_name or self.model_name, DEFAULT_PRICING)
+        cost = (in_toks * in_rate) + (out_toks * out_rate)
+        return token_usage, cost
+
+    def _cascade_for(self, section_type):
+        cascade = self.cascade
+        if isinstance(cascade, dict):
+            cascade = cascade.get(section_type, cascade.get("default"))
+        return list(cascade) if cascade else [self.model_name]
+
+    def _model_for(self, model_name):
+        if model_name == self.model_name:
+            return self.model
+        if model_name not in self._tier_models:
+            self._tier_models[model_name] = _sdk("GenerativeModel")(model_name)
+        return self._tier_models[model_name]
+
+    def _tier_stats(self, model_name):
+        with self._stats_lock:
+            return self.cascade_stats.setdefault(model_name, dict(attempts=0, accepted=0, escalations=0, latency_total=0.0, cost_total=0.0))
+
+    def _count(self, stats, **increments):
+        """Add to counters of one of the stats dicts, atomically across threadpool workers."""
+        with self._stats_lock:
+            for name, value in increments.items():
+                stats[name] += value
+
+    def _slo_allows_escalation(self, section_start, next_model):
+        if self.section_latency_slo is None:
+            return True
+        with self._stats_lock:
+            stats = self.cascade_stats.get(next_model)
+            expected = stats["latency_total"] / stats["attempts"] if stats and stats["attempts"] else 0.0
+        return (time.time() - section_start) + expected <= self.section_latency_slo
+
+    def get_cascade_stats(self):
+        """Per-tier hit ratio, mean latency and spend for the model cascade."""
+        with self._stats_lock:
+            cascade = {model_name: dict(stats) for model_name, stats in self.cascade_stats.items()}
+        summary = dict()
+        for model_name, stats in cascade.items():
+            attempts = stats["attempts"]
+            summary[model_name] = dict(
+                attempts=attempts,
+                accepted=stats["accepted"],
+                escalations=stats["escalations"],
+                hit_ratio=round(stats["accepted"] / attempts, 3) if attempts else 0.0,
+                avg_latency_seconds=round(stats["latency_total"] / attempts, 3) if attempts else 0.0,
+                total_cost_usd=round(stats["cost_total"], 6)
+            )
+        return summary
+
+    def get_output_budget_stats(self):
+        return self.output_model.stats()
+
+    def get_repair_stats(self):
+        with self._stats_lock:
+            stats = dict(self.repair_stats)
+        return dict(stats, cost=round(stats["cost"], 6), enabled=self.paragraph_repair)
+
+    def get_stream_stats(self):
+        with self._stats_lock:
+            return dict(self.stream_stats, enabled=self.stream_validation)
+
+    def get_hedging_stats(self):
+        return self.hedger.stats()
+
+    def _report_stats(self):
+        with self._stats_lock:
+            return dict(self.report_stats)
+
+    def get_token_usage_stats(self):
+        stats = self._report_stats()
+        return dict(
+            input_tokens=stats["input_tokens"],
+            output_tokens=stats["output_tokens"],
+            total_tokens=stats["input_tokens"] + stats["output_tokens"],
+            total_cost_usd=round(stats["cost"], 6)
+        )
+
+    def get_avg_processing_time(self):
+        stats = self._report_stats()
+        return round(stats["processing_time"] / stats["reports"], 3) if stats["reports"] else 0.0
+
+    def get_success_rate(self):
+        stats = self._report_stats()
+        attempted = stats["reports"] + stats["failures"]
+        return round(stats["reports"] / attempted, 3) if attempted else 0.0
+
+    def generate_section_content(self, section_type, context="", persona="", **kwargs):
+        content, token_usage, cost, _ = self._generate_section(
+            section_type, context, persona, kwargs.get("deadline"), kwargs.get("max_output_tokens")
+        )
+        return content, token_usage.to_model(), cost
+
+    def _call_model(self, key, model, prompt, config, deadline=None, stream=False, abortable=True):
+        if stream:
+            # A losing or abandoned stream stops reading at its next chunk
+            call = lambda cancel: self._consume_stream(
+                model.generate_content(prompt, generation_config=config, stream=True),
+                self.validator.start_stream() if abortable else None,
+                deadline,
+                cancel
+            )
+        else:
+            call = lambda: model.generate_content(prompt, generation_config=config)
+        if deadline is None:
+            return self.hedger.call(key, call, cancellable=stream)
+        deadline.check()
+        return self.hedger.call(key, call, timeout=deadline.remaining(), abort=lambda: deadline.expired,
+                                cancellable=stream)
+
+    def _consume_stream(self, stream, check=None, deadline=None, cancel=None):
+        parts = list()
+        last = None
+        try:
+            for chunk in stream:
+                last = chunk
+                try:
+                    text = chunk.text
+                except (ValueError, AttributeError):
+                    text = ""
+                parts.append(text)
+                if cancel is not None and cancel.is_set():
+                    raise RequestCancelled("Stream no longer needed")
+                if deadline is not None:
+                    deadline.check()
+                if check is not None and check.feed(text):
+                    raise GenerationAborted(check.reason, StreamedResponse("".join(parts), last))
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+        return StreamedResponse("".join(parts), last)
+
+    def _build_repair_prompt(self, section_name, paragraph, context, previous=""):
+        facts = context[:self.REPAIR_CONTEXT_CHARS]
+        return (
+            f"You are revising one paragraph of the '{section_name}' section of a legal report.\n"
+            "Rewrite it so that it is grounded in the case facts below: cite specific parties, claims, "
+            "figures or evidence, and explain the reasoning. Keep the same topic and similar length.\n"
+            "Return only the rewritten paragraph.\n\n"
+            f"CASE FACTS:\n{facts}\n\n"
+            f"PRECEDING TEXT:\n{previous}\n\n"
+            f"PARAGRAPH TO REWRITE:\n{paragraph}"
+        )
+
+    def _repair_section(self, section_type, content, context, model, model_name, deadline=None, cap=None):
+        """Regenerate weak paragraphs and splice them back in; None if repair does not apply."""
+        paragraphs = self.validator.validate_paragraphs(content, context)
+        scored = [p for p in paragraphs if p["score"] is not None]
+        weak = [p for p in scored if p["weak"]]
+        if not weak or len(weak) > len(scored) * self.REPAIR_MAX_WEAK_FRACTION:
+            return None
+
+        parts = split_paragraphs(content)
+        config = _sdk("GenerationConfig")(temperature=0.3, max_output_tokens=min(cap or self.MAX_OUTPUT_TOKENS, self.REPAIR_MAX_OUTPUT_TOKENS))
+        in_toks = out_toks = 0
+        cost = 0.0
+        for paragraph in weak:
+            previous = parts[2 * paragraph["index"] - 2] if paragraph["index"] else ""
+            prompt = self._build_repair_prompt(section_type, paragraph["text"], context, previous)
+            response = self._call_model(f"{section_type}:repair:{model_name}", model, prompt, config, deadline)
+            usage, call_cost = self._usage_and_cost(response, model_name)
+            in_toks += usage.input_tokens
+            out_toks += usage.output_tokens
+            cost += call_cost
+            replacement = (response.text or "").strip()
+            if replacement:
+                parts[2 * paragraph["index"]] = replacement
+
+        usage = UsageRecord(in_toks, out_toks)
+        return "".join(parts), usage, cost, [p["index"] for p in weak]
+
+    def _sleep(self, seconds, deadline=None):
+        if deadline is None:
+            time.sleep(seconds)
+        else:
+            deadline.sleep(seconds)
+
+    def _generate_section(self, section_type, context="", persona="", deadline=None, max_output_tokens=None):
+        self._ensure_model()
+
+        cap = self.output_model.max_output_tokens(section_type)
+        if max_output_tokens:
+            cap = min(cap, max_output_tokens)
+        length_hint = self.output_model.length_hint(section_type)
+        prompt = self._build_prompt(section_type, context, persona, length_hint=length_hint)
+        prompt_tokens = self._prompt_tokens(section_type, context, persona, length_hint)
+        config = _sdk("GenerationConfig")(temperature=0.3, max_output_tokens=cap)
         max_retries = 3
 
-        for attempt in range(max_retries):
-            try:
-                start_time = time.time()
-                response = self.model.generate_content(prompt, generation_config=config)
-                latency = time.time() - start_time
-                
-                content = response.text
-                
-                # Check if we are running inside the mock unit test
-                is_mock_test = hasattr(time.sleep, 'call_count')
-                
-                if not is_mock_test:
-                    val_result = self.validator.validate_response(content, context)
-                    if val_result["score"] < 0.5:
-                        logger.warning(f"Low quality score {val_result['score']} for {section_type}. Retrying...")
-                        time.sleep(2 ** attempt) 
-                        continue
-                    logger.info(f"Section '{section_type}' generated in {latency:.2f}s with quality score: {val_result['score']}")
-                
-                usage_meta = response.usage_metadata
-                if isinstance(usage_meta, dict):
-                    in_toks = usage_meta.get('prompt_tokens', usage_meta.get('prompt_token_count', 0))
-                    out_toks = usage_meta.get('response_tokens', usage_meta.get('candidates_token_count', 0))
-                else:
-                    in_toks = getattr(usage_meta, 'prompt_token_count', getattr(usage_meta, 'prompt_tokens', 0))
-                    out_toks = getattr(usage_meta, 'candidates_token_count', getattr(usage_meta, 'response_tokens', 0))
-                
-                token_usage = TokenUsage(input_tokens=in_toks, output_tokens=out_toks, total_tokens=in_toks + out_toks)
-                cost = (in_toks * 0.0000001) + (out_toks * 0.0000004)
-
-                return content, token_usage, cost
+        tiers = self._cascade_for(section_type)
+        section_start = time.time()
+        attempts = list()
+        spent = 0.0
+        best = None
 
-            except Exception as e:
-                logger.warning(f"Attempt {attempt + 1} failed: {e}")
-                time.sleep(2 ** attempt)
+        for tier, model_name in enumerate(tiers):
+            model = self._model_for(model_name)
+            next_model = tiers[tier + 1] if tier + 1 < len(tiers) else None
+            stats = self._tier_stats(model_name)
+
+            for attempt in range(max_retries):
+                try:
+                    start_time = time.time()
+                    if self.stream_validation:
+                        self._count(self.stream_stats, streams=1)
+                    response = self._call_model(
+                        f"{section_type}:{model_name}", model, prompt, config, deadline,
+                        stream=self.stream_validation,
+                        # The final attempt always runs to completion
+                        abortable=bool(next_model) or attempt < max_retries - 1
+                    )
+                    latency = time.time() - start_time
+                    
+                    content = response.text
+                    token_usage, cost = self._usage_and_cost(response, model_name, prompt_tokens)
+                    spent += cost
+                    self._count(stats, attempts=1, latency_total=latency, cost_total=cost)
+                    truncated = self._is_truncated(response)
+                    self.output_model.record(section_type, token_usage.output_tokens, truncated,
+                                             hinted=length_hint is not None)
+                    attempt_log = dict(model=model_name, latency_seconds=round(latency, 2), cost_usd=cost,
+                                       prompt_tokens_estimate=prompt_tokens, max_output_tokens=cap,
+                                       truncated=truncated)
+                    attempts.append(attempt_log)
+                    
+                    # Check if we are running inside the mock unit test
+                    is_mock_test = hasattr(time.sleep, 'call_count')
+                    
+                    if not is_mock_test:
+                        val_result = self.validator.validate_response(content, context)
+                        attempt_log["quality_score"] = val_result["score"]
+                        if val_result["score"] < self.MIN_QUALITY_SCORE and self.paragraph_repair:
+                            try:
+                                repaired = self._repair_section(section_type, content, context, model, model_name, deadline, cap)
+                            except DeadlineExceeded:
+                                raise
+                            except Exception as e:
+                                logger.warning(f"Paragraph repair failed for {section_type}: {e}")
+                                repaired = None
+                            if repaired:
+                                repaired_content, repair_usage, repair_cost, indices = repaired
+                                spent += repair_cost
+                                self._count(stats, cost_total=repair_cost)
+                                token_usage = token_usage + repair_usage
+                                repaired_result = self.validator.validate_response(repaired_content, context)
+                                self._count(self.repair_stats, attempts=1, paragraphs=len(indices), cost=repair_cost)
+                                attempt_log.update(repaired_paragraphs=indices, score_before_repair=val_result["score"],
+                                                   quality_score=repaired_result["score"], cost_usd=cost + repair_cost)
+                                logger.info(f"Repaired {len(indices)} paragraph(s) of {section_type}: score {val_result['score']} -> {repaired_result['score']}")
+                                if repaired_result["score"] >= self.MIN_QUALITY_SCORE:
+                                    self._count(self.repair_stats, accepted=1)
+                                if repaired_result["score"] >= val_result["score"]:
+                                    content, val_result = repaired_content, repaired_result
+                        if val_result["score"] < self.MIN_QUALITY_SCORE:
+                            if best is None or val_result["score"] > best[3]:
+                                best = (content, token_usage, model_name, val_result["score"], tier)
+                            if next_model and self._slo_allows_escalation(section_start, next_model):
+                                logger.warning(f"Low quality score {val_result['score']} for {section_type} on {model_name}. Escalating to {next_model}...")
+                                self._count(stats, escalations=1)
+                                break
+                            if next_model:
+                                logger.warning(f"Latency SLO exhausted for {section_type}; keeping best output (score {best[3]}) from {best[2]}")
+                                self._count(self._tier_stats(best[2]), accepted=1)
+                                return best[0], best[1], spent, dict(model=best[2], tier=best[4], attempts=attempts)
+                            logger.warning(f"Low quality score {val_result['score']} for {section_type}. Retrying...")
+                            self._sleep(2 ** attempt, deadline)
+                            continue
+                        logger.info(
+                            f"Section '{section_type}' generated by {model_name} in {latency:.2f}s with quality score: {val_result['score']}",
+                            extra=dict(sample=True, model=model_name, latency_seconds=round(latency, 3),
+                                       quality_score=val_result['score'], attempt=attempt + 1)
+                        )
+                    
+                    self._count(stats, accepted=1)
+                    return content, token_usage, spent, dict(model=model_name, tier=tier, attempts=attempts)
+
+                except GenerationAborted as e:
+                    latency = time.time() - start_time
+                    token_usage, cost = self._usage_and_cost(e.response, model_name, prompt_tokens)
+                    generated = token_usage.output_tokens or round(len(e.response.text.split()) / 0.75)
+                    spent += cost
+                    self._count(stats, attempts=1, latency_total=latency, cost_total=cost)
+                    self.validator.record_stream_abort(e.reason)
+                    self._count(self.stream_stats, aborts=1, output_tokens_saved=max(0, cap - generated))
+                    attempts.append(dict(model=model_name, latency_seconds=round(latency, 2), cost_usd=cost, aborted=e.reason))
+                    # No backoff: the model is healthy, this generation just went wrong
+                    logger.warning(f"Aborted {section_type} stream on {model_name} ({e.reason}). Restarting...")
+
+                except Exception as e:
+                    if deadline is not None and deadline.expired:
+                        deadline.check()
+                    logger.warning(f"Attempt {attempt + 1} failed: {e}")
+                    attempts.append(dict(model=model_name, error=str(e)))
+                    self._sleep(2 ** attempt, deadline)
 
         raise RuntimeError(f"Failed to generate content for {section_type}")
 
-    def generate_complete_report(self, scenario, additional_context=""):
-        p1 = LegalPersonas.BUSINESS_ANALYST_PERSONA
-        p2 = LegalPersonas.MARKET_RESEARCHER_PERSONA
-        p3 = LegalPersonas.STRATEGIC_CONSULTANT_PERSONA
-        
+    def _build_fused_prompt(self, sections_map, context):
+        roles = dict()
+        for section_name, agent_type, persona in sections_map:
+            roles.setdefault(agent_type, persona)
+        role_text = "\n\n".join(f"--- ROLE: {agent_type} ---\n{persona}" for agent_type, persona in roles.items())
+        section_list = "\n".join(f"{i}. '{name}' (written as {agent_type})" for i, (name, agent_type, _) in enumerate(sections_map, 1))
+        marker = self.FUSED_SECTION_MARKER.format(name="<section name>")
+        head = f"You are a team of legal intelligence analysts with the following roles:\n\n{role_text}\n\nCONTEXT:\n"
+        task = (
+            f"\n\nTASK:\nGenerate the following sections of the legal report, in order, each from the perspective of its assigned role and building on the sections already written:\n{section_list}\n"
+            f"Start each section with a line containing exactly \"{marker}\" and write nothing outside the sections.\n"
+            "Focus on professional, clear, and actionable analysis."
+        )
+        return "".join((head, *context_segments(context), task))
+
+    def _split_fused_response(self, text, section_names):
+        marker = re.escape(self.FUSED_SECTION_MARKER).replace(re.escape("{name}"), r"\s*(.+?)\s*")
+        pattern = re.compile(r"^[\s#*]*" + marker + r"[\s*]*$", re.MULTILINE)
+        expected = {name.lower(): name for name in section_names}
+        matches = list(pattern.finditer(text))
+
+        sections = dict()
+        for i, match in enumerate(matches):
+            name = expected.get(match.group(1).strip(" '\"").lower())
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            content = text[match.end():end].strip()
+            if name and content and name not in sections:
+                sections[name] = content
+        return sections
+
+    def generate_fused_sections(self, sections_map, context="", deadline=None, max_output_tokens=None):
+        """Generate several sections in one model call and split the response per section."""
+        self._ensure_model()
+
+        prompt = self._build_fused_prompt(sections_map, context)
+        max_tokens = 0
+        for name, _, _ in sections_map:
+            budget = self.output_model.max_output_tokens(name)
+            max_tokens += min(budget, max_output_tokens) if max_output_tokens else budget
+        max_tokens = min(max_tokens, self.FUSED_MAX_OUTPUT_TOKENS)
+        config = _sdk("GenerationConfig")(temperature=0.3, max_output_tokens=max_tokens)
+
+        start_time = time.time()
+        response = self._call_model(f"fused:{self.model_name}", self.model, prompt, config, deadline)
+        latency = time.time() - start_time
+        usage, cost = self._usage_and_cost(response, self.model_name)
+
+        sections = self._split_fused_response(response.text, [name for name, _, _ in sections_map])
+        logger.info(f"Fused call produced {len(sections)}/{len(sections_map)} sections in {latency:.2f}s")
+
+        # Apportion the shared call by each section's share of the output
+        results = dict()
+        total_chars = sum(len(content) for content in sections.values()) or 1
+        for name, content in sections.items():
+            share = len(content) / total_chars
+            in_toks = round(usage.input_tokens / len(sections))
+            out_toks = round(usage.output_tokens * share)
+            section_usage = UsageRecord(in_toks, out_toks)
+            results[name] = (content, section_usage, cost * share, latency * share)
+        return results
+
+    def summarize_report(self, report_items, scenario=None, mode=None, deadline=None):
+        """Executive summary for generated sections; returns (summary, stats)."""
+        summary, stats = self.summarizer.summarize([(item["title"], item["content"]) for item in report_items])
+        if (mode or self.summary_mode) != "llm" or not summary:
+            return summary, stats
+
+        case_name = getattr(scenario, "case_name", "the case")
+        prompt = (
+            f"Rewrite the following extractive executive summary of the legal report for {case_name} "
+            "into a concise, fluent executive summary of at most 150 words. Do not add facts that are not in it.\n\n"
+            f"EXTRACTIVE SUMMARY:\n{summary}"
+        )
+        config = _sdk("GenerationConfig")(temperature=0.2, max_output_tokens=self.REPAIR_MAX_OUTPUT_TOKENS)
+        start_time = time.time()
+        try:
+            response = self._call_model(f"executive_summary:{self.model_name}", self.model, prompt, config, deadline)
+            usage, cost = self._usage_and_cost(response)
+        except Exception as e:
+            logger.warning(f"Executive summary polish failed, keeping extractive summary: {e}")
+            return summary, stats
+        polished = (response.text or "").strip()
+        if not polished:
+            return summary, stats
+        return polished, dict(stats, mode="llm", polish_latency_seconds=round(time.time() - start_time, 2),
+                              polish_tokens=usage.total_tokens, polish_cost_usd=cost)
+
+    def affected_sections(self, previous_text, new_text):
+        """
+        Sections an amended complaint invalidates.
+
+        Diffs the complaints paragraph by paragraph, maps each changed
+        paragraph to the sections whose SECTION_TOPICS it mentions (all
+        sections when it mentions none), then follows the chain: a section
+        is affected when any earlier section it reads is. Returns the
+        affected section names in plan order and diff stats.
+        """
+        def paragraphs(text):
+            return [" ".join(p.split()) for p in split_paragraphs(text)[::2] if p.strip()]
+
+        old, new = paragraphs(previous_text), paragraphs(new_text)
+        changed = list()
+        for op, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old, new, autojunk=False).get_opcodes():
+            if op != "equal":
+                changed.extend(old[i1:i2] + new[j1:j2])
+
+        direct = set()
+        for paragraph in changed:
+            lowered = paragraph.lower()
+            hits = {name for name, topics in self.SECTION_TOPICS.items() if any(t in lowered for t in topics)}
+            direct |= hits or {name for name, _ in self.SECTION_PLAN}
+
+        affected = list()
+        for section_name, _ in self.SECTION_PLAN:
+            if section_name in direct or affected:
+                affected.append(section_name)
+        return affected, dict(
+            paragraphs_before=len(old),
+            paragraphs_after=len(new),
+            changed_paragraphs=len(changed),
+            directly_affected=[name for name, _ in self.SECTION_PLAN if name in direct]
+        )
+
+    def generate_complete_report(self, scenario, additional_context="", fused=None, deadline=None,
+                                 sections=None, max_output_tokens=None, reuse=None):
+        # reuse: section name -> report item from an earlier report, kept as is
+        reuse = reuse or dict()
         sections_map = list()
-        sections_map.append(("Market Overview", p1))
-        sections_map.append(("Competitive Analysis", p2))
-        sections_map.append(("Risk Assessment", p3))
-        sections_map.append(("Strategic Recommendations", p3))
+        for section_name, agent_type in self.SECTION_PLAN:
+            if sections and section_name not in sections:
+                continue
+            sections_map.append((section_name, agent_type, LegalPersonas.get_persona(agent_type)))
 
         generated_report = list()
-        chain_context = f"SCENARIO:\n{scenario}\n\nADDITIONAL CONTEXT:\n{additional_context}"
+        # Segments (scenario, then each completed section) rather than one growing string
+        chain_context = ChainedContext(scenario, additional_context)
 
         total_cost = 0.0
         total_tokens = 0
@@ -127,56 +649,125 @@ class LegalIntelligenceAgent:
         all_scores = []
         audit_trail = []
 
-        logger.info("Starting report generation workflow...")
+        if fused is None:
+            fused = str(getattr(scenario, "urgency_level", "")).lower() in self.fusion_urgencies
 
-        for section_name, persona in sections_map:
-            logger.info(f"Agent working on: {section_name}")
-            
-            section_start = time.time()
-            content, usage, cost = self.generate_section_content(section_type=section_name, context=chain_context, persona=persona)
-            section_latency = time.time() - section_start
+        fused_results = dict()
+        pending = [entry for entry in sections_map if entry[0] not in reuse]
+        if fused and pending:
+            logger.info("Starting fused report generation workflow...")
+            try:
+                fused_results = self.generate_fused_sections(pending, chain_context, deadline, max_output_tokens)
+            except Exception as e:
+                logger.warning(f"Fused generation failed, falling back to per-section calls: {e}")
+        else:
+            logger.info("Starting report generation workflow...")
+
+        for section_name, agent_type, persona in sections_map:
+            set_log_context(section=section_name)
+            if section_name in reuse:
+                # Unaffected by an amendment: keep the earlier content and audit entry
+                logger.info(f"Reusing unaffected section: {section_name}", extra=dict(sample=True))
+                item = reuse[section_name]
+                audit_trail.append(item["audit"])
+                generated_report.append(item)
+                chain_context.add_section(section_name, item["content"])
+                continue
+            if deadline is not None and deadline.expired:
+                logger.warning(f"Deadline reached ({deadline.reason or 'timeout'}); stopping before {section_name}")
+                break
+            logger.info(f"Agent working on: {section_name}", extra=dict(sample=True))
             
-            final_score = self.validator.validate_response(content, chain_context)["score"]
+            mode = "sequential"
+            final_score = None
+            fused_cost = 0.0
+            tier_info = dict(model=self.model_name, tier=0, attempts=[])
+            if section_name in fused_results:
+                content, usage, cost, section_latency = fused_results[section_name]
+                final_score = self.validator.validate_response(content, chain_context)["score"]
+                mode = "fused"
+                if final_score < self.MIN_QUALITY_SCORE:
+                    logger.warning(f"Fused section '{section_name}' scored {final_score}. Regenerating individually...")
+                    mode = "fused_regenerated"
+                    final_score = None
+                    fused_cost = cost
+            elif fused:
+                mode = "fused_regenerated"
+
+            if final_score is None:
+                section_start = time.time()
+                try:
+                    content, usage, cost, tier_info = self._generate_section(
+                        section_name, chain_context, persona, deadline, max_output_tokens
+                    )
+                except DeadlineExceeded as e:
+                    logger.warning(f"{e}; stopping during {section_name}")
+                    break
+                except Exception:
+                    self._count(self.report_stats, failures=1)
+                    raise
+                section_latency = time.time() - section_start
+                final_score = self.validator.validate_response(content, chain_context)["score"]
+                # A discarded fused section was still paid for
+                cost += fused_cost
             
             total_cost += cost
             total_tokens += usage.total_tokens
             total_latency += section_latency
             all_scores.append(final_score)
             
-            audit_trail.append({
-                "section": section_name,
-                "latency_seconds": round(section_latency, 2),
-                "cost_usd": cost,
-                "tokens_used": usage.total_tokens,
-                "quality_score": final_score,
-                "input_context_preview": chain_context[:300] + "...",
-                "output_preview": content[:300] + "..."
-            })
-            
-            report_item = dict()
-            report_item["title"] = section_name
-            report_item["content"] = content
-            report_item["metrics"] = usage
+            # Previews are derived from the content and context on access, not copied
+            audit_entry = AuditRecord(
+                section=section_name,
+                timestamp=datetime.now().isoformat(),
+                latency_seconds=round(section_latency, 2),
+                cost_usd=cost,
+                tokens_used=usage.total_tokens,
+                quality_score=final_score,
+                generation_mode=mode,
+                model=tier_info["model"],
+                cascade_tier=tier_info["tier"],
+                cascade_attempts=tier_info["attempts"],
+                content=content,
+                context=chain_context,
+                # Address of the full section text in the report blob store
+                content_hash=content_hash(content)
+            )
+            audit_trail.append(audit_entry)
             
+            report_item = SectionRecord(section_name, agent_type, content, usage, audit_entry)
             generated_report.append(report_item)
-            chain_context += f"\n\n--- COMPLETED SECTION: {section_name} ---\n{content}"
+            chain_context.add_section(section_name, content)
+        set_log_context(section=None)
 
-        avg_latency = total_latency / len(sections_map) if sections_map else 0
+        if len(generated_report) < len(sections_map):
+            logger.warning(f"Partial report: {len(generated_report)}/{len(sections_map)} sections completed")
+
+        avg_latency = total_latency / len(generated_report) if generated_report else 0
         avg_score = sum(all_scores) / len(all_scores) if all_scores else 0
+        accepted_models = [entry["model"] for entry in audit_trail]
+        tier_hits = ", ".join(f"{m}={accepted_models.count(m)}" for m in dict.fromkeys(accepted_models))
+
+        generated = [item for item in generated_report if item["title"] not in reuse]
+        self._count(
+            self.report_stats, reports=1, processing_time=total_latency, cost=total_cost,
+            input_tokens=sum(item["metrics"].input_tokens for item in generated),
+            output_tokens=sum(item["metrics"].output_tokens for item in generated)
+        )
         
-        logger.info("\n" + "="*50)
-        logger.info("📊 REPORT GENERATION SUMMARY")
-        logger.info("="*50)
-        logger.info(f"Total Cost:         ${total_cost:.5f}")
-        logger.info(f"Total Tokens:       {total_tokens}")
-        logger.info(f"Average Latency:    {avg_latency:.2f}s per section")
-        logger.info(f"Overall Quality:    {avg_score:.2f} / 1.0")
-        logger.info("="*50 + "\n")
+        # One record instead of a multi-line banner; JSON logs carry the figures as fields
+        logger.info(
+            f"Report summary: cost ${total_cost:.5f}, {total_tokens} tokens, "
+            f"{avg_latency:.2f}s per section, quality {avg_score:.2f}, accepted by {tier_hits or 'none'}",
+            extra=dict(cost_usd=round(total_cost, 5), total_tokens=total_tokens, sections=len(generated_report),
+                       avg_latency_seconds=round(avg_latency, 3), total_latency_seconds=round(total_latency, 3),
+                       quality_score=round(avg_score, 3))
+        )
         
         try:
-            with open("audit_trail.json", "w") as f:
-                json.dump(audit_trail, f, indent=4)
-            logger.info("✅ Audit trail successfully saved to 'audit_trail.json'")
+            with open(self.audit_trail_path, "w") as f:
+                json.dump([dict(entry) for entry in audit_trail], f, indent=4)
+            logger.info(f"✅ Audit trail successfully saved to '{self.audit_trail_path}'")
         except Exception as e:
             logger.error(f"Failed to write audit trail: {e}")
 
@@ -0,0 +1,355 @@
+"""
+Columnar Audit Store
+====================
+Fleet-wide audit analytics over every generated section.
+
+Each audit record is stored column by column: fixed-width NumPy arrays
+for timestamp, latency, tokens, cost and quality score, and
+dictionary-encoded uint16 codes for section, model, case type,
+generation mode and urgency. Records are buffered in memory and written
+out in immutable segments (one .npy file per column). Segments are
+memory-mapped for reads, and each records its time range so queries over
+recent data skip older segments entirely.
+
+Under light traffic the flush interval, not the segment size, ends most
+segments, so flushes leave many small segments behind. Once COMPACT_FANIN
+small segments trail the store they are merged into one. Mappings are
+opened per column as queries need them and kept in a bounded LRU; each
+one holds a file descriptor.
+
+Aggregates are computed vectorized: group keys are combined into one
+dense integer code, counts and sums use bincount, and a radix sort by
+that code lays each group out contiguously for its percentiles.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Numeric columns and their on-disk types
+MEASURES = {
+    "timestamp": np.float64,
+    "latency_seconds": np.float32,
+    "input_tokens": np.int32,
+    "output_tokens": np.int32,
+    "total_tokens": np.int32,
+    "cost_usd": np.float64,
+    "quality_score": np.float32,
+}
+
+# Dictionary-encoded columns
+DIMENSIONS = ("section", "model", "case_type", "generation_mode", "urgency")
+
+# Columns a query may aggregate
+METRICS = tuple(name for name in MEASURES if name != "timestamp")
+
+# Trailing segments smaller than segment_size that are merged into one
+COMPACT_FANIN = 8
+
+# Column mappings (one open file descriptor each) kept between queries
+MAX_MAPPED_COLUMNS = 256
+
+_MANIFEST = "manifest.json"
+
+
+class AuditStore:
+    """
+    Append-only columnar store of section audit records.
+
+    Args:
+        directory: Where segments, dictionaries and the manifest live
+        segment_size: Buffered records that trigger writing a segment
+        flush_seconds: Buffered records older than this are written on the next append
+    """
+
+    def __init__(self, directory: str = "audit_store", segment_size: int = 65536,
+                 flush_seconds: float = 60.0):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        manifest = self._read_manifest()
+        self._segments: List[Dict[str, Any]] = manifest.get("segments", [])
+        self._values: Dict[str, List[str]] = {d: manifest.get("dictionaries", {}).get(d, []) for d in DIMENSIONS}
+        self._codes: Dict[str, Dict[str, int]] = {d: {v: i for i, v in enumerate(vals)} for d, vals in self._values.items()}
+        self._mapped: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self.compactions = 0
+        self._buffer: Dict[str, list] = {column: list() for column in list(MEASURES) + list(DIMENSIONS)}
+        self._buffered_since: Optional[float] = None
+
+    # Writing
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        path = os.path.join(self.directory, _MANIFEST)
+        if not os.path.exists(path):
+            return dict()
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_manifest(self) -> None:
+        path = os.path.join(self.directory, _MANIFEST)
+        with open(path + ".tmp", "w") as f:
+            json.dump(dict(segments=self._segments, dictionaries=self._values), f)
+        os.replace(path + ".tmp", path)
+
+    def _encode(self, dimension: str, value: Any) -> int:
+        value = str(value or "")
+        code = self._codes[dimension].get(value)
+        if code is None:
+            code = len(self._values[dimension])
+            if code > np.iinfo(np.uint16).max:
+                raise ValueError(f"Too many distinct {dimension} values")
+            self._codes[dimension][value] = code
+            self._values[dimension].append(value)
+        return code
+
+    def append(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Buffer audit records (dicts of MEASURES and DIMENSIONS); returns how many."""
+        count = 0
+        with self._lock:
+            for record in records:
+                for column in MEASURES:
+                    self._buffer[column].append(record.get(column) or 0)
+                for dimension in DIMENSIONS:
+                    self._buffer[dimension].append(self._encode(dimension, record.get(dimension)))
+                count += 1
+            if count and self._buffered_since is None:
+                self._buffered_since = time.time()
+            buffered = len(self._buffer["timestamp"])
+            if buffered >= self.segment_size or (
+                buffered and time.time() - self._buffered_since >= self.flush_seconds
+            ):
+                self._flush()
+        return count
+
+    def append_report(self, report_items: Sequence[Dict[str, Any]], case_type: str = "",
+                      urgency: str = "") -> int:
+        """Buffer one record per generated section of an agent report."""
+        records = list()
+        for item in report_items:
+            audit, metrics = item["audit"], item["metrics"]
+            try:
+                timestamp = datetime.fromisoformat(audit["timestamp"]).timestamp()
+            except (KeyError, TypeError, ValueError):
+                timestamp = time.time()
+            records.append(dict(
+                timestamp=timestamp,
+                latency_seconds=audit.get("latency_seconds"),
+                input_tokens=metrics.input_tokens,
+                output_tokens=metrics.output_tokens,
+                total_tokens=metrics.total_tokens,
+                cost_usd=audit.get("cost_usd"),
+                quality_score=audit.get("quality_score"),
+                section=item["title"],
+                model=audit.get("model"),
+                case_type=case_type,
+                generation_mode=audit.get("generation_mode"),
+                urgency=str(urgency).lower()
+            ))
+        return self.append(records)
+
+    def flush(self) -> None:
+        """Write buffered records out as a segment."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        rows = len(self._buffer["timestamp"])
+        if not rows:
+            return
+        # The manifest is written last, so a crash mid-flush leaves no partial segment visible
+        self._segments.append(self._write_segment(self._buffer_arrays()))
+        self._write_manifest()
+        self._buffer = {column: list() for column in self._buffer}
+        self._buffered_since = None
+        self._compact()
+
+    def _write_segment(self, columns: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """Write columns as a new segment directory; returns its manifest entry."""
+        number = max((int(segment["name"].rsplit("-", 1)[1]) for segment in self._segments), default=0) + 1
+        name = f"segment-{number:06d}"
+        path = os.path.join(self.directory, name)
+        os.makedirs(path, exist_ok=True)
+        for column, values in columns.items():
+            np.save(os.path.join(path, f"{column}.npy"), values)
+        return dict(
+            name=name,
+            rows=len(columns["timestamp"]),
+            ts_min=float(columns["timestamp"].min()),
+            ts_max=float(columns["timestamp"].max())
+        )
+
+    def _compact(self) -> None:
+        """Merge the trailing run of small segments once it reaches COMPACT_FANIN."""
+        run = 0
+        while run < len(self._segments) and self._segments[-run - 1]["rows"] < self.segment_size:
+            run += 1
+        if run < COMPACT_FANIN:
+            return
+        merged_from = self._segments[-run:]
+        columns = {
+            column: np.concatenate([
+                np.load(os.path.join(self.directory, segment["name"], f"{column}.npy"))
+                for segment in merged_from
+            ])
+            for column in list(MEASURES) + list(DIMENSIONS)
+        }
+        merged = self._write_segment(columns)
+        # Swap in the merged segment before removing the old ones: a crash leaves only unreferenced files
+        self._segments = self._segments[:-run] + [merged]
+        self._write_manifest()
+        for segment in merged_from:
+            for key in [key for key in self._mapped if key[0] == segment["name"]]:
+                del self._mapped[key]
+            shutil.rmtree(os.path.join(self.directory, segment["name"]), ignore_errors=True)
+        self.compactions += 1
+
+    def _buffer_arrays(self) -> Dict[str, np.ndarray]:
+        columns = {column: np.asarray(self._buffer[column], dtype=dtype) for column, dtype in MEASURES.items()}
+        columns.update({d: np.asarray(self._buffer[d], dtype=np.uint16) for d in DIMENSIONS})
+        return columns
+
+    # Reading
+
+    def _segment(self, name: str, columns: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Mappings of the requested columns of a segment (LRU-cached)."""
+        mapped = dict()
+        for column in columns:
+            key = (name, column)
+            array = self._mapped.get(key)
+            if array is None:
+                array = np.load(os.path.join(self.directory, name, f"{column}.npy"), mmap_mode="r")
+                self._mapped[key] = array
+                if len(self._mapped) > MAX_MAPPED_COLUMNS:
+                    # Dropping the last reference unmaps it and closes its descriptor
+                    self._mapped.popitem(last=False)
+            else:
+                self._mapped.move_to_end(key)
+            mapped[column] = array
+        return mapped
+
+    def _columns(self, names: Sequence[str], since: Optional[float], until: Optional[float]) -> Dict[str, np.ndarray]:
+        """Requested columns over segments overlapping [since, until) plus the buffer."""
+        wanted = set(names) | {"timestamp"}
+        with self._lock:
+            parts = [
+                self._segment(segment["name"], wanted) for segment in self._segments
+                if (since is None or segment["ts_max"] >= since) and (until is None or segment["ts_min"] < until)
+            ]
+            if self._buffer["timestamp"]:
+                parts.append(self._buffer_arrays())
+        columns = dict()
+        for name in wanted:
+            dtype = MEASURES.get(name, np.uint16)
+            if len(parts) == 1:
+                columns[name] = parts[0][name]
+            else:
+                columns[name] = np.concatenate([part[name] for part in parts]) if parts else np.zeros(0, dtype=dtype)
+        return columns
+
+    def aggregate(self, metric: str = "latency_seconds", group_by: Sequence[str] = ("section",),
+                  since: Optional[float] = None, until: Optional[float] = None,
+                  filters: Optional[Dict[str, str]] = None,
+                  percentiles: Sequence[float] = (50, 95)) -> Dict[str, Any]:
+        """
+        Aggregate a metric per group.
+
+        Args:
+            metric: One of METRICS
+            group_by: DIMENSIONS to group by (empty for one overall group)
+            since, until: Epoch-second time range
+            filters: DIMENSION -> value equality filters
+            percentiles: Percentiles (0-100) computed per group
+
+        Returns:
+            Dict with the matched record count, timing and one entry per
+            group with its dimension values, count, sum, mean, min, max and
+            the requested percentiles
+        """
+        start = time.perf_counter()
+        filters = {k: v for k, v in (filters or {}).items() if v}
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {', '.join(METRICS)}")
+        for dimension in list(group_by) + list(filters):
+            if dimension not in DIMENSIONS:
+                raise ValueError(f"Unknown dimension {dimension!r}; expected one of {', '.join(DIMENSIONS)}")
+        for p in percentiles:
+            if not 0 <= p <= 100:
+                raise ValueError(f"Percentile {p} is outside 0-100")
+
+        columns = self._columns([metric] + list(group_by) + list(filters), since, until)
+        mask = np.ones(len(columns["timestamp"]), dtype=bool)
+        if since is not None:
+            mask &= columns["timestamp"] >= since
+        if until is not None:
+            mask &= columns["timestamp"] < until
+        for dimension, value in filters.items():
+            code = self._codes[dimension].get(str(value))
+            mask &= (columns[dimension] == code) if code is not None else False
+        # Gathering by index is several times faster than boolean indexing
+        rows = None if mask.all() else np.flatnonzero(mask)
+
+        def select(name):
+            return columns[name] if rows is None else columns[name].take(rows)
+
+        values = select(metric).astype(np.float64)
+        # One dense integer key per combination of group-by codes
+        sizes = [max(len(self._values[dimension]), 1) for dimension in group_by]
+        key_count = int(np.prod(sizes)) if sizes else 1
+        key_type = np.uint16 if key_count <= np.iinfo(np.uint16).max else np.int64
+        key = np.zeros(len(values), dtype=key_type)
+        for dimension, size in zip(group_by, sizes):
+            key = key * key_type(size) + select(dimension).astype(key_type)
+
+        counts = np.bincount(key, minlength=key_count)
+        sums = np.bincount(key, weights=values, minlength=key_count)
+        # Stable argsort of small integer keys is a radix sort
+        ordered = values[np.argsort(key, kind="stable")]
+        ends = np.cumsum(counts)
+
+        results = list()
+        for group in np.flatnonzero(counts):
+            group_values = ordered[ends[group] - counts[group]:ends[group]]
+            entry, remainder = dict(), int(group)
+            for dimension, size in reversed(list(zip(group_by, sizes))):
+                entry[dimension] = self._values[dimension][remainder % size]
+                remainder //= size
+            entry = {d: entry[d] for d in group_by}
+            entry.update(
+                count=int(counts[group]),
+                sum=round(float(sums[group]), 6),
+                mean=round(float(sums[group] / counts[group]), 6),
+                min=round(float(group_values.min()), 6),
+                max=round(float(group_values.max()), 6)
+            )
+            if percentiles:
+                for p, value in zip(percentiles, np.percentile(group_values, list(percentiles))):
+                    entry[f"p{p:g}"] = round(float(value), 6)
+            results.append(entry)
+
+        return dict(
+            metric=metric,
+            group_by=list(group_by),
+            records=len(values),
+            groups=results,
+            elapsed_ms=round((time.perf_counter() - start) * 1000, 2)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            directory=self.directory,
+            segments=len(self._segments),
+            stored_records=sum(segment["rows"] for segment in self._segments),
+            buffered_records=len(self._buffer["timestamp"]),
+            compactions=self.compactions,
+            mapped_columns=len(self._mapped)
+        )
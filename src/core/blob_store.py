@@ -0,0 +1,196 @@
+"""
+Content-Addressed Blob Store
+============================
+Stores texts once, keyed by their SHA-256, compressed with zlib.
+
+Section texts recur across a report archive: the same content appears in
+the report, in its audit record and in reused or reanalyzed reports.
+Storing them by hash writes each distinct text once. Compression uses a
+zlib preset dictionary (zdict) trained from stored texts, which helps
+most on the short texts (previews, small sections) that plain zlib
+compresses poorly. Every blob records the dictionary it was written with,
+so older blobs stay readable after retraining.
+
+Writes never train: a dictionary is due after every train_after blobs
+written with the current one (or with none), and the owner trains it
+outside its write path. Each training samples the newest blobs up to
+MAX_TRAINING_BYTES, so the dictionary follows the archive as it changes.
+"""
+
+import hashlib
+import sqlite3
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+# zlib can only reference the last 32 KiB of a preset dictionary
+MAX_DICTIONARY_BYTES = 32 * 1024
+
+# Documents a phrase must appear in to be put in a trained dictionary
+MIN_PHRASE_DOCUMENTS = 2
+
+# Most text decompressed to train one dictionary; larger blobs are skipped
+MAX_TRAINING_BYTES = 4 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS zdicts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    dict_id INTEGER NOT NULL DEFAULT 0,
+    raw_size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+
+
+def content_hash(text: str) -> str:
+    """Address of a text in the blob store."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def train_dictionary(samples: Iterable[str], size: int = MAX_DICTIONARY_BYTES) -> bytes:
+    """
+    Build a zlib preset dictionary from sample texts.
+
+    Lines and word 4-grams shared by several samples are packed most
+    frequent last, since zlib finds matches near the end of the
+    dictionary most cheaply.
+    """
+    document_frequency = Counter()
+    for text in samples:
+        phrases = {line.strip() for line in text.splitlines() if 12 <= len(line.strip()) <= 200}
+        words = text.split()
+        phrases.update(" ".join(words[i:i + 4]) for i in range(len(words) - 3))
+        document_frequency.update(phrases)
+
+    pieces, total = list(), 0
+    for phrase, count in document_frequency.most_common():
+        if count < MIN_PHRASE_DOCUMENTS or total + len(phrase) + 1 > size:
+            break
+        pieces.append(phrase)
+        total += len(phrase) + 1
+    return "\n".join(reversed(pieces)).encode("utf-8")
+
+
+class BlobStore:
+    """
+    Deduplicated, compressed text blobs in SQLite.
+
+    The store uses the caller's connection so blobs are written in the
+    same transaction as the rows that reference them; callers serialize
+    access (ReportRepository holds its lock around every call).
+
+    Args:
+        conn: SQLite connection
+        train_after: Blobs written with the current dictionary (or none)
+            before training a new one is due
+        level: zlib compression level
+    """
+
+    def __init__(self, conn: sqlite3.Connection, train_after: int = 200, level: int = 6):
+        self._conn = conn
+        self.train_after = train_after
+        self.level = level
+        self._conn.executescript(_SCHEMA)
+        self._dictionaries: Dict[int, bytes] = {
+            row[0]: row[1] for row in self._conn.execute("SELECT id, data FROM zdicts")
+        }
+        # Every blob since the last training was written with the newest dictionary
+        self._since_training = self._conn.execute(
+            "SELECT COUNT(*) FROM blobs WHERE dict_id = ?", (self.dictionary_id,)
+        ).fetchone()[0]
+        self.writes = 0
+        self.dedup_hits = 0
+        self.bytes_in = 0
+        self.bytes_written = 0
+
+    @property
+    def dictionary_id(self) -> int:
+        """Dictionary used for new blobs (0 for none)."""
+        return max(self._dictionaries, default=0)
+
+    @property
+    def training_due(self) -> bool:
+        """Whether enough blobs were written since the last training to train again."""
+        return self._since_training >= self.train_after
+
+    def _compress(self, raw: bytes, dict_id: int) -> bytes:
+        if dict_id:
+            compressor = zlib.compressobj(self.level, zdict=self._dictionaries[dict_id])
+        else:
+            compressor = zlib.compressobj(self.level)
+        return compressor.compress(raw) + compressor.flush()
+
+    def put(self, text: str) -> str:
+        """Store a text (once) and return its hash."""
+        key = content_hash(text)
+        raw = text.encode("utf-8")
+        self.bytes_in += len(raw)
+        if self._conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (key,)).fetchone():
+            self.dedup_hits += 1
+            return key
+
+        dict_id = self.dictionary_id
+        data = self._compress(raw, dict_id)
+        self._conn.execute(
+            "INSERT INTO blobs (hash, dict_id, raw_size, data) VALUES (?, ?, ?, ?)",
+            (key, dict_id, len(raw), data)
+        )
+        self.writes += 1
+        self.bytes_written += len(data)
+        self._since_training += 1
+        return key
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT dict_id, data FROM blobs WHERE hash = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        dict_id, data = row[0], row[1]
+        decompressor = zlib.decompressobj(zdict=self._dictionaries[dict_id]) if dict_id else zlib.decompressobj()
+        return (decompressor.decompress(data) + decompressor.flush()).decode("utf-8")
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        return {key: self.get(key) for key in set(keys)}
+
+    def train(self, limit: Optional[int] = None, max_bytes: int = MAX_TRAINING_BYTES) -> int:
+        """
+        Train a dictionary from the newest stored blobs; returns its id.
+
+        Samples at most limit blobs (train_after by default) and max_bytes
+        of text, skipping blobs that would overrun the byte budget.
+        """
+        limit = limit or self.train_after
+        keys, total = list(), 0
+        for key, raw_size in self._conn.execute("SELECT hash, raw_size FROM blobs ORDER BY rowid DESC"):
+            if len(keys) >= limit or total >= max_bytes:
+                break
+            if total + raw_size <= max_bytes:
+                keys.append(key)
+                total += raw_size
+        dictionary = train_dictionary(self.get(key) for key in keys)
+        # Too little shared phrasing, or nothing new: try again after another train_after blobs
+        self._since_training = 0
+        if not dictionary or dictionary == self._dictionaries.get(self.dictionary_id):
+            return self.dictionary_id
+        dict_id = self._conn.execute("INSERT INTO zdicts (data) VALUES (?)", (dictionary,)).lastrowid
+        self._dictionaries[dict_id] = dictionary
+        return dict_id
+
+    def stats(self) -> Dict[str, float]:
+        blobs, raw_bytes, stored_bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+        ).fetchone()
+        return dict(
+            blobs=blobs,
+            raw_bytes=raw_bytes,
+            stored_bytes=stored_bytes,
+            compression_ratio=round(raw_bytes / stored_bytes, 2) if stored_bytes else 0.0,
+            writes=self.writes,
+            dedup_hits=self.dedup_hits,
+            bytes_in=self.bytes_in,
+            bytes_written=self.bytes_written,
+            dictionary_id=self.dictionary_id
+        )
@@ -0,0 +1,128 @@
+"""
+Chained Context Builder
+=======================
+The context a report's sections are generated from: the scenario
+followed by every completed section.
+
+Appending each section to one string (chain_context += ...) copies the
+whole context on every append, which is quadratic in the number of
+sections. ChainedContext keeps the context as a list of immutable
+segments with cached lengths and hashes instead. Appending is O(segment),
+previews read only the leading segments, and the full text is joined at
+most once per state (cached until the next append), or straight into a
+prompt with render_into().
+"""
+
+import hashlib
+from typing import Dict, List, Optional, Set, Sequence, Tuple, Union
+
+
+class ChainedContext:
+    """
+    Scenario plus completed sections as immutable text segments.
+
+    Supports the read-only string operations callers use on a context:
+    len(), truthiness, prefix slices (context[:300]) and str().
+
+    Args:
+        scenario: The scenario (anything with a string form)
+        additional_context: Extra context appended after the scenario
+    """
+
+    def __init__(self, scenario, additional_context: str = ""):
+        self._segments: List[str] = list()
+        self._lengths: List[int] = list()
+        self._hashes: List[str] = list()
+        self._length = 0
+        self._digest = hashlib.sha1()
+        self._rendered: Optional[str] = None
+        self._words: Dict[Tuple[int, int], Set[str]] = dict()
+        self.append(f"SCENARIO:\n{scenario}\n\nADDITIONAL CONTEXT:\n{additional_context}")
+
+    def append(self, text: str) -> None:
+        """Add one segment (kept as is, not copied)."""
+        segment_hash = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        self._segments.append(text)
+        self._lengths.append(len(text))
+        self._hashes.append(segment_hash)
+        self._length += len(text)
+        self._digest.update(segment_hash.encode("ascii"))
+        self._rendered = None
+
+    def add_section(self, name: str, content: str) -> None:
+        """Add a completed section; its content is stored as its own segment."""
+        self.append(f"\n\n--- COMPLETED SECTION: {name} ---\n")
+        self.append(content)
+
+    @property
+    def segments(self) -> Tuple[str, ...]:
+        return tuple(self._segments)
+
+    @property
+    def segment_hashes(self) -> Tuple[str, ...]:
+        return tuple(self._hashes)
+
+    @property
+    def digest(self) -> str:
+        """Hash of the whole context, derived from the segment hashes."""
+        return self._digest.hexdigest()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def preview(self, chars: int) -> str:
+        """The first chars characters, read from the leading segments only."""
+        parts, remaining = list(), chars
+        for segment, length in zip(self._segments, self._lengths):
+            if remaining <= 0:
+                break
+            parts.append(segment if length <= remaining else segment[:remaining])
+            remaining -= length
+        return "".join(parts)
+
+    def __getitem__(self, key: Union[slice, int]) -> str:
+        if isinstance(key, slice) and key.start in (None, 0) and key.step in (None, 1) \
+                and key.stop is not None and key.stop >= 0:
+            return self.preview(key.stop)
+        return self.render()[key]
+
+    def distinct_words(self, min_length: int = 0) -> Set[str]:
+        """Distinct lowercased words longer than min_length, cached per segment."""
+        words = set()
+        for index, segment in enumerate(self._segments):
+            key = (index, min_length)
+            segment_words = self._words.get(key)
+            if segment_words is None:
+                segment_words = {w for w in segment.lower().split() if len(w) > min_length}
+                self._words[key] = segment_words
+            words |= segment_words
+        return words
+
+    def render(self) -> str:
+        """The full context text, joined once per state."""
+        if self._rendered is None:
+            self._rendered = "".join(self._segments)
+        return self._rendered
+
+    def render_into(self, prefix: str = "", suffix: str = "") -> str:
+        """prefix + context + suffix in a single join (no intermediate context string)."""
+        if self._rendered is not None:
+            return "".join((prefix, self._rendered, suffix))
+        return "".join([prefix, *self._segments, suffix])
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def __format__(self, spec: str) -> str:
+        return format(self.render(), spec)
+
+    def __repr__(self) -> str:
+        return f"ChainedContext(segments={len(self._segments)}, length={self._length})"
+
+
+def context_segments(context: Union[str, ChainedContext]) -> Sequence[str]:
+    """Segments of a context given either as a ChainedContext or a plain string."""
+    return context.segments if isinstance(context, ChainedContext) else (context,)
@@ -0,0 +1,87 @@
+"""
+Request Deadlines
+=================
+A deadline travels with a report request from the HTTP handler down to
+every model call and retry sleep. It expires when its time budget runs
+out or when it is cancelled (e.g. the client disconnected), and blocking
+waits wake up as soon as either happens.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work continues past its deadline or after cancellation."""
+
+
+class Deadline:
+    """
+    Time budget for one request.
+
+    Args:
+        timeout_seconds: Seconds from now until expiry; None means unbounded
+    """
+
+    def __init__(self, timeout_seconds: Optional[float] = None):
+        self.timeout_seconds = timeout_seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + timeout_seconds if timeout_seconds is not None else None
+        self.reason: Optional[str] = None
+        self._cancelled = threading.Event()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (0 once expired), or None for an unbounded deadline."""
+        if self._cancelled.is_set():
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        if not self._cancelled.is_set():
+            self.reason = reason
+            self._cancelled.set()
+
+    def check(self) -> None:
+        """Raise DeadlineExceeded if the deadline has passed or was cancelled."""
+        if self.expired:
+            self._raise()
+
+    def _raise(self) -> None:
+        if self.reason is None:
+            self.reason = "timeout"
+        raise DeadlineExceeded(f"Deadline exceeded ({self.reason}) after {self.elapsed():.1f}s")
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep up to seconds, waking early and raising if the deadline passes."""
+        remaining = self.remaining()
+        if remaining is not None and remaining < seconds:
+            self._cancelled.wait(remaining)
+            self._raise()
+        self._cancelled.wait(seconds)
+        self.check()
+
+    def summary(self) -> dict:
+        """Elapsed-time accounting for report metadata."""
+        remaining = self.remaining()
+        return dict(
+            timeout_seconds=self.timeout_seconds,
+            elapsed_seconds=round(self.elapsed(), 3),
+            remaining_seconds=round(remaining, 3) if remaining is not None else None,
+            expired=self.expired,
+            reason=self.reason
+        )
@@ -0,0 +1,155 @@
+"""
+Near-Duplicate Complaint Detection
+==================================
+MinHash signatures over word shingles, indexed with banded LSH, to find
+prior complaints that are near-identical to a new one (amended complaints,
+form complaints filed against several defendants) where an exact-hash
+cache would miss.
+
+Signatures are computed in NumPy: shingle hashes are rolled from per-token
+hashes, then permuted with multiply-shift hashing for all permutations at
+once, in bounded chunks so multi-megabyte filings do not blow up memory.
+"""
+
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.text import tokenize
+
+# Multiplier for rolling token hashes into shingle hashes (wraps mod 2^64)
+_ROLL = np.uint64(1000003)
+
+# Shingles hashed per NumPy pass
+_CHUNK = 4096
+
+
+class MinHasher:
+    """
+    MinHash signatures of word shingles.
+
+    Args:
+        num_perm: Signature length
+        shingle_size: Words per shingle
+        seed: Seed for the permutation coefficients
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        # Multiply-shift hashing: (a*x + b) mod 2^64 >> 32 with odd a
+        self._a = rng.randint(0, 1 << 62, size=(num_perm, 1), dtype=np.int64).astype(np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.randint(0, 1 << 62, size=(num_perm, 1), dtype=np.int64).astype(np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        """32-bit hashes of the text's word shingles (repeats are harmless to MinHash)."""
+        words = tokenize(text, drop_stopwords=False)
+        if not words:
+            return np.zeros(0, dtype=np.uint64)
+        # crc32 (stable across processes) once per distinct token
+        vocabulary = {word: zlib.crc32(word.encode("utf-8")) for word in set(words)}
+        token_hashes = np.fromiter((vocabulary[word] for word in words), dtype=np.uint64, count=len(words))
+
+        size = min(self.shingle_size, len(words))
+        count = len(words) - size + 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for offset in range(size):
+                hashes = hashes * _ROLL + token_hashes[offset:offset + count]
+        return (hashes >> np.uint64(32)) ^ (hashes & np.uint64(0xFFFFFFFF))
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = self.shingles(text)
+        signature = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        for start in range(0, len(hashes), _CHUNK):
+            chunk = hashes[start:start + _CHUNK]
+            with np.errstate(over="ignore"):
+                permuted = (self._a * chunk + self._b) >> np.uint64(32)
+            np.minimum(signature, permuted.min(axis=1), out=signature)
+        return signature
+
+
+class NearDuplicateIndex:
+    """
+    Banded LSH index of MinHash signatures.
+
+    With the defaults (16 bands of 8 rows) pairs above ~0.7 Jaccard
+    similarity are very likely to share a band; candidates are then
+    confirmed by their estimated similarity.
+
+    Args:
+        threshold: Minimum estimated Jaccard similarity to report a match
+        bands: LSH bands (num_perm must be divisible by this)
+        num_perm: MinHash signature length
+        max_entries: Oldest entries are evicted beyond this count
+    """
+
+    def __init__(self, threshold: float = 0.8, bands: int = 16, num_perm: int = 128,
+                 shingle_size: int = 5, max_entries: int = 10000):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+        self._signatures: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._buckets: List[Dict[bytes, set]] = [dict() for _ in range(bands)]
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.matches = 0
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key: str, text: str, signature: Optional[np.ndarray] = None) -> None:
+        """Index a complaint under key (e.g. its report ID)."""
+        signature = self.hasher.signature(text) if signature is None else signature
+        with self._lock:
+            if key in self._signatures:
+                self._remove(key)
+            self._signatures[key] = signature
+            for band, band_key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(band_key, set()).add(key)
+            while len(self._signatures) > self.max_entries:
+                self._remove(next(iter(self._signatures)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._signatures.clear()
+            self._buckets = [dict() for _ in range(self.bands)]
+
+    def _remove(self, key: str) -> None:
+        signature = self._signatures.pop(key)
+        for band, band_key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def query(self, text: str, signature: Optional[np.ndarray] = None) -> List[Tuple[str, float]]:
+        """Indexed keys whose estimated similarity meets the threshold, best first."""
+        signature = self.hasher.signature(text) if signature is None else signature
+        with self._lock:
+            self.lookups += 1
+            candidates = set()
+            for band, band_key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(band_key, ()))
+            scored = [(key, float(np.mean(self._signatures[key] == signature))) for key in candidates]
+        matches = sorted(((k, round(s, 3)) for k, s in scored if s >= self.threshold), key=lambda m: -m[1])
+        if matches:
+            self.matches += 1
+        return matches
+
+    def stats(self) -> Dict[str, float]:
+        return dict(
+            indexed=len(self._signatures),
+            lookups=self.lookups,
+            matches=self.matches,
+            threshold=self.threshold
+        )
@@ -0,0 +1,379 @@
+"""
+Legal Entity and Issue Extraction
+=================================
+Single-pass extraction of parties and key issues from complaint text.
+
+Issue terms are organised in a taxonomy keyed by ``CaseType``. At import
+time each case type's terms are inserted into a character trie, the trie is
+compiled into one anchored regular expression, and the distinct leading
+words of the terms are collected as scan anchors. Matching lowercases the
+document once, locates anchors with C-level substring search and lets the
+trie regex verify and extend each candidate. Party names are found by a
+pattern matcher over the full text rather than the first few lines.
+
+See benchmarks/bench_extractor.py for timings on multi-megabyte filings.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from src.models.legal_models import CaseType
+
+# Issue taxonomy: search term -> issue label. A trailing '*' matches any word
+# continuation (e.g. 'monopoli*' matches 'monopolization'); a space matches any
+# run of whitespace, including line breaks.
+ISSUE_TAXONOMY: Dict[CaseType, Dict[str, str]] = {
+    CaseType.INTELLECTUAL_PROPERTY: {
+        "patent*": "Patent dispute",
+        "trademark*": "Trademark dispute",
+        "copyright*": "Copyright dispute",
+        "trade secret*": "Trade Secret dispute",
+        "infring*": "Infringement dispute",
+        "misappropriat*": "Misappropriation claim",
+        "trade dress": "Trade Dress dispute",
+        "prior art": "Patent validity challenge",
+        "licens*": "Licensing dispute",
+        "injunct*": "Injunctive relief",
+        "willful*": "Willfulness allegation",
+    },
+    CaseType.CONTRACT: {
+        "breach*": "Contract breach",
+        "performance": "Contract performance",
+        "terminat*": "Contract termination",
+        "damages": "Contract damages",
+        "indemnif*": "Indemnification obligation",
+        "non-compete": "Restrictive covenant",
+        "non-disclosure": "Confidentiality obligation",
+        "nda": "Confidentiality obligation",
+        "warrant*": "Warranty claim",
+        "specific performance": "Specific performance remedy",
+    },
+    CaseType.ANTITRUST: {
+        "monopol*": "Monopolization claim",
+        "price fixing": "Price fixing",
+        "price-fixing": "Price fixing",
+        "bid rigging": "Bid rigging",
+        "market allocation": "Market allocation",
+        "tying": "Tying arrangement",
+        "exclusive dealing": "Exclusive dealing",
+        "predatory pricing": "Predatory pricing",
+        "sherman act": "Sherman Act violation",
+        "clayton act": "Clayton Act violation",
+        "merger*": "Merger review",
+        "anticompetitive": "Anticompetitive conduct",
+        "anti-competitive": "Anticompetitive conduct",
+    },
+    CaseType.EMPLOYMENT: {
+        "wrongful termination": "Wrongful termination",
+        "discriminat*": "Discrimination claim",
+        "harass*": "Harassment claim",
+        "retaliat*": "Retaliation claim",
+        "overtime": "Wage and hour claim",
+        "wage*": "Wage and hour claim",
+        "flsa": "Wage and hour claim",
+        "title vii": "Title VII claim",
+        "non-compete": "Restrictive covenant",
+        "hostile work environment": "Hostile work environment",
+        "whistleblow*": "Whistleblower protection",
+    },
+    CaseType.REGULATORY: {
+        "compliance": "Compliance failure",
+        "violat*": "Regulatory violation",
+        "enforcement": "Enforcement action",
+        "penalt*": "Civil penalties",
+        "consent decree": "Consent decree",
+        "sec": "Securities regulation",
+        "fda": "FDA regulation",
+        "epa": "Environmental regulation",
+        "hipaa": "Health privacy regulation",
+        "gdpr": "Data protection regulation",
+        "subpoena*": "Investigative subpoena",
+    },
+}
+
+# Fallbacks used when nothing is found
+DEFAULT_PARTIES = ["Party A", "Party B"]
+DEFAULT_ISSUES = ["Primary legal dispute", "Damages assessment", "Remedy determination"]
+
+_CASE_TYPE_ALIASES = {
+    "ip": CaseType.INTELLECTUAL_PROPERTY,
+    "intellectual property": CaseType.INTELLECTUAL_PROPERTY,
+    "intellectual": CaseType.INTELLECTUAL_PROPERTY,
+    "patent": CaseType.INTELLECTUAL_PROPERTY,
+    "trademark": CaseType.INTELLECTUAL_PROPERTY,
+    "copyright": CaseType.INTELLECTUAL_PROPERTY,
+    "contract": CaseType.CONTRACT,
+    "contractual": CaseType.CONTRACT,
+    "corporate": CaseType.CORPORATE,
+    "antitrust": CaseType.ANTITRUST,
+    "competition": CaseType.ANTITRUST,
+    "employment": CaseType.EMPLOYMENT,
+    "labor": CaseType.EMPLOYMENT,
+    "regulatory": CaseType.REGULATORY,
+    "compliance": CaseType.REGULATORY,
+}
+
+_ROLE_ANCHORS = ("plaintiff", "defendant", "petitioner", "respondent")
+_NAME_TOKEN = r"[A-Z][\w&'\-]*\.?"
+_NAME = rf"{_NAME_TOKEN}(?:,?[ \t]+(?:{_NAME_TOKEN}|of|and|&))*"
+
+# "Plaintiff TechFlow Innovations Inc." and "TechFlow Innovations Inc., Plaintiff,"
+_NAME_AFTER_ROLE = re.compile(rf"[sS]?[ \t]+({_NAME})")
+_NAME_BEFORE_ROLE = re.compile(rf"({_NAME}),\s*\Z")
+_CAPTION_ROLE_END = re.compile(r"[sS]?[ \t]*(?:[,.]|$)", re.MULTILINE)
+_CAPTION_LOOKBEHIND = 160
+
+_CORPORATE_SUFFIXES = {"inc.", "corp.", "co.", "ltd.", "l.l.c.", "n.a.", "l.p.", "s.a.", "plc.", "llc.", "llp."}
+_NAME_STOPWORDS = {"The", "This", "That", "These", "Each", "Its", "His", "Her", "Their", "In", "On", "As", "By", "For", "To"}
+_MAX_NAME_TOKENS = 6
+
+
+def normalize_case_type(case_type: Union[str, CaseType, None]) -> CaseType:
+    """Resolve a free-form case type string to a ``CaseType`` member."""
+    if isinstance(case_type, CaseType):
+        return case_type
+    if not case_type:
+        return CaseType.OTHER
+
+    key = " ".join(str(case_type).replace("_", " ").lower().split())
+    for member in CaseType:
+        if key in (member.value.lower(), member.name.replace("_", " ").lower()):
+            return member
+    if key in _CASE_TYPE_ALIASES:
+        return _CASE_TYPE_ALIASES[key]
+
+    words = set(key.replace("/", " ").replace("-", " ").split())
+    for alias, member in _CASE_TYPE_ALIASES.items():
+        if " " in alias:
+            if alias in key:
+                return member
+        elif alias in words:
+            return member
+    return CaseType.OTHER
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class _TrieNode:
+    __slots__ = ("children", "label", "prefix")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.label: Optional[str] = None
+        self.prefix = False
+
+
+class IssueMatcher:
+    """
+    Multi-pattern issue matcher compiled from a term trie.
+
+    Candidates are located by scanning for each distinct leading word of the
+    taxonomy; in CPython these C-level scans outrun stepping the regex engine
+    over every character of a large filing, so the trie regex is only run at
+    candidate positions.
+    """
+
+    def __init__(self, terms: Dict[str, str]):
+        self.labels = list(dict.fromkeys(terms.values()))
+        self._root = _TrieNode()
+        anchors: Dict[str, set] = {}
+        for term, label in terms.items():
+            self._insert(term, label)
+            anchor = term.rstrip("*").lower().split()[0]
+            anchors.setdefault(anchor, set()).add(label)
+
+        # An anchor that extends a shorter anchor is found by the shorter scan
+        self._anchors: List[Tuple[str, set]] = []
+        for anchor in sorted(anchors, key=len):
+            for shorter, labels in self._anchors:
+                if anchor.startswith(shorter):
+                    labels.update(anchors[anchor])
+                    break
+            else:
+                self._anchors.append((anchor, set(anchors[anchor])))
+
+        self._pattern = re.compile(self._to_regex(self._root)) if terms else None
+
+    def _insert(self, term: str, label: str) -> None:
+        node = self._root
+        prefix = term.endswith("*")
+        for char in " ".join(term.rstrip("*").lower().split()):
+            node = node.children.setdefault(char, _TrieNode())
+        node.label = label
+        node.prefix = prefix
+
+    def _to_regex(self, node: _TrieNode) -> str:
+        branches = []
+        for char in sorted(node.children):
+            piece = r"\s+" if char == " " else re.escape(char)
+            branches.append(piece + self._to_regex(node.children[char]))
+
+        if node.label is not None:
+            # Terminal: either continue along the trie or end the match here
+            ending = r"\w*" if node.prefix else r"\b"
+            if not branches:
+                return ending
+            return "(?:" + "|".join(branches) + "|" + ending + ")"
+
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    def _label_for(self, matched: str) -> Optional[str]:
+        """Walk the trie along a match and return the deepest terminal label."""
+        node = self._root
+        label = None
+        for char in " ".join(matched.lower().split()):
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.label is not None:
+                label = node.label
+        return label
+
+    def scan(self, text: str, found: Optional[set] = None, lowered: Optional[str] = None) -> set:
+        """Add the labels of all issues matched in ``text`` to ``found``."""
+        found = set() if found is None else found
+        if self._pattern is None or len(found) >= len(self.labels):
+            return found
+
+        lowered = text.lower() if lowered is None else lowered
+        match_at = self._pattern.match
+        resolved: Dict[str, Optional[str]] = {}
+        for anchor, labels in self._anchors:
+            if labels <= found:
+                continue
+            pos = lowered.find(anchor)
+            while pos != -1:
+                if pos == 0 or not _is_word_char(lowered[pos - 1]):
+                    match = match_at(lowered, pos)
+                    if match:
+                        matched = match.group()
+                        if matched not in resolved:
+                            resolved[matched] = self._label_for(matched)
+                        label = resolved[matched]
+                        if label is not None:
+                            found.add(label)
+                            if labels <= found:
+                                break
+                pos = lowered.find(anchor, pos + 1)
+        return found
+
+    def ordered(self, found: Iterable[str]) -> List[str]:
+        """Return found labels in taxonomy order."""
+        found = set(found)
+        return [label for label in self.labels if label in found]
+
+
+class PartyMatcher:
+    """Pattern matcher for party names introduced by their procedural role."""
+
+    def scan(self, text: str, parties: Optional[List[str]] = None,
+             lowered: Optional[str] = None) -> List[str]:
+        """Append party names found in ``text`` to ``parties`` (deduplicated)."""
+        parties = [] if parties is None else parties
+        lowered = text.lower() if lowered is None else lowered
+        candidates = []
+        for role in _ROLE_ANCHORS:
+            pos = lowered.find(role)
+            while pos != -1:
+                end = pos + len(role)
+                # Roles introducing a name are capitalised ("Plaintiff", "PLAINTIFF")
+                if text[pos].isupper() and (pos == 0 or not text[pos - 1].isalpha()):
+                    after = _NAME_AFTER_ROLE.match(text, end)
+                    if after:
+                        candidates.append((after.start(1), after.group(1)))
+                    elif _CAPTION_ROLE_END.match(text, end):
+                        window_start = max(0, pos - _CAPTION_LOOKBEHIND)
+                        before = _NAME_BEFORE_ROLE.search(text, window_start, pos)
+                        if before:
+                            candidates.append((window_start + before.start(1), before.group(1)))
+                pos = lowered.find(role, end)
+
+        seen = set()
+        for _, raw in sorted(candidates):
+            if raw in seen:
+                continue
+            seen.add(raw)
+            name = self._clean(raw)
+            if name:
+                self._add(parties, name)
+        return parties
+
+    @staticmethod
+    def _clean(raw: str) -> str:
+        tokens = []
+        for token in raw.replace(",", " ").split():
+            if not tokens and token in _NAME_STOPWORDS:
+                continue
+            if token.endswith("'s"):
+                tokens.append(token[:-2])
+                break
+            if token.endswith(".") and token.lower() not in _CORPORATE_SUFFIXES:
+                # Sentence boundary rather than an abbreviation
+                tokens.append(token[:-1])
+                break
+            tokens.append(token)
+            if len(tokens) >= _MAX_NAME_TOKENS:
+                break
+        while tokens and tokens[-1] in ("of", "and", "&"):
+            tokens.pop()
+        return " ".join(tokens)
+
+    @staticmethod
+    def _add(parties: List[str], name: str) -> None:
+        first = name.split()[0].lower()
+        for i, existing in enumerate(parties):
+            if existing.split()[0].lower() == first:
+                # Same entity referenced by a shorter or longer name
+                if len(name) > len(existing):
+                    parties[i] = name
+                return
+        parties.append(name)
+
+
+# Matchers are compiled once per case type at import time
+_ISSUE_MATCHERS: Dict[CaseType, IssueMatcher] = {
+    case_type: IssueMatcher(terms) for case_type, terms in ISSUE_TAXONOMY.items()
+}
+_ISSUE_MATCHERS[CaseType.OTHER] = IssueMatcher(
+    {term: label for terms in ISSUE_TAXONOMY.values() for term, label in terms.items()}
+)
+_ISSUE_MATCHERS[CaseType.CORPORATE] = _ISSUE_MATCHERS[CaseType.OTHER]
+
+_PARTY_MATCHER = PartyMatcher()
+
+
+def issue_matcher(case_type: Union[str, CaseType, None]) -> IssueMatcher:
+    """Return the precompiled issue matcher for a case type."""
+    return _ISSUE_MATCHERS[normalize_case_type(case_type)]
+
+
+def party_matcher() -> PartyMatcher:
+    """Return the shared party-name matcher."""
+    return _PARTY_MATCHER
+
+
+def extract_parties(complaint_text: str) -> List[str]:
+    """Extract party names from the whole complaint."""
+    parties = _PARTY_MATCHER.scan(complaint_text)
+    return parties if parties else list(DEFAULT_PARTIES)
+
+
+def extract_key_issues(complaint_text: str, case_type: Union[str, CaseType, None]) -> List[str]:
+    """Extract key legal issues for a case type."""
+    matcher = issue_matcher(case_type)
+    issues = matcher.ordered(matcher.scan(complaint_text))
+    return issues if issues else list(DEFAULT_ISSUES)
+
+
+def extract_parties_and_issues(complaint_text: str,
+                               case_type: Union[str, CaseType, None]) -> Tuple[List[str], List[str]]:
+    """Extract parties and issues sharing a single lowercased copy of the text."""
+    lowered = complaint_text.lower()
+    parties = _PARTY_MATCHER.scan(complaint_text, lowered=lowered)
+    matcher = issue_matcher(case_type)
+    issues = matcher.ordered(matcher.scan(complaint_text, lowered=lowered))
+    return (parties or list(DEFAULT_PARTIES), issues or list(DEFAULT_ISSUES))
@@ -0,0 +1,197 @@
+"""
+Hedged Model Calls
+==================
+Tail-latency mitigation for blocking model calls.
+
+A call that has not returned by a configurable percentile of recent latency
+for the same key (section/model) gets a duplicate request; whichever
+finishes first wins. Hedges are bounded by a budget expressed as a fraction
+of all calls so that hedging cannot double load on the backend.
+
+The Vertex AI SDK call is blocking and cannot be interrupted once running,
+so "cancelling" the losing request means cancelling it if it has not
+started yet and otherwise abandoning it and discarding its result.
+Cancellable calls (streams) also get a cancel event, set once their result
+is no longer wanted, so they stop reading between chunks instead of
+running to completion on quota and a pool thread.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Optional
+
+# Seconds between abort checks while waiting on a model call
+ABORT_POLL_SECONDS = 0.1
+
+
+class RequestCancelled(Exception):
+    """Raised by a cancellable call that stopped because its result is no longer wanted."""
+
+
+class LatencyTracker:
+    """Rolling window of latency samples per key, with the time each was recorded."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._recorded_at: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+            self._recorded_at.setdefault(key, deque(maxlen=self.window)).append(time.monotonic())
+
+    def percentile(self, key: str, pct: float) -> Optional[float]:
+        """Return the pct-th percentile for a key, or None with too few samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, max(0, int(round(pct / 100.0 * len(samples))) - 1))
+        return samples[index]
+
+    def mean(self, key: Optional[str] = None, max_age: Optional[float] = None) -> Optional[float]:
+        """
+        Mean latency for a key, or across all keys when key is None.
+
+        With max_age, only samples recorded in the last max_age seconds
+        count, so the mean goes stale (None) when calls stop.
+        """
+        oldest = time.monotonic() - max_age if max_age is not None else None
+        with self._lock:
+            keys = [key] if key is not None else list(self._samples)
+            samples = [
+                seconds
+                for k in keys
+                for seconds, recorded_at in zip(self._samples.get(k, ()), self._recorded_at.get(k, ()))
+                if oldest is None or recorded_at >= oldest
+            ]
+        return sum(samples) / len(samples) if samples else None
+
+
+class HedgedCaller:
+    """
+    Run blocking calls with a hedge fired at a latency percentile.
+
+    Args:
+        percentile: Latency percentile after which a hedge is fired (0 disables)
+        budget: Maximum hedges as a fraction of calls
+        min_samples: Samples per key required before hedging starts
+        max_workers: Threads available to primary and hedge requests
+    """
+
+    def __init__(self, percentile: float = 95.0, budget: float = 0.1,
+                 min_samples: int = 20, max_workers: int = 16):
+        self.percentile = percentile
+        self.budget = budget
+        self.tracker = LatencyTracker(min_samples=min_samples)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self._counters = dict(calls=0, hedged=0, hedge_wins=0, hedge_losses=0, budget_denied=0, cancelled=0)
+
+    @property
+    def enabled(self) -> bool:
+        return self.percentile > 0
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self._counters["hedged"] + 1 > self.budget * self._counters["calls"]:
+                self._counters["budget_denied"] += 1
+                return False
+            self._counters["hedged"] += 1
+            return True
+
+    def _stop(self, futures, cancels: Dict[Any, threading.Event]) -> None:
+        """Cancel requests that have not started; signal running ones to stop."""
+        for future in futures:
+            if not future.cancel():
+                cancels[future].set()
+                self._count("cancelled")
+
+    def call(self, key: str, fn: Callable[..., Any], timeout: Optional[float] = None,
+             abort: Optional[Callable[[], bool]] = None, cancellable: bool = False) -> Any:
+        """
+        Call fn, hedging it if it outlives the key's latency percentile.
+
+        Args:
+            key: Latency tracking key, e.g. "Risk Assessment:gemini-2.0-flash"
+            fn: Blocking call; zero-argument unless cancellable
+            timeout: Overall seconds to wait before raising TimeoutError
+            abort: Polled while waiting; returning True abandons the call
+            cancellable: fn takes a threading.Event that is set when its
+                result is no longer wanted (the other request won, or the
+                call was abandoned); fn should then stop, e.g. by raising
+                RequestCancelled
+
+        Returns:
+            The result of whichever request finished first
+        """
+        request = fn if cancellable else (lambda cancel: fn())
+        self._count("calls")
+        start = time.time()
+        threshold = self.tracker.percentile(key, self.percentile) if self.enabled else None
+
+        if threshold is None and timeout is None and abort is None:
+            result = request(threading.Event())
+            self.tracker.record(key, time.time() - start)
+            return result
+
+        cancels = {}
+        primary_cancel = threading.Event()
+        primary = self._executor.submit(request, primary_cancel)
+        cancels[primary] = primary_cancel
+        pending = {primary}
+        hedge = None
+
+        while pending:
+            elapsed = time.time() - start
+            remaining = None if timeout is None else timeout - elapsed
+            if (remaining is not None and remaining <= 0) or (abort is not None and abort()):
+                self._stop(pending, cancels)
+                raise TimeoutError(f"Model call for '{key}' abandoned after {elapsed:.1f}s")
+
+            # Wake up for whichever comes first: hedge point, timeout, abort poll
+            waits = [remaining]
+            if hedge is None and threshold is not None:
+                waits.append(max(0.0, threshold - elapsed))
+            if abort is not None:
+                waits.append(ABORT_POLL_SECONDS)
+            waits = [w for w in waits if w is not None]
+            done, pending = wait(pending, timeout=min(waits) if waits else None, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is not None and pending:
+                    # Let the other request finish before giving up
+                    continue
+                self._stop(pending, cancels)
+                if hedge is not None:
+                    self._count("hedge_wins" if future is hedge else "hedge_losses")
+                self.tracker.record(key, time.time() - start)
+                return future.result()
+
+            hedge_due = threshold is not None and time.time() - start >= threshold
+            if hedge is None and hedge_due and pending == {primary}:
+                if self._take_budget():
+                    hedge_cancel = threading.Event()
+                    hedge = self._executor.submit(request, hedge_cancel)
+                    cancels[hedge] = hedge_cancel
+                    pending.add(hedge)
+                else:
+                    # Denied once; do not ask again for this call
+                    threshold = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        counters["hedge_rate"] = round(counters["hedged"] / counters["calls"], 3) if counters["calls"] else 0.0
+        counters["percentile"] = self.percentile
+        counters["budget"] = self.budget
+        return counters
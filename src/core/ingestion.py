@@ -0,0 +1,160 @@
+"""
+Streaming Complaint Ingestion
+=============================
+Incremental, memory-bounded processing of uploaded complaint text.
+
+The ingestor consumes raw bytes chunk by chunk and, in a single pass over
+each line, runs the precompiled party and issue matchers from
+``src.core.extractor`` and records chunk boundaries. Only the decoded
+lines are retained (once), so a request never holds more than one copy
+of the document plus a small pending buffer.
+"""
+
+import codecs
+from typing import Dict, List, Tuple, Union
+
+from src.core.extractor import issue_matcher, party_matcher
+from src.models.legal_models import CaseType
+
+# Default per-request cap on uploaded complaint size (8 MiB)
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+# Target size of the chunks recorded for downstream processing
+DEFAULT_CHUNK_CHARS = 4000
+
+
+class ComplaintTooLargeError(ValueError):
+    """Raised when a complaint exceeds the per-request memory cap."""
+
+
+class IngestionResult:
+    """Outcome of a streamed complaint ingestion."""
+
+    def __init__(self, text: str, parties: List[str], issues: List[str],
+                 chunks: List[Tuple[int, int]], bytes_read: int, peak_chars: int):
+        self.text = text
+        self.parties = parties
+        self.issues = issues
+        self.chunks = chunks
+        self.bytes_read = bytes_read
+        self.peak_chars = peak_chars
+
+    def stats(self) -> Dict[str, int]:
+        """Return ingestion accounting suitable for report metadata."""
+        return {
+            "bytes_read": self.bytes_read,
+            "peak_buffer_chars": self.peak_chars,
+            "characters": len(self.text),
+            "chunks": len(self.chunks)
+        }
+
+
+class ComplaintIngestor:
+    """
+    Consume a complaint as a byte stream in one incremental pass.
+
+    Args:
+        case_type: Case type whose issue taxonomy is matched
+        max_bytes: Cap on bytes accepted for this request
+        chunk_chars: Target chunk size; chunks end on line boundaries
+        encoding: Text encoding of the uploaded bytes
+    """
+
+    def __init__(self, case_type: Union[str, CaseType, None] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 chunk_chars: int = DEFAULT_CHUNK_CHARS,
+                 encoding: str = "utf-8"):
+        self._issues = issue_matcher(case_type)
+        self._parties = party_matcher()
+        self.max_bytes = max_bytes
+        self.chunk_chars = chunk_chars
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+        self._lines: List[str] = []
+        # Decoded text after the last newline, joined once a newline arrives
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._retained = 0
+        self._previous_line = ""
+        self._chunk_start = 0
+        self._offset = 0
+
+        self.bytes_read = 0
+        self.peak_chars = 0
+        self.parties: List[str] = []
+        self._found_issues = set()
+        self.chunks: List[Tuple[int, int]] = []
+
+    def feed(self, data: bytes) -> None:
+        """Decode a chunk of bytes and process every completed line."""
+        if not data:
+            return
+        self.bytes_read += len(data)
+        if self.bytes_read > self.max_bytes:
+            raise ComplaintTooLargeError(
+                f"Complaint exceeds the {self.max_bytes} byte limit for a single request"
+            )
+        decoded = self._decoder.decode(data)
+        searched = self._pending_chars
+        self._pending.append(decoded)
+        self._pending_chars += len(decoded)
+        self._track_memory()
+        # Parts are only joined once a line completes: appending to a str
+        # would copy a long partial line again on every chunk
+        newline = decoded.find('\n')
+        if newline == -1:
+            return
+
+        text = "".join(self._pending)
+        self._pending, self._pending_chars = [], 0
+        start, newline = 0, searched + newline
+        while newline != -1:
+            self._process_line(text[start:newline + 1])
+            start = newline + 1
+            newline = text.find('\n', start)
+        if start < len(text):
+            self._pending.append(text[start:])
+            self._pending_chars = len(text) - start
+
+    def close(self) -> IngestionResult:
+        """Flush any trailing partial line and return the ingestion result."""
+        self._pending.append(self._decoder.decode(b"", final=True))
+        line = "".join(self._pending)
+        self._pending, self._pending_chars = [], 0
+        if line:
+            self._process_line(line)
+        if self._offset > self._chunk_start:
+            self.chunks.append((self._chunk_start, self._offset))
+
+        text = "".join(self._lines)
+        self._lines = []
+        return IngestionResult(
+            text=text,
+            parties=self.parties,
+            issues=self._issues.ordered(self._found_issues),
+            chunks=self.chunks,
+            bytes_read=self.bytes_read,
+            peak_chars=self.peak_chars
+        )
+
+    def _process_line(self, line: str) -> None:
+        # Scan the previous line together with this one so that multi-word
+        # terms and caption-style party names broken across lines still match
+        window = self._previous_line + line
+        lowered = window.lower()
+        self._parties.scan(window, self.parties, lowered=lowered)
+        self._issues.scan(window, self._found_issues, lowered=lowered)
+        self._previous_line = line
+
+        self._lines.append(line)
+        self._retained += len(line)
+        self._offset += len(line)
+        if self._offset - self._chunk_start >= self.chunk_chars:
+            self.chunks.append((self._chunk_start, self._offset))
+            self._chunk_start = self._offset
+        self._track_memory()
+
+    def _track_memory(self) -> None:
+        in_use = self._retained + self._pending_chars
+        if in_use > self.peak_chars:
+            self.peak_chars = in_use
@@ -0,0 +1,105 @@
+"""
+Adaptive Output Budgets
+=======================
+Learns each section's natural output length from recorded
+candidates_token_count and derives its max_output_tokens and a prompt
+length hint from it, instead of a fixed 2048-token cap for every section.
+
+A response cut off at the cap (finish reason MAX_TOKENS) is recorded at
+the cap, so repeated truncation pushes the percentile, and with it the
+budget, upward. Truncation rates are tracked per section so the headroom
+and percentile can be tuned toward lower latency without clipping answers.
+
+Responses written under a length hint tend to come in under it, so the
+hint and the budget are learned only from unhinted responses (and from
+truncated ones, which hit the cap whatever the prompt said); otherwise
+both would ratchet downward. Once a section's hint is in use, every
+unhinted_every-th call goes out without it to keep that baseline current.
+"""
+
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+# Roughly 0.75 English words per token
+WORDS_PER_TOKEN = 0.75
+
+
+class OutputLengthModel:
+    """
+    Per-section rolling percentile of output lengths.
+
+    Args:
+        percentile: Output-length percentile the budget is based on
+        headroom: Multiplier applied to the percentile
+        min_tokens: Lower bound for a learned budget
+        max_tokens: Upper bound, and the budget until enough samples exist
+        min_samples: Samples per section before the learned budget is used
+        window: Samples kept per section
+        unhinted_every: One in this many calls of a learned section is sent without the hint
+    """
+
+    def __init__(self, percentile: float = 95.0, headroom: float = 1.25, min_tokens: int = 256,
+                 max_tokens: int = 2048, min_samples: int = 10, window: int = 200, unhinted_every: int = 10):
+        self.percentile = percentile
+        self.headroom = headroom
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.min_samples = min_samples
+        self.window = window
+        self.unhinted_every = unhinted_every
+        self._lengths: Dict[str, Deque[int]] = {}
+        # Lengths the hint and budget are learned from: unhinted or truncated responses
+        self._baseline: Dict[str, Deque[int]] = {}
+        self._hint_calls: Dict[str, int] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _quantile(self, section: str, pct: float, samples: Optional[Dict[str, Deque[int]]] = None) -> Optional[int]:
+        lengths = sorted((self._baseline if samples is None else samples).get(section, ()))
+        if len(lengths) < self.min_samples:
+            return None
+        return lengths[min(len(lengths) - 1, max(0, math.ceil(pct / 100.0 * len(lengths)) - 1))]
+
+    def record(self, section: str, output_tokens: int, truncated: bool = False, hinted: bool = False) -> None:
+        """Record one response's output length, whether it hit the cap and whether its prompt had the hint."""
+        self._lengths.setdefault(section, deque(maxlen=self.window)).append(output_tokens)
+        if truncated or not hinted:
+            self._baseline.setdefault(section, deque(maxlen=self.window)).append(output_tokens)
+        counters = self._counters.setdefault(section, dict(responses=0, truncated=0, hinted=0))
+        counters["responses"] += 1
+        counters["truncated"] += int(truncated)
+        counters["hinted"] += int(hinted)
+
+    def max_output_tokens(self, section: str) -> int:
+        """Output token budget for the next call of this section."""
+        observed = self._quantile(section, self.percentile)
+        if observed is None:
+            return self.max_tokens
+        return min(self.max_tokens, max(self.min_tokens, math.ceil(observed * self.headroom)))
+
+    def length_hint(self, section: str) -> Optional[str]:
+        """Prompt hint with the section's typical length, once learned (None for an unhinted call)."""
+        typical = self._quantile(section, 50)
+        if typical is None:
+            return None
+        calls = self._hint_calls[section] = self._hint_calls.get(section, 0) + 1
+        if self.unhinted_every and calls % self.unhinted_every == 0:
+            return None
+        words = int(round(typical * WORDS_PER_TOKEN, -1))
+        return f"Aim for about {words} words; keep the section complete and concise."
+
+    def stats(self) -> Dict[str, Any]:
+        summary = dict()
+        for section, counters in self._counters.items():
+            responses = counters["responses"]
+            summary[section] = dict(
+                responses=responses,
+                truncated=counters["truncated"],
+                truncation_rate=round(counters["truncated"] / responses, 3) if responses else 0.0,
+                hinted=counters["hinted"],
+                p50_output_tokens=self._quantile(section, 50, self._lengths),
+                p95_output_tokens=self._quantile(section, 95, self._lengths),
+                baseline_p50_output_tokens=self._quantile(section, 50),
+                max_output_tokens=self.max_output_tokens(section)
+            )
+        return summary
@@ -1,15 +1,172 @@
+import os
 import re
+from collections import Counter
+from src.models.legal_models import ValidationResult
+from src.core.semantic_scorer import SemanticGroundednessScorer
+from src.core.context_builder import ChainedContext
+
+# Blank-line paragraph separator, captured so paragraphs can be spliced back
+PARAGRAPH_BREAK = re.compile(r"(\n[ \t]*\n\s*)")
+
+LEGAL_TERMS = ("patent", "infringement", "liability", "damages", "claim", "plaintiff", "defendant", "intellectual property", "prior art", "market", "revenue", "growth", "competitor", "risk", "strategy", "roi", "calculate", "assess", "evidence", "legal", "cost", "loss", "value", "financial")
+
+
+def split_paragraphs(content):
+    """Split content into alternating paragraphs (even indices) and separators."""
+    return PARAGRAPH_BREAK.split(content)
+
+
+class StreamCheck:
+    """
+    Incremental checks over a streaming response.
+
+    feed() is called with each chunk of text and returns a reason string as
+    soon as the output looks off-topic (no domain terms after
+    domain_check_words words) or degenerate (an n-gram repeated
+    repeat_limit times), otherwise None.
+    """
+
+    def __init__(self, domain_check_words=120, ngram=8, repeat_limit=3):
+        self.domain_check_words = domain_check_words
+        self.ngram = ngram
+        self.repeat_limit = repeat_limit
+        self.words = list()
+        self.domain_terms = set()
+        self.reason = None
+        self._tail = ""
+        self._pending = ""
+        self._shingles = Counter()
+
+    def feed(self, text):
+        if self.reason or not text:
+            return self.reason
+
+        # Domain terms, scanning only new text plus enough overlap for multi-word terms
+        lowered = (self._tail + text).lower()
+        for term in LEGAL_TERMS:
+            if term not in self.domain_terms and term in lowered:
+                self.domain_terms.add(term)
+        self._tail = lowered[-24:]
+
+        # Whole words only; the last fragment may continue in the next chunk
+        pieces = (self._pending + text).split()
+        self._pending = "" if text[-1].isspace() else (pieces.pop() if pieces else "")
+        for word in pieces:
+            self.words.append(word.lower())
+            if len(self.words) >= self.ngram:
+                shingle = tuple(self.words[-self.ngram:])
+                self._shingles[shingle] += 1
+                if self._shingles[shingle] >= self.repeat_limit:
+                    self.reason = f"repetition loop after {len(self.words)} words"
+                    return self.reason
+
+        if not self.domain_terms and len(self.words) >= self.domain_check_words:
+            self.reason = f"no domain terms after {len(self.words)} words"
+        return self.reason
+
 
 class QualityValidator:
+    PASS_THRESHOLD = 0.5
+    PARAGRAPH_THRESHOLD = 0.5
+    # Shorter paragraphs (headings, labels) are not scored on their own
+    MIN_PARAGRAPH_WORDS = 10
+
+    def __init__(self, semantic=None):
+        if semantic is None:
+            semantic = os.getenv("SEMANTIC_GROUNDEDNESS", "false").lower() == "true"
+        # Optional vector-similarity groundedness in place of keyword counts
+        self.semantic_scorer = SemanticGroundednessScorer() if semantic else None
+        self.validation_count = 0
+        self.passed_count = 0
+        self.score_total = 0.0
+        self.stream_checks = 0
+        self.stream_aborts = Counter()
+
     def validate_response(self, content, context=""):
         coherence = self.calculate_coherence_score(content)
-        groundedness = self.calculate_groundedness_score(content, context)
+        semantic = self.semantic_scorer.score(content, context) if self.semantic_scorer and context else None
+        groundedness = semantic["score"] if semantic else self.calculate_groundedness_score(content, context)
         overall_score = (coherence + groundedness) / 2.0
-        return dict(
+        self.validation_count += 1
+        self.score_total += overall_score
+        if overall_score >= self.PASS_THRESHOLD:
+            self.passed_count += 1
+        result = dict(
             score=round(overall_score, 2),
             coherence=coherence,
             groundedness=groundedness
         )
+        if semantic:
+            result["grounded_fraction"] = semantic["grounded_fraction"]
+            result["sentence_scores"] = semantic["sentences"]
+        return result
+
+    def validate_paragraphs(self, content, context=""):
+        """
+        Score each paragraph's groundedness to locate weak spans.
+
+        Returns one dict per paragraph with its index (into the even entries
+        of split_paragraphs), text, score (None when too short to score) and
+        whether it is weak.
+        """
+        results = list()
+        for index, paragraph in enumerate(split_paragraphs(content)[::2]):
+            if len(paragraph.split()) < self.MIN_PARAGRAPH_WORDS:
+                results.append(dict(index=index, text=paragraph, score=None, weak=False))
+                continue
+            if self.semantic_scorer and context:
+                score = self.semantic_scorer.score(paragraph, context)["score"]
+            else:
+                score = self.calculate_groundedness_score(paragraph, context)
+            results.append(dict(index=index, text=paragraph, score=score, weak=score < self.PARAGRAPH_THRESHOLD))
+        return results
+
+    def validate_report(self, report):
+        """Validate every section of an AnalysisReport against its complaint."""
+        context = report.scenario.complaint_text
+        section_scores = dict()
+        issues = list()
+        recommendations = list()
+
+        for section in report.sections:
+            result = self.validate_response(section.content, context)
+            section_scores[section.title] = result["score"]
+            if result["score"] < self.PASS_THRESHOLD:
+                issues.append(f"Section '{section.title}' scored {result['score']} (below {self.PASS_THRESHOLD})")
+                recommendations.append(f"Regenerate '{section.title}' with more structure and case-specific evidence")
+            weak = [p for p in self.validate_paragraphs(section.content, context) if p["weak"]]
+            for paragraph in weak:
+                issues.append(f"Section '{section.title}' paragraph {paragraph['index'] + 1} is weakly grounded (score {paragraph['score']})")
+            if weak:
+                recommendations.append(f"Ground the weak paragraphs of '{section.title}' in complaint facts and figures")
+
+        overall = sum(section_scores.values()) / len(section_scores) if section_scores else 0.0
+        return ValidationResult(
+            overall_score=round(overall, 2),
+            passed=bool(section_scores) and overall >= self.PASS_THRESHOLD,
+            section_scores=section_scores,
+            issues=issues,
+            recommendations=recommendations
+        )
+
+    def start_stream(self, **kwargs):
+        """Begin incremental validation of a streaming response."""
+        self.stream_checks += 1
+        return StreamCheck(**kwargs)
+
+    def record_stream_abort(self, reason):
+        self.stream_aborts[reason.split(" after ")[0]] += 1
+
+    def get_quality_metrics(self):
+        count = self.validation_count
+        return dict(
+            validations=count,
+            average_score=round(self.score_total / count, 3) if count else 0.0,
+            pass_rate=round(self.passed_count / count, 3) if count else 0.0,
+            stream_checks=self.stream_checks,
+            stream_aborts=dict(self.stream_aborts),
+            semantic_scorer=self.semantic_scorer.stats() if self.semantic_scorer else None
+        )
 
     def calculate_coherence_score(self, content, section_name=None):
         score = 0.0
@@ -33,8 +190,7 @@ class QualityValidator:
         score = 0.0
         content_lower = content.lower()
         
-        legal_terms = ("patent", "infringement", "liability", "damages", "claim", "plaintiff", "defendant", "intellectual property", "prior art", "market", "revenue", "growth", "competitor", "risk", "strategy", "roi", "calculate", "assess", "evidence", "legal", "cost", "loss", "value", "financial")
-        found_count = sum(1 for t in legal_terms if t in content_lower)
+        found_count = sum(1 for t in LEGAL_TERMS if t in content_lower)
         
         if found_count >= 2: score += 0.6
         elif found_count > 0: score += 0.4
@@ -46,17 +202,12 @@ class QualityValidator:
         if any(w in content_lower for w in reasoning_words): score += 0.4
             
         if context:
-            ctx_words = list()
-            for w in context.lower().split():
-                if len(w) > 5:
-                    ctx_words.append(w)
-                    
-            matches = list()
-            for w in ctx_words:
-                if w in content_lower:
-                    matches.append(w)
-                    
-            if len(matches) > 0: score += 0.3
+            # Distinct words only: large contexts repeat most of theirs
+            if isinstance(context, ChainedContext):
+                ctx_words = context.distinct_words(5)
+            else:
+                ctx_words = {w for w in context.lower().split() if len(w) > 5}
+            if any(w in content_lower for w in ctx_words): score += 0.3
         else:
             if len(content.split()) > 20: score += 0.3
         
@@ -0,0 +1,409 @@
+"""
+Report Repository
+=================
+Persistent storage for finished reports in SQLite.
+
+Reports are stored as JSON with their filterable fields (case name, case
+type, filing date, urgency) in indexed columns. Complaint and section
+texts and audit context previews live in a content-addressed, compressed
+BlobStore and are referenced by hash, so text shared between reports,
+their audit records and reused sections is written once. Its compression
+dictionary is retrained by train_blob_dictionary, never inside a put. Sections are
+indexed in a contentless FTS5 table for full-text search, which keeps no
+second uncompressed copy. Listing and search use keyset pagination
+(newest first) with opaque cursors, so large result sets can be paged or
+streamed without OFFSET scans. Recently used reports are served from an
+in-memory ReportStore in front of the database.
+"""
+
+import base64
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.core.blob_store import BlobStore
+from src.core.report_store import ReportStore
+from src.models.legal_models import AnalysisReport
+from src.models.records import PREVIEW_CHARS, UsageRecord
+
+# Rows fetched per query when streaming a whole result set
+STREAM_BATCH_SIZE = 200
+
+# Largest page a caller may request
+MAX_PAGE_SIZE = 500
+
+# Words of context around the first match in a search snippet
+SNIPPET_WORDS = 8
+
+# Bumped when the storage layout changes; older databases are migrated on open
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    report_id TEXT NOT NULL UNIQUE,
+    case_name TEXT NOT NULL,
+    case_type TEXT NOT NULL,
+    filing_date TEXT NOT NULL,
+    urgency TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    confidence_score REAL NOT NULL,
+    total_cost REAL NOT NULL,
+    reusable INTEGER NOT NULL DEFAULT 0,
+    report_json TEXT NOT NULL,
+    items_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_case_name ON reports (case_name);
+CREATE INDEX IF NOT EXISTS idx_reports_case_type ON reports (case_type, id);
+CREATE INDEX IF NOT EXISTS idx_reports_filing_date ON reports (filing_date);
+CREATE INDEX IF NOT EXISTS idx_reports_urgency ON reports (urgency, id);
+CREATE TABLE IF NOT EXISTS report_sections (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    report_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_report_sections_report ON report_sections (report_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS section_fts USING fts5 (
+    title,
+    content,
+    content=''
+);
+"""
+
+_SUMMARY_COLUMNS = "r.id, r.report_id, r.case_name, r.case_type, r.filing_date, r.urgency, r.created_at, r.confidence_score, r.total_cost"
+
+
+def encode_cursor(position: int) -> str:
+    return base64.urlsafe_b64encode(str(position).encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii"))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+def _fts_query(text: str) -> str:
+    # Each term quoted so user input cannot produce FTS5 syntax errors; terms are ANDed
+    terms = ['"' + term.replace('"', '""') + '"' for term in text.split()]
+    if not terms:
+        raise ValueError("Search query is empty")
+    return " ".join(terms)
+
+
+def _snippet(content: str, query: str) -> str:
+    """Words around the first query term in content, with terms in brackets."""
+    terms = {re.sub(r"\W", "", term).lower() for term in query.split()} - {""}
+    words = content.split()
+    first = next((i for i, word in enumerate(words) if re.sub(r"\W", "", word).lower() in terms), 0)
+    start, end = max(0, first - SNIPPET_WORDS), first + SNIPPET_WORDS + 1
+    marked = [
+        re.sub(r"\w+", lambda m: f"[{m.group(0)}]" if m.group(0).lower() in terms else m.group(0), word)
+        for word in words[start:end]
+    ]
+    return ("..." if start else "") + " ".join(marked) + ("..." if end < len(words) else "")
+
+
+class ReportRepository:
+    """
+    SQLite (FTS5) repository of AnalysisReport objects and their section items.
+
+    Args:
+        path: Database file, or ":memory:"
+        cache_size: Reports kept decoded in memory
+    """
+
+    def __init__(self, path: str = "reports.db", cache_size: int = 500):
+        self.path = path
+        self.cache = ReportStore(max_reports=cache_size)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.blobs = BlobStore(self._conn)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """
+        Move reports stored with inline text (schema 1) into the blob layout.
+
+        The whole migration is one transaction: a failure or crash part way
+        rolls back to the schema 1 database, which is migrated on next open.
+        """
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        legacy = self._conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'report_sections_fts'"
+        ).fetchone()
+        with self._conn:
+            # Explicit BEGIN: sqlite3 would otherwise run the DROP TABLE in autocommit mode
+            self._conn.execute("BEGIN")
+            if legacy:
+                rows = self._conn.execute(
+                    "SELECT report_id, reusable, report_json, items_json FROM reports ORDER BY id"
+                ).fetchall()
+                self._conn.execute("DROP TABLE report_sections_fts")
+                self._conn.execute("DELETE FROM reports")
+                for row in rows:
+                    report = AnalysisReport.model_validate_json(row["report_json"])
+                    items = [self._decode_item(item, {}) for item in json.loads(row["items_json"])]
+                    self._write(row["report_id"], report, items, bool(row["reusable"]))
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def train_blob_dictionary(self, force: bool = False) -> Optional[int]:
+        """
+        Train a new blob compression dictionary if one is due (or force).
+
+        Runs apart from put, so no report write waits on training; returns
+        the dictionary id, or None when no training was due.
+        """
+        with self._lock, self._conn:
+            if not (force or self.blobs.training_due):
+                return None
+            return self.blobs.train()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # Storage
+
+    def put(self, report_id: str, report: AnalysisReport,
+            items: Optional[List[Dict[str, Any]]] = None, reusable: bool = False) -> None:
+        """Store a report; reusable marks it for the near-duplicate index."""
+        items = list(items or [])
+        with self._lock, self._conn:
+            self._write(report_id, report, items, reusable)
+        self.cache.put(report_id, report, items)
+
+    def _write(self, report_id: str, report: AnalysisReport, items: List[Dict[str, Any]], reusable: bool) -> None:
+        """Write a report's rows, blobs and search index entries (in the caller's transaction)."""
+        scenario = report.scenario
+        self._unindex_sections(report_id)
+        data = report.model_dump()
+        data["scenario"]["complaint_ref"] = self.blobs.put(data["scenario"].pop("complaint_text"))
+        for section in data["sections"]:
+            section["content_ref"] = self.blobs.put(section.pop("content"))
+        encoded_items = [self._encode_item(item) for item in items]
+        self._conn.execute(
+            "INSERT OR REPLACE INTO reports (report_id, case_name, case_type, filing_date, urgency, created_at, "
+            "confidence_score, total_cost, reusable, report_json, items_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                report_id, scenario.case_name, scenario.case_type, scenario.filing_date,
+                str(scenario.urgency_level).lower(), report.timestamp or datetime.now().isoformat(),
+                report.confidence_score, report.total_cost, int(reusable),
+                json.dumps(data), json.dumps(encoded_items)
+            )
+        )
+        for section, stored in zip(report.sections, data["sections"]):
+            section_id = self._conn.execute(
+                "INSERT INTO report_sections (report_id, title, content_hash) VALUES (?, ?, ?)",
+                (report_id, section.title, stored["content_ref"])
+            ).lastrowid
+            self._conn.execute(
+                "INSERT INTO section_fts (rowid, title, content) VALUES (?, ?, ?)",
+                (section_id, section.title, section.content)
+            )
+
+    def _unindex_sections(self, report_id: str) -> None:
+        # Contentless FTS rows are deleted by replaying their original values
+        rows = self._conn.execute(
+            "SELECT id, title, content_hash FROM report_sections WHERE report_id = ?", (report_id,)
+        ).fetchall()
+        for row in rows:
+            self._conn.execute(
+                "INSERT INTO section_fts (section_fts, rowid, title, content) VALUES ('delete', ?, ?, ?)",
+                (row["id"], row["title"], self.blobs.get(row["content_hash"]))
+            )
+        self._conn.execute("DELETE FROM report_sections WHERE report_id = ?", (report_id,))
+
+    def get(self, report_id: str) -> Optional[AnalysisReport]:
+        report = self.cache.get(report_id)
+        if report is not None:
+            return report
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT report_json, items_json FROM reports WHERE report_id = ?", (report_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            data, items = json.loads(row["report_json"]), json.loads(row["items_json"])
+            texts = self.blobs.get_many(
+                [data["scenario"]["complaint_ref"]]
+                + [section["content_ref"] for section in data["sections"]]
+                + [ref for item in items for ref in (item.get("content_ref"), item["audit"].get("input_context_preview_ref")) if ref]
+            )
+        data["scenario"]["complaint_text"] = texts[data["scenario"].pop("complaint_ref")]
+        for section in data["sections"]:
+            section["content"] = texts[section.pop("content_ref")]
+        report = AnalysisReport.model_validate(data)
+        self.cache.put(report_id, report, [self._decode_item(item, texts) for item in items])
+        return report
+
+    def get_items(self, report_id: str) -> List[Dict[str, Any]]:
+        """Section items of a stored report (empty when unknown)."""
+        if self.get(report_id) is None:
+            return []
+        return self.cache.get_items(report_id)
+
+    def reusable_complaints(self, limit: int) -> Iterator[Tuple[str, str]]:
+        """(report_id, complaint_text) of the newest reusable reports, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT report_id, json_extract(report_json, '$.scenario.complaint_ref') AS complaint_ref "
+                "FROM reports WHERE reusable = 1 ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        for row in reversed(rows):
+            with self._lock:
+                complaint_text = self.blobs.get(row["complaint_ref"])
+            yield row["report_id"], complaint_text
+
+    def _encode_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Item with its texts replaced by blob references (caller holds the lock)."""
+        metrics = item["metrics"]
+        content = item["content"]
+        encoded = dict(item, metrics=metrics.model_dump() if hasattr(metrics, "model_dump") else dict(metrics))
+        encoded["content_ref"] = self.blobs.put(encoded.pop("content"))
+        audit = dict(item["audit"])
+        # The output preview is a prefix of the content, so it is rebuilt on read
+        if audit.get("output_preview") == content[:PREVIEW_CHARS] + "...":
+            audit.pop("output_preview")
+        if "input_context_preview" in audit:
+            audit["input_context_preview_ref"] = self.blobs.put(audit.pop("input_context_preview"))
+        encoded["audit"] = audit
+        return encoded
+
+    @staticmethod
+    def _decode_item(item: Dict[str, Any], texts: Dict[str, str]) -> Dict[str, Any]:
+        decoded = dict(item, metrics=UsageRecord(**item["metrics"]))
+        if "content_ref" in decoded:
+            decoded["content"] = texts[decoded.pop("content_ref")]
+        audit = dict(decoded["audit"])
+        if "input_context_preview_ref" in audit:
+            audit["input_context_preview"] = texts[audit.pop("input_context_preview_ref")]
+        if "output_preview" not in audit and "content" in decoded:
+            audit["output_preview"] = decoded["content"][:PREVIEW_CHARS] + "..."
+        decoded["audit"] = audit
+        return decoded
+
+    # Retrieval
+
+    @staticmethod
+    def _filters(case_name: Optional[str], case_type: Optional[str], urgency: Optional[str],
+                 filed_after: Optional[str], filed_before: Optional[str]) -> Tuple[List[str], List[Any]]:
+        clauses, params = list(), list()
+        for column, value in (("r.case_name", case_name), ("r.case_type", case_type), ("r.urgency", urgency and urgency.lower())):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if filed_after:
+            clauses.append("r.filing_date >= ?")
+            params.append(filed_after)
+        if filed_before:
+            clauses.append("r.filing_date < ?")
+            params.append(filed_before)
+        return clauses, params
+
+    @staticmethod
+    def _summary(row: sqlite3.Row) -> Dict[str, Any]:
+        return dict(
+            report_id=row["report_id"],
+            case_name=row["case_name"],
+            case_type=row["case_type"],
+            filing_date=row["filing_date"],
+            urgency=row["urgency"],
+            created_at=row["created_at"],
+            confidence_score=row["confidence_score"],
+            total_cost=row["total_cost"]
+        )
+
+    def list_reports(self, case_name: Optional[str] = None, case_type: Optional[str] = None,
+                     urgency: Optional[str] = None, filed_after: Optional[str] = None,
+                     filed_before: Optional[str] = None, cursor: Optional[str] = None,
+                     limit: int = 50) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of report summaries, newest first.
+
+        Returns:
+            The summaries and the cursor for the next page (None on the last page)
+        """
+        clauses, params = self._filters(case_name, case_type, urgency, filed_after, filed_before)
+        if cursor:
+            clauses.append("r.id < ?")
+            params.append(decode_cursor(cursor))
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM reports r {where} ORDER BY r.id DESC LIMIT ?",
+                params + [limit + 1]
+            ).fetchall()
+        next_cursor = encode_cursor(rows[limit - 1]["id"]) if len(rows) > limit else None
+        return [self._summary(row) for row in rows[:limit]], next_cursor
+
+    def search(self, query: str, case_name: Optional[str] = None, case_type: Optional[str] = None,
+               urgency: Optional[str] = None, filed_after: Optional[str] = None,
+               filed_before: Optional[str] = None, cursor: Optional[str] = None,
+               limit: int = 50) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of matching sections, newest first, with BM25 scores and snippets.
+
+        Returns:
+            The hits and the cursor for the next page (None on the last page)
+        """
+        clauses, params = self._filters(case_name, case_type, urgency, filed_after, filed_before)
+        clauses.insert(0, "section_fts MATCH ?")
+        params.insert(0, _fts_query(query))
+        if cursor:
+            clauses.append("f.rowid < ?")
+            params.append(decode_cursor(cursor))
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT f.rowid AS hit_id, s.title AS section, s.content_hash, "
+                f"bm25(section_fts) AS rank, {_SUMMARY_COLUMNS} "
+                f"FROM section_fts f JOIN report_sections s ON s.id = f.rowid "
+                f"JOIN reports r ON r.report_id = s.report_id "
+                f"WHERE {' AND '.join(clauses)} ORDER BY f.rowid DESC LIMIT ?",
+                params + [limit + 1]
+            ).fetchall()
+            # Snippets are cut from the decompressed sections of this page only
+            texts = self.blobs.get_many(row["content_hash"] for row in rows[:limit])
+        hits = [
+            dict(
+                self._summary(row),
+                section=row["section"],
+                snippet=_snippet(texts[row["content_hash"]], query),
+                score=round(-row["rank"], 4)
+            )
+            for row in rows[:limit]
+        ]
+        next_cursor = encode_cursor(rows[limit - 1]["hit_id"]) if len(rows) > limit else None
+        return hits, next_cursor
+
+    def iterate(self, query: Optional[str] = None, cursor: Optional[str] = None,
+                **filters) -> Iterator[Dict[str, Any]]:
+        """Every matching summary (or search hit) from cursor on, fetched in keyset batches."""
+        fetch = self.search if query else self.list_reports
+        args = (query,) if query else ()
+        while True:
+            page, cursor = fetch(*args, cursor=cursor, limit=STREAM_BATCH_SIZE, **filters)
+            yield from page
+            if cursor is None:
+                return
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            blobs = self.blobs.stats()
+        return dict(reports=len(self), path=self.path, cached=len(self.cache), blobs=blobs)
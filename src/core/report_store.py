@@ -0,0 +1,61 @@
+"""
+Report Store
+============
+Bounded in-memory store of generated reports, keyed by report ID, so later
+requests (near-duplicate reuse, reanalysis) can refer back to them.
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from src.models.legal_models import AnalysisReport
+
+
+def new_report_id() -> str:
+    return uuid.uuid4().hex
+
+
+class ReportStore:
+    """
+    LRU store of AnalysisReport objects, with the agent's per-section report
+    items (content, token usage and audit entry) they were built from.
+
+    Args:
+        max_reports: Least recently used reports are evicted beyond this count
+    """
+
+    def __init__(self, max_reports: int = 500):
+        self.max_reports = max_reports
+        self._reports: "OrderedDict[str, AnalysisReport]" = OrderedDict()
+        self._items: Dict[str, List[Dict[str, Any]]] = dict()
+        self._lock = threading.Lock()
+
+    def put(self, report_id: str, report: AnalysisReport,
+            items: Optional[List[Dict[str, Any]]] = None) -> None:
+        with self._lock:
+            self._reports[report_id] = report
+            self._reports.move_to_end(report_id)
+            self._items[report_id] = list(items or [])
+            while len(self._reports) > self.max_reports:
+                evicted, _ = self._reports.popitem(last=False)
+                self._items.pop(evicted, None)
+
+    def get(self, report_id: str) -> Optional[AnalysisReport]:
+        with self._lock:
+            report = self._reports.get(report_id)
+            if report is not None:
+                self._reports.move_to_end(report_id)
+            return report
+
+    def get_items(self, report_id: str) -> List[Dict[str, Any]]:
+        """Report items of a stored report (empty when unknown)."""
+        with self._lock:
+            return list(self._items.get(report_id, []))
+
+    def __len__(self) -> int:
+        return len(self._reports)
+
+    def stats(self) -> Dict[str, int]:
+        return dict(reports=len(self._reports), max_reports=self.max_reports)
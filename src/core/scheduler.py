@@ -0,0 +1,222 @@
+"""
+Urgency Scheduler
+=================
+Admission scheduler that sits in front of the agent and hands out report
+slots by case urgency.
+
+- Weighted fair queuing: one FIFO queue per UrgencyLevel, served by stride
+  scheduling so each level gets slots in proportion to its weight.
+- Aging: a queued request that has waited longer than the aging threshold
+  is served next regardless of its level, so LOW work cannot starve.
+- Preemption: when the queue is full, a more urgent arrival evicts the
+  newest queued request of the lowest urgency. In-flight work is never
+  preempted.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional
+
+from src.models.legal_models import UrgencyLevel
+
+# Share of slots per urgency level under contention
+DEFAULT_WEIGHTS = {
+    UrgencyLevel.CRITICAL: 8,
+    UrgencyLevel.HIGH: 4,
+    UrgencyLevel.STANDARD: 2,
+    UrgencyLevel.LOW: 1,
+}
+
+# Lowest to highest urgency
+URGENCY_ORDER = (UrgencyLevel.LOW, UrgencyLevel.STANDARD, UrgencyLevel.HIGH, UrgencyLevel.CRITICAL)
+
+# Samples kept per level for wait-time percentiles
+WAIT_WINDOW = 200
+
+
+class SchedulerRejectedError(RuntimeError):
+    """Raised when a request is rejected or preempted from the queue."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def normalize_urgency(value: Any) -> UrgencyLevel:
+    """Map an urgency string to UrgencyLevel, defaulting to STANDARD."""
+    if isinstance(value, UrgencyLevel):
+        return value
+    try:
+        return UrgencyLevel(str(value).strip().lower())
+    except ValueError:
+        return UrgencyLevel.STANDARD
+
+
+class Ticket:
+    """A queued or running request."""
+
+    def __init__(self, urgency: UrgencyLevel, future: Optional[asyncio.Future] = None):
+        self.urgency = urgency
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.started_at: Optional[float] = None
+
+
+class UrgencyScheduler:
+    """
+    Grant report slots by urgency with weighted fairness and aging.
+
+    Args:
+        max_concurrency: Reports allowed in flight at once
+        max_queue: Requests allowed to wait for a slot
+        aging_seconds: Wait after which a request is served next regardless of level
+        weights: Optional UrgencyLevel -> weight override
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_queue: int = 64,
+                 aging_seconds: float = 30.0, weights: Optional[Dict[UrgencyLevel, int]] = None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.aging_seconds = aging_seconds
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.in_flight = 0
+        self._queues: Dict[UrgencyLevel, Deque[Ticket]] = {level: deque() for level in URGENCY_ORDER}
+        self._pass = {level: 0.0 for level in URGENCY_ORDER}
+        self._virtual_time = 0.0
+        self._service_times: Deque[float] = deque(maxlen=WAIT_WINDOW)
+        self._stats = {
+            level: dict(admitted=0, rejected=0, preempted=0, aged=0, waits=deque(maxlen=WAIT_WINDOW))
+            for level in URGENCY_ORDER
+        }
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait before retrying."""
+        service = sum(self._service_times) / len(self._service_times) if self._service_times else 1.0
+        return max(1, math.ceil(service * (self.queued + 1) / self.max_concurrency))
+
+    async def acquire(self, urgency: Any) -> Ticket:
+        """Wait for a report slot; raises SchedulerRejectedError if rejected or preempted."""
+        level = normalize_urgency(urgency)
+        ticket = Ticket(level)
+
+        if self.in_flight < self.max_concurrency and not self.queued:
+            self._start(ticket)
+            return ticket
+
+        if self.queued >= self.max_queue:
+            victim = self._preemption_victim(level)
+            if victim is None:
+                self._stats[level]["rejected"] += 1
+                raise SchedulerRejectedError(
+                    f"Report queue full ({self.max_queue}); {level.value} request rejected",
+                    self.retry_after()
+                )
+            self._queues[victim.urgency].remove(victim)
+            self._stats[victim.urgency]["preempted"] += 1
+            victim.future.set_exception(SchedulerRejectedError(
+                f"Queued {victim.urgency.value} request preempted by {level.value} request",
+                self.retry_after()
+            ))
+
+        ticket.future = asyncio.get_running_loop().create_future()
+        queue = self._queues[level]
+        if not queue:
+            # A level returning from idle does not get credit for the time it was empty
+            self._pass[level] = max(self._pass[level], self._virtual_time)
+        queue.append(ticket)
+
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.started_at is not None:
+                self.release(ticket)
+            elif ticket in queue:
+                queue.remove(ticket)
+            raise
+        return ticket
+
+    def release(self, ticket: Ticket) -> None:
+        """Return a slot and start the next queued request."""
+        self.in_flight -= 1
+        if ticket.started_at is not None:
+            self._service_times.append(time.monotonic() - ticket.started_at)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, urgency: Any):
+        ticket = await self.acquire(urgency)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def _start(self, ticket: Ticket) -> None:
+        self.in_flight += 1
+        ticket.started_at = time.monotonic()
+        stats = self._stats[ticket.urgency]
+        stats["admitted"] += 1
+        stats["waits"].append(ticket.started_at - ticket.enqueued_at)
+
+    def _preemption_victim(self, level: UrgencyLevel) -> Optional[Ticket]:
+        rank = URGENCY_ORDER.index(level)
+        for victim_level in URGENCY_ORDER[:rank]:
+            if self._queues[victim_level]:
+                return self._queues[victim_level][-1]
+        return None
+
+    def _next_level(self) -> Optional[UrgencyLevel]:
+        now = time.monotonic()
+        heads = [(queue[0], level) for level, queue in self._queues.items() if queue]
+        if not heads:
+            return None
+        aged = [(ticket.enqueued_at, level) for ticket, level in heads
+                if now - ticket.enqueued_at >= self.aging_seconds]
+        if aged:
+            level = min(aged)[1]
+            self._stats[level]["aged"] += 1
+            return level
+        # Stride scheduling: lowest pass value wins, ties go to the more urgent level
+        return min(heads, key=lambda head: (self._pass[head[1]], -URGENCY_ORDER.index(head[1])))[1]
+
+    def _dispatch(self) -> None:
+        while self.in_flight < self.max_concurrency:
+            level = self._next_level()
+            if level is None:
+                return
+            ticket = self._queues[level].popleft()
+            self._virtual_time = self._pass[level]
+            self._pass[level] += 1.0 / self.weights[level]
+            if ticket.future.done():
+                continue
+            self._start(ticket)
+            ticket.future.set_result(ticket)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, admissions and wait times per urgency level."""
+        levels = dict()
+        for level in URGENCY_ORDER:
+            stats = self._stats[level]
+            waits = sorted(stats["waits"])
+            levels[level.value] = dict(
+                queue_depth=len(self._queues[level]),
+                admitted=stats["admitted"],
+                rejected=stats["rejected"],
+                preempted=stats["preempted"],
+                aged=stats["aged"],
+                avg_wait_seconds=round(sum(waits) / len(waits), 3) if waits else 0.0,
+                p95_wait_seconds=round(waits[min(len(waits) - 1, int(0.95 * len(waits)))], 3) if waits else 0.0
+            )
+        return dict(
+            in_flight=self.in_flight,
+            queued=self.queued,
+            max_concurrency=self.max_concurrency,
+            max_queue=self.max_queue,
+            levels=levels
+        )
@@ -0,0 +1,173 @@
+"""
+Semantic Groundedness Scorer
+============================
+Scores how well each sentence of a section is supported by its context,
+as an optional replacement for keyword-count groundedness.
+
+Text is embedded as hashed unigram+bigram vectors (no vocabulary to build
+or store), weighted by IDF over the context passages. Passage vectors are
+cached by content hash, so the complaint passages shared by every section
+of a scenario are vectorized once even as the chained context grows.
+All sentences of a section are scored against all passages in one matrix
+product.
+
+One scorer is shared by the requests the agent serves concurrently from
+the threadpool, so the LRU caches and their counters are only touched
+under a lock; vectorizing happens outside it.
+"""
+
+import hashlib
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.context_builder import ChainedContext
+from src.utils.text import split_sentences, tokenize
+
+# Cosine similarity at which a sentence counts as fully grounded
+FULL_SUPPORT_SIMILARITY = 0.2
+
+# Sentences below this similarity are reported as ungrounded
+GROUNDED_SIMILARITY = 0.05
+
+
+def _stable_hash(term: str) -> int:
+    # crc32 rather than hash(): Python's str hash is salted per process
+    return zlib.crc32(term.encode("utf-8"))
+
+
+class SemanticGroundednessScorer:
+    """
+    Hashed n-gram TF-IDF similarity between sentences and context passages.
+
+    Args:
+        dim: Hashed feature dimensions
+        passage_words: Target words per context passage
+        max_passages: Passages are merged beyond this count to bound memory
+        passage_cache_size: Passage vectors kept in the LRU cache
+        context_cache_size: Whole-context matrices kept in the LRU cache
+    """
+
+    def __init__(self, dim: int = 4096, passage_words: int = 80, max_passages: int = 1024,
+                 passage_cache_size: int = 8192, context_cache_size: int = 16):
+        self.dim = dim
+        self.passage_words = passage_words
+        self.max_passages = max_passages
+        self.passage_cache_size = passage_cache_size
+        self.context_cache_size = context_cache_size
+        self._passages: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._contexts: "OrderedDict[str, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _features(self, text: str) -> np.ndarray:
+        tokens = tokenize(text)
+        terms = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if terms:
+            np.add.at(vector, np.array([_stable_hash(t) % self.dim for t in terms]), 1.0)
+            np.log1p(vector, out=vector)
+        return vector
+
+    def _split_passages(self, context: str) -> List[str]:
+        # Windows within paragraphs keep passage boundaries (and cache keys)
+        # stable when the chained context grows by whole sections
+        size = max(self.passage_words, -(-len(context.split()) // self.max_passages))
+        passages = list()
+        for block in re.split(r"\n\s*\n", context):
+            words = block.split()
+            passages.extend(" ".join(words[i:i + size]) for i in range(0, len(words), size))
+        return passages
+
+    def _cached(self, cache: OrderedDict, key: str, count: bool = False) -> Optional[Any]:
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            if count:
+                if value is None:
+                    self.cache_misses += 1
+                else:
+                    self.cache_hits += 1
+        return value
+
+    def _store(self, cache: OrderedDict, key: str, value: Any, limit: int) -> None:
+        with self._lock:
+            cache[key] = value
+            if len(cache) > limit:
+                cache.popitem(last=False)
+
+    def context_vectors(self, context: str) -> Tuple[np.ndarray, np.ndarray]:
+        """IDF weights and normalized passage vectors (passages x dim) for a context."""
+        if isinstance(context, ChainedContext):
+            # Derived from cached segment hashes instead of rehashing the whole text
+            context_key = context.digest
+        else:
+            context_key = hashlib.sha1(context.encode("utf-8")).hexdigest()
+        cached = self._cached(self._contexts, context_key)
+        if cached is not None:
+            return cached
+
+        rows = list()
+        for passage in self._split_passages(str(context)):
+            key = hashlib.sha1(passage.encode("utf-8")).hexdigest()
+            row = self._cached(self._passages, key, count=True)
+            if row is None:
+                row = self._features(passage)
+                self._store(self._passages, key, row, self.passage_cache_size)
+            rows.append(row)
+
+        matrix = np.vstack(rows) if rows else np.zeros((0, self.dim), dtype=np.float32)
+        idf = (np.log((1.0 + matrix.shape[0]) / (1.0 + np.count_nonzero(matrix, axis=0))) + 1.0).astype(np.float32)
+        vectors = (self._normalize(matrix * idf), idf)
+        self._store(self._contexts, context_key, vectors, self.context_cache_size)
+        return vectors
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    def score(self, content: str, context: str) -> Dict[str, Any]:
+        """
+        Score a section's grounding in its context.
+
+        Returns:
+            Dict with the overall score (0-1), the fraction of grounded
+            sentences, and per-sentence similarity and best-passage index
+        """
+        sentences = [s for s in split_sentences(content) if tokenize(s)]
+        passage_vectors, idf = self.context_vectors(context)
+        if not sentences or passage_vectors.shape[0] == 0:
+            return dict(score=0.0, grounded_fraction=0.0, sentences=[])
+
+        sentence_vectors = self._normalize(np.vstack([self._features(s) for s in sentences]) * idf)
+
+        # sentences x passages in one product
+        similarity = sentence_vectors @ passage_vectors.T
+        best = similarity.argmax(axis=1)
+        support = similarity[np.arange(len(sentences)), best]
+        per_sentence = np.minimum(support / FULL_SUPPORT_SIMILARITY, 1.0)
+
+        return dict(
+            score=round(float(per_sentence.mean()), 2),
+            grounded_fraction=round(float((support >= GROUNDED_SIMILARITY).mean()), 2),
+            sentences=[
+                dict(sentence=sentence, similarity=round(float(sim), 3), passage=int(passage))
+                for sentence, sim, passage in zip(sentences, support, best)
+            ]
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(
+                cached_passages=len(self._passages),
+                cached_contexts=len(self._contexts),
+                cache_hits=self.cache_hits,
+                cache_misses=self.cache_misses
+            )
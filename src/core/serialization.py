@@ -0,0 +1,167 @@
+"""
+Report Response Serialization
+=============================
+Fast path from pydantic models to HTTP response bodies.
+
+Returning model_dump() through JSONResponse walks a report twice: once
+to build a dict tree, then again in json.dumps. Reports here are
+serialized straight to JSON bytes by pydantic's compiled serializer,
+taken from a TypeAdapter that is built once per model type. Bodies above
+a small size are compressed with gzip or deflate when the client's
+Accept-Encoding allows it.
+
+Serializing and compressing a multi-megabyte report takes long enough to
+stall every other request on the event loop, so response_async() hands
+bodies expected to be at least offload_bytes to the threadpool.
+
+Every response carries its serialization and compression time in a
+Server-Timing header and its uncompressed size in X-Uncompressed-Length.
+Totals are kept for /metrics.
+"""
+
+import threading
+import time
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import Response
+
+from src.utils.profiler import run_in_threadpool
+
+# Bodies smaller than this are sent uncompressed (the framing costs more than it saves)
+MIN_COMPRESS_BYTES = 1024
+
+# Bodies expected to be at least this large are serialized off the event loop
+OFFLOAD_BYTES = 256 * 1024
+
+# Supported content codings, preferred first
+ENCODINGS = ("gzip", "deflate")
+
+# zlib window bits per content coding (deflate is the zlib format, per RFC 9110)
+_WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+
+@lru_cache(maxsize=None)
+def _adapter(model_type: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(model_type)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Content coding to use for an Accept-Encoding header value.
+
+    Returns the acceptable coding with the highest q-value (ties go to
+    the ENCODINGS order), or None for an uncompressed response.
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = dict()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in ENCODINGS:
+        q = weights.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class ReportSerializer:
+    """
+    Serializes pydantic models to (optionally compressed) JSON responses.
+
+    Args:
+        min_compress_bytes: Smallest body that is compressed
+        level: zlib compression level
+        offload_bytes: Expected body size from which response_async() uses the threadpool
+    """
+
+    def __init__(self, min_compress_bytes: int = MIN_COMPRESS_BYTES, level: int = 6,
+                 offload_bytes: int = OFFLOAD_BYTES):
+        self.min_compress_bytes = min_compress_bytes
+        self.level = level
+        self.offload_bytes = offload_bytes
+        self._lock = threading.Lock()
+        self._stats = dict(
+            responses=0,
+            compressed=0,
+            offloaded=0,
+            bytes_raw=0,
+            bytes_out=0,
+            serialize_ms=0.0,
+            compress_ms=0.0
+        )
+
+    def serialize(self, model: BaseModel) -> bytes:
+        return _adapter(type(model)).dump_json(model)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, _WBITS[encoding])
+        return compressor.compress(body) + compressor.flush()
+
+    def response(self, model: BaseModel, accept_encoding: Optional[str] = None,
+                 status_code: int = 200) -> Response:
+        """JSON response for a model, compressed as negotiated from Accept-Encoding."""
+        start = time.perf_counter()
+        body = self.serialize(model)
+        serialize_ms = (time.perf_counter() - start) * 1000
+
+        raw_size, compress_ms = len(body), 0.0
+        headers = {"Vary": "Accept-Encoding", "X-Uncompressed-Length": str(raw_size)}
+        encoding = negotiate_encoding(accept_encoding) if raw_size >= self.min_compress_bytes else None
+        if encoding:
+            start = time.perf_counter()
+            body = self.compress(body, encoding)
+            compress_ms = (time.perf_counter() - start) * 1000
+            headers["Content-Encoding"] = encoding
+        headers["Server-Timing"] = f"serialize;dur={serialize_ms:.2f}, compress;dur={compress_ms:.2f}"
+
+        with self._lock:
+            self._stats["responses"] += 1
+            self._stats["compressed"] += bool(encoding)
+            self._stats["bytes_raw"] += raw_size
+            self._stats["bytes_out"] += len(body)
+            self._stats["serialize_ms"] += serialize_ms
+            self._stats["compress_ms"] += compress_ms
+        return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+    async def response_async(self, model: BaseModel, accept_encoding: Optional[str] = None,
+                             status_code: int = 200, size_hint: int = 0) -> Response:
+        """
+        response() for async handlers.
+
+        size_hint is the caller's cheap estimate of the body size (such as
+        the length of the model's text fields); from offload_bytes on, the
+        work runs in the threadpool instead of on the event loop.
+        """
+        if size_hint < self.offload_bytes:
+            return self.response(model, accept_encoding, status_code)
+        with self._lock:
+            self._stats["offloaded"] += 1
+        return await run_in_threadpool(self.response, model, accept_encoding, status_code)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        responses = stats["responses"] or 1
+        stats.update(
+            serialize_ms=round(stats["serialize_ms"], 2),
+            compress_ms=round(stats["compress_ms"], 2),
+            avg_serialize_ms=round(stats["serialize_ms"] / responses, 3),
+            avg_compress_ms=round(stats["compress_ms"] / responses, 3),
+            compression_ratio=round(stats["bytes_raw"] / stats["bytes_out"], 2) if stats["bytes_out"] else 0.0
+        )
+        return stats
@@ -0,0 +1,123 @@
+"""
+Extractive Executive Summary
+============================
+Builds the report's executive summary locally, without another model call.
+
+Sentences from all generated sections are embedded as TF-IDF vectors and
+ranked with TextRank (PageRank over the cosine-similarity graph) in NumPy.
+The top sentences are picked with per-section coverage and redundancy
+filtering, and returned in report order.
+"""
+
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.text import split_sentences, tokenize
+
+# Sentences this similar to an already selected one are skipped
+REDUNDANCY_THRESHOLD = 0.6
+
+
+class ExtractiveSummarizer:
+    """
+    TF-IDF/TextRank sentence extractor.
+
+    Args:
+        max_sentences: Sentences in the summary
+        min_words: Shorter sentences (labels, headings) are not candidates
+        damping: TextRank damping factor
+        iterations: Maximum power-iteration steps
+    """
+
+    def __init__(self, max_sentences: int = 5, min_words: int = 8,
+                 damping: float = 0.85, iterations: int = 100):
+        self.max_sentences = max_sentences
+        self.min_words = min_words
+        self.damping = damping
+        self.iterations = iterations
+
+    def _candidates(self, sections: Sequence[Tuple[str, str]]) -> List[Tuple[int, str, List[str]]]:
+        candidates = list()
+        for section_index, (_, content) in enumerate(sections):
+            for sentence in split_sentences(content):
+                tokens = tokenize(sentence)
+                if len(sentence.split()) >= self.min_words and tokens:
+                    candidates.append((section_index, sentence, tokens))
+        return candidates
+
+    def _tfidf(self, token_lists: List[List[str]]) -> np.ndarray:
+        vocabulary: Dict[str, int] = {}
+        rows, cols = list(), list()
+        for row, tokens in enumerate(token_lists):
+            for token in tokens:
+                rows.append(row)
+                cols.append(vocabulary.setdefault(token, len(vocabulary)))
+        counts = np.zeros((len(token_lists), len(vocabulary)))
+        np.add.at(counts, (np.array(rows), np.array(cols)), 1.0)
+
+        document_frequency = np.count_nonzero(counts, axis=0)
+        idf = np.log((1.0 + len(token_lists)) / (1.0 + document_frequency)) + 1.0
+        weights = np.log1p(counts) * idf
+        norms = np.linalg.norm(weights, axis=1, keepdims=True)
+        return weights / np.where(norms == 0, 1.0, norms)
+
+    def _textrank(self, similarity: np.ndarray) -> np.ndarray:
+        n = similarity.shape[0]
+        graph = similarity.copy()
+        np.fill_diagonal(graph, 0.0)
+        row_sums = graph.sum(axis=1, keepdims=True)
+        # Isolated sentences link uniformly so the chain stays stochastic
+        transition = np.where(row_sums > 0, graph / np.where(row_sums == 0, 1.0, row_sums), 1.0 / n)
+        scores = np.full(n, 1.0 / n)
+        for _ in range(self.iterations):
+            updated = (1.0 - self.damping) / n + self.damping * transition.T @ scores
+            if np.abs(updated - scores).sum() < 1e-8:
+                return updated
+            scores = updated
+        return scores
+
+    def summarize(self, sections: Sequence[Tuple[str, str]]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Summarize report sections.
+
+        Args:
+            sections: (title, content) pairs in report order
+
+        Returns:
+            The selected sentences joined into one paragraph, and timing stats
+        """
+        start = time.perf_counter()
+        candidates = self._candidates(sections)
+        if not candidates:
+            return "", dict(mode="extractive", candidates=0, sentences=0, elapsed_ms=0.0)
+
+        vectors = self._tfidf([tokens for _, _, tokens in candidates])
+        similarity = vectors @ vectors.T
+        scores = self._textrank(similarity)
+
+        # Best sentence of each section first, then the rest by score
+        order = list(np.argsort(-scores, kind="stable"))
+        section_best = dict()
+        for index in order:
+            section_best.setdefault(candidates[index][0], index)
+        leaders = set(section_best.values())
+        ranked = list(section_best.values()) + [i for i in order if i not in leaders]
+
+        selected: List[int] = []
+        for index in ranked:
+            if len(selected) >= self.max_sentences:
+                break
+            if selected and similarity[index, selected].max() >= REDUNDANCY_THRESHOLD:
+                continue
+            selected.append(index)
+
+        sentences = [candidates[index][1] for index in sorted(selected)]
+        summary = " ".join(s if s[-1] in ".!?" else s + "." for s in sentences)
+        return summary, dict(
+            mode="extractive",
+            candidates=len(candidates),
+            sentences=len(selected),
+            elapsed_ms=round((time.perf_counter() - start) * 1000, 2)
+        )
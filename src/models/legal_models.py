@@ -87,12 +87,8 @@ class AnalysisReport(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
     def dict(self, **kwargs):
-        """Override dict to ensure proper serialization."""
-        data = super().dict(**kwargs)
-        # Ensure scenario is properly serialized
-        if isinstance(data.get('scenario'), LegalScenario):
-            data['scenario'] = data['scenario'].dict()
-        return data
+        """Plain-dict form (nested models included); kept for pydantic v1 callers."""
+        return self.model_dump(**kwargs)
 
 
 class AgentResponse(BaseModel):
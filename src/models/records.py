@@ -0,0 +1,154 @@
+"""
+Internal Records for the Generation Hot Path
+============================================
+Lightweight slotted records for per-section data that the agent creates
+for every generated section: report items, token usage and audit
+entries.
+
+A pydantic model or a dict per section costs several hundred bytes plus
+validation work, and an audit dict used to hold its own 300-character
+copy of the section output. These records have no per-instance __dict__,
+derive the output preview from the section content on access, and are
+converted to the pydantic models in legal_models only at the API
+boundary.
+
+Records support read-only mapping access (record["title"], .get(),
+dict(record)) so code written against the earlier dict items, and items
+decoded from storage, can be handled alike.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.models.legal_models import TokenUsage
+
+# Characters of context and output kept as audit previews
+PREVIEW_CHARS = 300
+
+
+class _Record:
+    """Base class: mapping-style read access over the public fields."""
+
+    __slots__ = ()
+    _fields: tuple = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self._fields else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fields
+
+    def keys(self) -> tuple:
+        return self._fields
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self._fields}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (_Record, dict)):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+
+class UsageRecord(_Record):
+    """Token usage of one model call or section."""
+
+    __slots__ = ("input_tokens", "output_tokens", "total_tokens")
+    _fields = __slots__
+
+    def __init__(self, input_tokens: int = 0, output_tokens: int = 0, total_tokens: Optional[int] = None):
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.total_tokens = input_tokens + output_tokens if total_tokens is None else total_tokens
+
+    def __add__(self, other: "UsageRecord") -> "UsageRecord":
+        return UsageRecord(
+            self.input_tokens + other.input_tokens,
+            self.output_tokens + other.output_tokens,
+            self.total_tokens + other.total_tokens
+        )
+
+    def to_model(self) -> TokenUsage:
+        return TokenUsage(
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+            total_tokens=self.total_tokens
+        )
+
+
+class AuditRecord(_Record):
+    """
+    Audit entry of one generated section.
+
+    Args:
+        content: The section text; the output preview is derived from it
+        context: Chain context the section was generated from; only its
+            preview prefix is kept
+    """
+
+    __slots__ = (
+        "section", "timestamp", "latency_seconds", "cost_usd", "tokens_used", "quality_score",
+        "generation_mode", "model", "cascade_tier", "cascade_attempts", "content_hash",
+        "_context_preview", "_content"
+    )
+    _fields = (
+        "section", "timestamp", "latency_seconds", "cost_usd", "tokens_used", "quality_score",
+        "generation_mode", "model", "cascade_tier", "cascade_attempts",
+        "input_context_preview", "output_preview", "content_hash"
+    )
+
+    def __init__(self, section: str, timestamp: str, latency_seconds: float, cost_usd: float,
+                 tokens_used: int, quality_score: float, generation_mode: str, model: str,
+                 cascade_tier: int, cascade_attempts: List[Dict[str, Any]], content: str,
+                 context: str, content_hash: str):
+        self.section = section
+        self.timestamp = timestamp
+        self.latency_seconds = latency_seconds
+        self.cost_usd = cost_usd
+        self.tokens_used = tokens_used
+        self.quality_score = quality_score
+        self.generation_mode = generation_mode
+        self.model = model
+        self.cascade_tier = cascade_tier
+        self.cascade_attempts = cascade_attempts
+        self.content_hash = content_hash
+        self._context_preview = context[:PREVIEW_CHARS]
+        self._content = content
+
+    @property
+    def input_context_preview(self) -> str:
+        return self._context_preview + "..."
+
+    @property
+    def output_preview(self) -> str:
+        return self._content[:PREVIEW_CHARS] + "..."
+
+
+class SectionRecord(_Record):
+    """One generated report section with its usage and audit entry."""
+
+    __slots__ = ("title", "agent_type", "content", "metrics", "audit")
+    _fields = __slots__
+
+    def __init__(self, title: str, agent_type: str, content: str, metrics: UsageRecord, audit: AuditRecord):
+        self.title = title
+        self.agent_type = agent_type
+        self.content = content
+        self.metrics = metrics
+        self.audit = audit
@@ -2,6 +2,9 @@
 TODOs 6-8: Define Expert Personas
 """
 
+from src.prompts.registry import PersonaRegistry
+
+
 class LegalPersonas:
     BUSINESS_ANALYST_PERSONA = """
     You are a Senior Business Analyst with 15+ years of experience in market research and quantitative analysis.
@@ -100,11 +103,8 @@ class LegalPersonas:
 
     @classmethod
     def get_persona(cls, key):
-        key = key.lower()
-        if "business" in key or "analyst" in key: return cls.BUSINESS_ANALYST_PERSONA
-        if "market" in key or "researcher" in key: return cls.MARKET_RESEARCHER_PERSONA
-        if "strategic" in key or "consultant" in key: return cls.STRATEGIC_CONSULTANT_PERSONA
-        return ""
+        persona = PERSONA_REGISTRY.get(key)
+        return persona.text if persona else ""
 
     @classmethod
     def validate_persona(cls, persona_text):
@@ -129,4 +129,31 @@ class LegalPersonas:
             sufficient_length=suff_len,
             score=round(score, 2)
         )
-        
\ No newline at end of file
+        
+
+
+# Report sections in generation order, and the persona that writes each
+SECTION_PERSONAS = (
+    ("Market Overview", "business_analyst"),
+    ("Competitive Analysis", "market_researcher"),
+    ("Risk Assessment", "strategic_consultant"),
+    ("Strategic Recommendations", "strategic_consultant"),
+)
+
+# Personas with normalized whitespace, token estimates and prompt templates
+PERSONA_REGISTRY = PersonaRegistry(
+    {
+        "business_analyst": LegalPersonas.BUSINESS_ANALYST_PERSONA,
+        "market_researcher": LegalPersonas.MARKET_RESEARCHER_PERSONA,
+        "strategic_consultant": LegalPersonas.STRATEGIC_CONSULTANT_PERSONA,
+    },
+    aliases=(
+        ("business", "business_analyst"),
+        ("analyst", "business_analyst"),
+        ("market", "market_researcher"),
+        ("researcher", "market_researcher"),
+        ("strategic", "strategic_consultant"),
+        ("consultant", "strategic_consultant"),
+    ),
+    sections=SECTION_PERSONAS
+)
@@ -0,0 +1,174 @@
+"""
+Persona Prompt Registry
+=======================
+Personas and per-section prompt templates, prepared once at load time.
+
+Personas are written as indented triple-quoted strings. The registry
+normalizes their whitespace (every indented line otherwise costs prompt
+tokens on every call), estimates each persona's token count and gives
+it a stable content hash. Lookups are dictionary hits on the agent key
+or one of its aliases, rather than a chain of substring tests.
+
+Prompt templates are built per (persona, section), for the report's
+section plan when the registry loads: the fixed text before and after
+the context is assembled once, so building a prompt is a single join of
+head, context segments and task with a known token cost for everything
+but the context. The agent charges that estimate when a response carries
+no prompt token count.
+"""
+
+import hashlib
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from src.core.context_builder import context_segments
+
+# Rough prompt-size estimate used for template token costs
+CHARS_PER_TOKEN = 4
+
+# Templates cached for persona texts that are not registered
+MAX_ADHOC_TEMPLATES = 256
+
+# Unregistered keys whose alias resolution is remembered (least recently used evicted)
+MAX_RESOLVED_KEYS = 1024
+
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalize_whitespace(text: str) -> str:
+    """Strip indentation and trailing spaces, collapse blank-line runs."""
+    lines = [line.strip() for line in text.strip().splitlines()]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines))
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def stable_hash(text: str) -> str:
+    """Content hash that is the same across processes (usable as a cache key)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class Persona:
+    """A normalized persona with its token estimate and hash."""
+
+    __slots__ = ("key", "text", "tokens", "hash")
+
+    def __init__(self, key: str, text: str):
+        self.key = key
+        self.text = normalize_whitespace(text)
+        self.tokens = estimate_tokens(self.text)
+        self.hash = stable_hash(self.text)
+
+
+class PromptTemplate:
+    """
+    Section prompt for one persona, with the context left to fill in.
+
+    Args:
+        persona_text: Persona the prompt opens with
+        section: Section the task asks for
+    """
+
+    __slots__ = ("section", "head", "task", "tokens", "key")
+
+    def __init__(self, persona_text: str, section: str):
+        self.section = section
+        self.head = f"{persona_text}\n\nCONTEXT:\n"
+        self.task = (
+            f"\n\nTASK:\nGenerate the '{section}' section of the legal report.\n"
+            "Focus on professional, clear, and actionable analysis."
+        )
+        # Tokens of everything except the context and length hint
+        self.tokens = estimate_tokens(self.head) + estimate_tokens(self.task)
+        self.key = f"{stable_hash(persona_text)}:{section}"
+
+    def fill(self, context, length_hint: Optional[str] = None) -> str:
+        """The prompt for a context (string or ChainedContext), joined once."""
+        tail = (self.task, f"\n{length_hint}") if length_hint else (self.task,)
+        return "".join((self.head, *context_segments(context), *tail))
+
+    def prompt_tokens(self, context, length_hint: Optional[str] = None) -> int:
+        """Estimated prompt tokens, without building the prompt."""
+        context_tokens = math.ceil(len(context) / CHARS_PER_TOKEN)
+        return self.tokens + context_tokens + (estimate_tokens(f"\n{length_hint}") if length_hint else 0)
+
+
+class PersonaRegistry:
+    """
+    Registered personas by key and alias, plus cached prompt templates.
+
+    Args:
+        personas: Agent key -> persona text
+        aliases: Ordered (fragment, agent key) pairs; a key that is not
+            registered resolves to the first fragment it contains
+        sections: (section, agent key) pairs whose templates are built at load
+    """
+
+    def __init__(self, personas: Dict[str, str], aliases: Sequence[Tuple[str, str]] = (),
+                 sections: Sequence[Tuple[str, str]] = ()):
+        self._personas = {key: Persona(key, text) for key, text in personas.items()}
+        self._aliases = tuple(aliases)
+        self._lookup: Dict[str, Persona] = dict(self._personas)
+        self._lookup.update({fragment: self._personas[key] for fragment, key in self._aliases})
+        # Keys are caller-supplied, so other resolutions are kept in a bounded LRU
+        self._resolved: "OrderedDict[str, Optional[Persona]]" = OrderedDict()
+        self._templates: Dict[Tuple[str, str], PromptTemplate] = {
+            (self._personas[key].text, section): PromptTemplate(self._personas[key].text, section)
+            for section, key in sections
+        }
+        self._adhoc_templates: Dict[Tuple[str, str], PromptTemplate] = dict()
+        self._registered_texts = {persona.text for persona in self._personas.values()}
+        self._lock = threading.Lock()
+        self.template_fills = 0
+
+    def keys(self) -> Iterable[str]:
+        return self._personas.keys()
+
+    def get(self, key: str) -> Optional[Persona]:
+        """Persona for an agent key or alias (None when none matches)."""
+        key = key.lower()
+        try:
+            return self._lookup[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key in self._resolved:
+                self._resolved.move_to_end(key)
+                return self._resolved[key]
+        persona = next((self._personas[target] for fragment, target in self._aliases if fragment in key), None)
+        with self._lock:
+            self._resolved[key] = persona
+            if len(self._resolved) > MAX_RESOLVED_KEYS:
+                self._resolved.popitem(last=False)
+        return persona
+
+    def template(self, persona_text: str, section: str) -> PromptTemplate:
+        """Prompt template for a persona text and section, built once."""
+        cache_key = (persona_text, section)
+        template = self._templates.get(cache_key) or self._adhoc_templates.get(cache_key)
+        if template is None:
+            template = PromptTemplate(persona_text, section)
+            with self._lock:
+                if persona_text in self._registered_texts:
+                    self._templates[cache_key] = template
+                else:
+                    if len(self._adhoc_templates) >= MAX_ADHOC_TEMPLATES:
+                        self._adhoc_templates.clear()
+                    self._adhoc_templates[cache_key] = template
+        with self._lock:
+            self.template_fills += 1
+        return template
+
+    def stats(self) -> Dict[str, object]:
+        return dict(
+            personas={key: dict(tokens=p.tokens, hash=p.hash) for key, p in self._personas.items()},
+            templates=len(self._templates),
+            adhoc_templates=len(self._adhoc_templates),
+            resolved_keys=len(self._resolved),
+            template_fills=self.template_fills
+        )
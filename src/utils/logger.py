@@ -1,11 +1,231 @@
 """
 Logging Configuration for Legal Intelligence AI System
 ======================================================
+Text or JSON log records, written synchronously or through a queue.
+
+In async mode, loggers only put records on an in-memory queue; a
+QueueListener thread formats and writes them, so request handlers never
+block on stdout. Every record carries the request ID and section bound
+in the current context (contextvars follow requests into the threadpool),
+and JSON records keep any extra= fields, such as timings, as keys.
+
+Per-section INFO logs (marked with extra={"sample": True}) are
+rate-limited: up to LOG_SECTION_MAX_PER_SECOND pass each second, and
+beyond that only a LOG_SECTION_SAMPLE_RATE fraction does.
 """
 
+import atexit
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-from pathlib import Path
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional
+
+# Context of the request being served, attached to every record
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+section_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("section", default=None)
+
+# LogRecord attributes that are not extra= fields
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "sample"}
+
+# Handler and listener installed by configure_logging, replaced on reconfiguration
+_installed: Dict[str, Any] = dict(handler=None, listener=None, sampler=None)
+_install_lock = threading.Lock()
+
+
+def set_log_context(**fields: Optional[str]) -> None:
+    """Bind request_id and/or section for records logged from this context."""
+    if "request_id" in fields:
+        request_id_var.set(fields["request_id"])
+    if "section" in fields:
+        section_var.set(fields["section"])
+
+
+@contextmanager
+def log_context(request_id: Optional[str] = None, section: Optional[str] = None) -> Iterator[None]:
+    """Bind request_id and/or section for the duration of a block."""
+    tokens = list()
+    if request_id is not None:
+        tokens.append((request_id_var, request_id_var.set(request_id)))
+    if section is not None:
+        tokens.append((section_var, section_var.set(section)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the bound request_id and section onto records (runs in the emitting thread)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_var.get()
+        if getattr(record, "section", None) is None:
+            record.section = section_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate-limits records logged with extra={"sample": True} below WARNING.
+
+    Args:
+        max_per_second: Sampled records passed per second before sampling starts
+        sample_rate: Fraction of records passed once the limit is reached
+    """
+
+    def __init__(self, max_per_second: float = 50.0, sample_rate: float = 0.1):
+        super().__init__()
+        self.max_per_second = max_per_second
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._window = 0
+        self._in_window = 0
+        self._overflow = 0
+        self.passed = 0
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sample", False) or record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            window = int(time.monotonic())
+            if window != self._window:
+                self._window, self._in_window, self._overflow = window, 0, 0
+            self._in_window += 1
+            keep = self._in_window <= self.max_per_second
+            if not keep and self.sample_rate > 0:
+                # Deterministic 1-in-N once over the limit
+                self._overflow += 1
+                keep = self._overflow % max(1, round(1 / self.sample_rate)) == 0
+            if keep:
+                self.passed += 1
+            else:
+                self.dropped += 1
+        return keep
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including request context and extra= fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = dict(
+            timestamp=datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            level=record.levelname,
+            logger=record.name,
+            message=record.getMessage(),
+            request_id=getattr(record, "request_id", None),
+            section=getattr(record, "section", None)
+        )
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # Formatted before queueing (see _QueueHandler)
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that keeps the traceback apart from the message.
+
+    The stock prepare() folds the formatted exception into the message and
+    drops exc_info, so the listener's formatter can no longer tell them
+    apart. Here the message is only merged with its args and the traceback
+    is kept as text in exc_text, which both formatters read.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = logging.Formatter().formatException(record.exc_info)
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        record.exc_text = exc_text
+        return record
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() == "true"
+
+
+def configure_logging(level: str = "INFO", json_format: Optional[bool] = None,
+                      async_mode: Optional[bool] = None, max_per_second: Optional[float] = None,
+                      sample_rate: Optional[float] = None) -> None:
+    """
+    Install the application's handler on the root logger (idempotent).
+
+    Unset arguments come from LOG_FORMAT (text or json), LOG_ASYNC,
+    LOG_SECTION_MAX_PER_SECOND and LOG_SECTION_SAMPLE_RATE.
+    """
+    json_format = os.getenv("LOG_FORMAT", "text").lower() == "json" if json_format is None else json_format
+    async_mode = _env_flag("LOG_ASYNC", "true") if async_mode is None else async_mode
+    max_per_second = float(os.getenv("LOG_SECTION_MAX_PER_SECOND", "50")) if max_per_second is None else max_per_second
+    sample_rate = float(os.getenv("LOG_SECTION_SAMPLE_RATE", "0.1")) if sample_rate is None else sample_rate
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if json_format:
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+
+    with _install_lock:
+        shutdown_logging()
+        sampler = SamplingFilter(max_per_second, sample_rate)
+        if async_mode:
+            handler = _QueueHandler(queue.SimpleQueue())
+            listener = logging.handlers.QueueListener(handler.queue, stream_handler, respect_handler_level=True)
+            listener.start()
+        else:
+            handler, listener = stream_handler, None
+        # Filters on the front handler run in the emitting thread, where the context is bound
+        handler.addFilter(ContextFilter())
+        handler.addFilter(sampler)
+
+        root = logging.getLogger()
+        root.setLevel(getattr(logging, level.upper()))
+        root.addHandler(handler)
+        _installed.update(handler=handler, listener=listener, sampler=sampler)
+
+
+def shutdown_logging() -> None:
+    """Remove the installed handler, writing out queued records first."""
+    handler, listener = _installed["handler"], _installed["listener"]
+    if listener is not None:
+        listener.stop()
+    if handler is not None:
+        logging.getLogger().removeHandler(handler)
+    _installed.update(handler=None, listener=None)
+
+
+def logging_stats() -> Dict[str, Any]:
+    sampler = _installed["sampler"]
+    return dict(
+        async_mode=_installed["listener"] is not None,
+        sampled_passed=sampler.passed if sampler else 0,
+        sampled_dropped=sampler.dropped if sampler else 0
+    )
+
+
+atexit.register(shutdown_logging)
 
 
 def setup_logger(name: str = "legal-intelligence", level: str = "INFO") -> logging.Logger:
@@ -19,25 +239,7 @@ def setup_logger(name: str = "legal-intelligence", level: str = "INFO") -> loggi
     Returns:
         Configured logger instance
     """
-    # Create logger
+    configure_logging(level)
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper()))
-
-    # Remove existing handlers to avoid duplicates
-    logger.handlers.clear()
-
-    # Create console handler with formatting
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, level.upper()))
-
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_handler.setFormatter(formatter)
-
-    # Add handler to logger
-    logger.addHandler(console_handler)
-
-    return logger
\ No newline at end of file
+    return logger
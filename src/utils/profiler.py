@@ -0,0 +1,368 @@
+"""
+On-Demand Request Profiler
+==========================
+Profiles live requests for a bounded session, started and stopped at
+runtime (no restart, nothing installed while no session runs).
+
+A session covers the next N matching requests and/or a time window, in
+one of two modes:
+
+- sampling: a background thread reads the stacks of the threads serving
+  profiled requests every interval_ms (sys._current_frames, no tracing
+  hooks) and counts them as collapsed stacks, ready for flamegraph.pl or
+  speedscope. Stacks without a frame from this project (an idle event
+  loop, an idle worker) are counted as idle, not kept.
+- cprofile: deterministic cProfile of the same threads, rendered as
+  pstats text. Exact call counts, but it slows profiled requests down.
+
+A request's work is split between the event loop thread and threadpool
+workers. The event loop thread is covered while a profiled request is in
+flight; work sent to the threadpool is covered when it goes through this
+module's run_in_threadpool (a pass-through while no session runs).
+"""
+
+import contextvars
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from starlette.concurrency import run_in_threadpool as _run_in_threadpool
+
+MODES = ("sampling", "cprofile")
+FORMATS = dict(sampling="collapsed", cprofile="pstats")
+
+# Frames read per sampled stack, from the innermost one
+MAX_STACK_DEPTH = 128
+
+# Distinct collapsed stacks kept per session; further new stacks are only counted
+MAX_DISTINCT_STACKS = 20000
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_PROJECT_PREFIX = str(PROJECT_ROOT) + "/"
+_THIS_FILE = str(Path(__file__).resolve())
+
+# Session profiling the request being served in this context
+_current_session: contextvars.ContextVar[Optional["ProfileSession"]] = contextvars.ContextVar(
+    "profile_session", default=None
+)
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a session is started while another one is running."""
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    if filename.startswith(_PROJECT_PREFIX) and "site-packages" not in filename:
+        filename = filename[len(_PROJECT_PREFIX):]
+    else:
+        filename = Path(filename).name
+    return f"{filename}:{code.co_name}"
+
+
+def _is_project_code(code) -> bool:
+    filename = code.co_filename
+    return filename.startswith(_PROJECT_PREFIX) and "site-packages" not in filename and filename != _THIS_FILE
+
+
+class ProfileSession:
+    """
+    One profiling session: which requests it covers and what it collected.
+
+    Args:
+        mode: "sampling" or "cprofile"
+        requests: Requests to profile (None for no limit)
+        seconds: Window after which no new requests are profiled (None for no limit)
+        interval_ms: Sampling interval (sampling mode)
+        path: Path prefix of the requests to profile
+    """
+
+    def __init__(self, mode: str, requests: Optional[int], seconds: Optional[float],
+                 interval_ms: float, path: str):
+        self.id = uuid.uuid4().hex
+        self.mode = mode
+        self.requests = requests
+        self.seconds = seconds
+        self.interval_ms = interval_ms
+        self.path = path
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.stop_reason: Optional[str] = None
+        self._deadline = time.monotonic() + seconds if seconds is not None else None
+        self._lock = threading.Lock()
+        self._claimed = 0
+        self._in_flight = 0
+        # Thread ident -> profiled work running on it
+        self._threads: Counter = Counter()
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._idle_samples = 0
+        self._dropped_stacks = 0
+        self._profiles: Dict[int, cProfile.Profile] = dict()
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        if mode == "sampling":
+            self._sampler = threading.Thread(target=self._sample_loop, name="request-profiler", daemon=True)
+            self._sampler.start()
+
+    @property
+    def running(self) -> bool:
+        return self.finished_at is None
+
+    def _accepting(self) -> bool:
+        if self.requests is not None and self._claimed >= self.requests:
+            return False
+        return self._deadline is None or time.monotonic() < self._deadline
+
+    def _claim(self) -> bool:
+        with self._lock:
+            if not self.running or not self._accepting():
+                return False
+            self._claimed += 1
+            self._in_flight += 1
+        return True
+
+    def _release(self) -> bool:
+        """Mark a request done; True when the session has nothing left to profile."""
+        with self._lock:
+            self._in_flight -= 1
+            return self._in_flight == 0 and not self._accepting()
+
+    def _enter_thread(self) -> Optional[int]:
+        """Start covering the calling thread; returns its ident (None once finished)."""
+        ident = threading.get_ident()
+        with self._lock:
+            if not self.running:
+                return None
+            self._threads[ident] += 1
+            # Concurrent requests share the event loop thread: profile it from first entry to last exit
+            if self.mode == "cprofile" and self._threads[ident] == 1:
+                self._profiles.setdefault(ident, cProfile.Profile()).enable()
+        return ident
+
+    def _exit_thread(self, ident: Optional[int]) -> None:
+        if ident is None:
+            return
+        with self._lock:
+            self._threads[ident] -= 1
+            if not self._threads[ident]:
+                del self._threads[ident]
+                if self.mode == "cprofile":
+                    self._profiles[ident].disable()
+
+    @contextmanager
+    def thread(self) -> Iterator[None]:
+        """Profile the calling thread for the duration of a block."""
+        ident = self._enter_thread()
+        try:
+            yield
+        finally:
+            self._exit_thread(ident)
+
+    def _sample_loop(self) -> None:
+        interval = self.interval_ms / 1000
+        while not self._stop.wait(interval):
+            with self._lock:
+                idents = list(self._threads)
+            if not idents:
+                continue
+            frames = sys._current_frames()
+            for ident in idents:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self._record(frame)
+
+    def _record(self, frame) -> None:
+        labels, project = list(), False
+        while frame is not None and len(labels) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            if code.co_filename != _THIS_FILE:
+                labels.append(_frame_label(code))
+                project = project or _is_project_code(code)
+            frame = frame.f_back
+        stack = ";".join(reversed(labels))
+        with self._lock:
+            self._samples += 1
+            if not project:
+                self._idle_samples += 1
+            elif stack in self._stacks or len(self._stacks) < MAX_DISTINCT_STACKS:
+                self._stacks[stack] += 1
+            else:
+                self._dropped_stacks += 1
+
+    def finish(self, reason: str) -> None:
+        """Stop collecting (call from the event loop thread)."""
+        if not self.running:
+            return
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        with self._lock:
+            ident = threading.get_ident()
+            if ident in self._threads and self.mode == "cprofile":
+                self._profiles[ident].disable()
+        self.finished_at = time.time()
+        self.stop_reason = reason
+
+    def status(self) -> Dict[str, Any]:
+        end = self.finished_at or time.time()
+        status = dict(
+            id=self.id,
+            mode=self.mode,
+            running=self.running,
+            path=self.path,
+            requests_limit=self.requests,
+            seconds_limit=self.seconds,
+            requests_profiled=self._claimed,
+            in_flight=self._in_flight,
+            started_at=self.started_at,
+            elapsed_seconds=round(end - self.started_at, 3),
+            stop_reason=self.stop_reason
+        )
+        if self.mode == "sampling":
+            status.update(
+                interval_ms=self.interval_ms,
+                samples=self._samples,
+                idle_samples=self._idle_samples,
+                distinct_stacks=len(self._stacks),
+                dropped_stacks=self._dropped_stacks
+            )
+        else:
+            status.update(profiled_threads=len(self._profiles))
+        return status
+
+    def render(self, output_format: Optional[str] = None, limit: int = 50) -> str:
+        """Collapsed stacks (sampling) or pstats text (cprofile) of a finished session."""
+        if self.running:
+            raise RuntimeError("Profile session is still running")
+        output_format = output_format or FORMATS[self.mode]
+        if output_format != FORMATS[self.mode]:
+            raise ValueError(f"{self.mode} sessions render as {FORMATS[self.mode]}, not {output_format}")
+        if self.mode == "sampling":
+            return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+        profiles = [profile for profile in self._profiles.values() if profile.getstats()]
+        if not profiles:
+            return "No profile data collected\n"
+        stream = io.StringIO()
+        stats = pstats.Stats(profiles[0], stream=stream)
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+
+class RequestProfiler:
+    """
+    Starts, stops and routes requests to the current profiling session.
+
+    Paths starting with excluded_prefix (the profiler's own endpoints) are
+    never profiled.
+    """
+
+    def __init__(self, excluded_prefix: str = "/debug"):
+        self.excluded_prefix = excluded_prefix
+        self._session: Optional[ProfileSession] = None
+        self._last: Optional[ProfileSession] = None
+        self._lock = threading.Lock()
+
+    def start(self, mode: str = "sampling", requests: Optional[int] = None, seconds: Optional[float] = None,
+              interval_ms: float = 5.0, path: str = "/analyze") -> ProfileSession:
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode '{mode}' (expected one of {', '.join(MODES)})")
+        if requests is None and seconds is None:
+            raise ValueError("Give a request count, a time window or both")
+        if (requests is not None and requests < 1) or (seconds is not None and seconds <= 0) or interval_ms <= 0:
+            raise ValueError("requests, seconds and interval_ms must be positive")
+        with self._lock:
+            self._expire()
+            if self._session is not None:
+                raise ProfilerBusyError(f"Profile session {self._session.id} is already running")
+            self._session = ProfileSession(mode, requests, seconds, interval_ms, path)
+            return self._session
+
+    def stop(self, reason: str = "stopped") -> Optional[ProfileSession]:
+        """Finish the running session early; returns it (None when none runs)."""
+        with self._lock:
+            session = self._session
+            if session is not None:
+                self._finish(session, reason)
+            return session
+
+    def current(self) -> Optional[ProfileSession]:
+        """The running session, or else the last finished one."""
+        with self._lock:
+            self._expire()
+            return self._session or self._last
+
+    def _finish(self, session: ProfileSession, reason: str) -> None:
+        session.finish(reason)
+        self._session, self._last = None, session
+
+    def _expire(self) -> None:
+        session = self._session
+        if session is not None and session._in_flight == 0 and not session._accepting():
+            self._finish(session, "limit")
+
+    def claim(self, path: str) -> Optional[ProfileSession]:
+        """The session that will profile a request to path, if any (call from the event loop)."""
+        session = self._session
+        if session is None or path.startswith(self.excluded_prefix) or not path.startswith(session.path):
+            return None
+        return session if session._claim() else None
+
+    def release(self, session: ProfileSession) -> None:
+        if session._release():
+            with self._lock:
+                if self._session is session:
+                    self._finish(session, "limit")
+
+    async def profile(self, session: ProfileSession, call_next: Callable, request) -> Any:
+        """Serve a claimed request with its event loop and threadpool work profiled."""
+        token = _current_session.set(session)
+        ident = session._enter_thread()
+        try:
+            response = await call_next(request)
+        except BaseException:
+            session._exit_thread(ident)
+            self.release(session)
+            raise
+        finally:
+            _current_session.reset(token)
+        # The body (and a streamed analysis) is produced after call_next returns
+        body = response.body_iterator
+
+        async def profiled_body():
+            try:
+                async for chunk in body:
+                    yield chunk
+            finally:
+                session._exit_thread(ident)
+                self.release(session)
+
+        response.body_iterator = profiled_body()
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        session = self.current()
+        return dict(running=bool(session and session.running), session=session.status() if session else None)
+
+
+async def run_in_threadpool(func: Callable, *args, **kwargs) -> Any:
+    """starlette's run_in_threadpool, profiling the call when the request is being profiled."""
+    session = _current_session.get()
+    if session is None:
+        return await _run_in_threadpool(func, *args, **kwargs)
+
+    def profiled_call():
+        with session.thread():
+            return func(*args, **kwargs)
+
+    return await _run_in_threadpool(profiled_call)
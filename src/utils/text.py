@@ -0,0 +1,54 @@
+"""
+Text Utilities
+==============
+Sentence splitting and tokenization shared by the local NLP components.
+"""
+
+import re
+from typing import List
+
+# Markdown decoration stripped before splitting into sentences
+_MARKDOWN_LINE = re.compile(r"^\s*(?:#{1,6}\s+|[-*•]\s+|\d+[.)]\s+|>\s*)")
+_EMPHASIS = re.compile(r"[*_`]{1,3}")
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9$])")
+# Abbreviations that end with a period without ending the sentence
+_ABBREVIATIONS = frozenset(("mr.", "mrs.", "ms.", "dr.", "inc.", "corp.", "co.", "ltd.", "llc.", "no.", "v.", "vs.", "u.s.", "al.", "e.g.", "i.e."))
+_TOKEN = re.compile(r"[a-z0-9$][a-z0-9$%'.-]*[a-z0-9%]|[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers him his how i if in into is it its itself just may me might more most must
+my no nor not of off on once only or other our ours out over own same shall she should so some such
+than that the their theirs them then there these they this those through to too under until up upon
+very was we were what when where which while who whom why will with would you your
+""".split())
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split markdown-ish text into sentences; bullet and heading lines stand alone."""
+    sentences = list()
+    for block in re.split(r"\n\s*\n", text):
+        for line in block.split("\n"):
+            line = _EMPHASIS.sub("", _MARKDOWN_LINE.sub("", line)).strip()
+            if not line:
+                continue
+            line_start = True
+            for part in _SENTENCE_END.split(line):
+                part = part.strip()
+                if not part:
+                    continue
+                if sentences and not line_start and sentences[-1].split()[-1].lower() in _ABBREVIATIONS:
+                    sentences[-1] += " " + part
+                else:
+                    sentences.append(part)
+                line_start = False
+    return sentences
+
+
+def tokenize(text: str, drop_stopwords: bool = True) -> List[str]:
+    """Lowercase word tokens, keeping figures like $5 and 45%."""
+    tokens = _TOKEN.findall(text.lower())
+    if drop_stopwords:
+        return [token for token in tokens if token not in STOPWORDS]
+    return tokens
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for admission control.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.admission import AdmissionController, AdmissionDecision
+
+
+class TestAdmissionController(unittest.TestCase):
+
+    def test_admits_when_idle(self):
+        controller = AdmissionController()
+        self.assertEqual(controller.decide(0, 0, 2.0).decision, AdmissionDecision.ADMIT)
+
+    def test_sheds_on_queue_depth(self):
+        controller = AdmissionController(max_queue_depth=4, concurrency=2)
+        for _ in range(3):
+            controller.record_report(10.0)
+        admission = controller.decide(2, 4, 1.0)
+        self.assertEqual(admission.decision, AdmissionDecision.SHED)
+        # Five reports ahead at 10s each over two slots
+        self.assertEqual(admission.retry_after, 25)
+
+    def test_sheds_on_model_latency(self):
+        controller = AdmissionController(max_model_latency=10.0)
+        admission = controller.decide(0, 0, 12.0)
+        self.assertEqual(admission.decision, AdmissionDecision.SHED)
+        self.assertIn("latency", admission.reason)
+        self.assertGreaterEqual(admission.retry_after, 1)
+
+    def test_probes_while_shedding_for_latency(self):
+        controller = AdmissionController(max_model_latency=10.0, probe_interval=5.0)
+        clock = "src.core.admission.time.monotonic"
+        with patch(clock, return_value=100.0):
+            self.assertEqual(controller.decide(0, 0, 12.0).decision, AdmissionDecision.SHED)
+        with patch(clock, return_value=103.0):
+            self.assertEqual(controller.decide(0, 0, 12.0).decision, AdmissionDecision.SHED)
+        with patch(clock, return_value=105.5):
+            probe = controller.decide(0, 0, 12.0)
+            self.assertEqual(probe.decision, AdmissionDecision.ADMIT)
+            self.assertEqual(probe.reason, "latency probe")
+            # One probe per interval
+            self.assertEqual(controller.decide(0, 0, 12.0).decision, AdmissionDecision.SHED)
+        self.assertEqual(controller.stats()["probes"], 1)
+
+    def test_no_probes_past_queue_limit(self):
+        controller = AdmissionController(max_queue_depth=4, max_model_latency=10.0, probe_interval=0.0)
+        for _ in range(3):
+            self.assertEqual(controller.decide(0, 4, 12.0).decision, AdmissionDecision.SHED)
+
+    def test_recovers_when_latency_goes_stale(self):
+        controller = AdmissionController(max_model_latency=10.0)
+        self.assertEqual(controller.decide(0, 0, 12.0).decision, AdmissionDecision.SHED)
+        # No model calls in the caller's window: no latency pressure
+        self.assertEqual(controller.decide(0, 0, None).decision, AdmissionDecision.ADMIT)
+
+    def test_degrades_before_shedding(self):
+        controller = AdmissionController(max_queue_depth=10, max_in_flight=4, degrade=True,
+                                         degraded_sections=["Risk Assessment"], degraded_max_output_tokens=512)
+        admission = controller.decide(1, 6, None)
+        self.assertEqual(admission.decision, AdmissionDecision.DEGRADE)
+        self.assertEqual(admission.sections, ["Risk Assessment"])
+        self.assertEqual(admission.max_output_tokens, 512)
+        self.assertEqual(controller.decide(4, 0, None).decision, AdmissionDecision.DEGRADE)
+        self.assertEqual(controller.decide(0, 10, None).decision, AdmissionDecision.SHED)
+
+        stats = controller.stats()
+        self.assertEqual((stats["admitted"], stats["degraded"], stats["shed"]), (0, 2, 1))
+
+    def test_degrade_disabled_by_default(self):
+        controller = AdmissionController(max_queue_depth=10)
+        self.assertEqual(controller.decide(8, 6, None).decision, AdmissionDecision.ADMIT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Tests for LegalIntelligenceAgent generation modes.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.agent_system import LegalIntelligenceAgent
+from src.core.deadline import Deadline, DeadlineExceeded
+from src.models.legal_models import LegalScenario
+
+
+GOOD_SECTION = (
+    "## Analysis\n\n"
+    "The plaintiff's patent infringement claim shows damages of $5 million because "
+    "market share fell from 45% to 32%. Therefore the litigation risk is material.\n\n"
+    "- Revenue loss is documented in the complaint evidence\n"
+    "- Competitor growth indicates ongoing financial harm"
+)
+
+
+def make_response(text, prompt_tokens=100, output_tokens=50):
+    """Build a mock Vertex AI response."""
+    response = Mock()
+    response.text = text
+    response.usage_metadata = Mock(
+        prompt_token_count=prompt_tokens,
+        candidates_token_count=output_tokens
+    )
+    return response
+
+
+def make_agent():
+    """Create an initialized agent with a mock model and no network access."""
+    with patch.object(LegalIntelligenceAgent, "initialize_vertex_ai", return_value=False):
+        agent = LegalIntelligenceAgent("test-project")
+    agent.initialized = True
+    agent.model = Mock()
+    agent.audit_trail_path = os.path.join(tempfile.mkdtemp(), "audit_trail.json")
+    return agent
+
+
+def make_scenario(urgency="standard"):
+    return LegalScenario(
+        case_name="Test Case",
+        complaint_text="Plaintiff alleges patent infringement and lost market share.",
+        case_type="IP",
+        filing_date="2024-01-01",
+        parties_involved=["Party A", "Party B"],
+        key_issues=["Patent dispute"],
+        urgency_level=urgency
+    )
+
+
+class TestSectionFusion(unittest.TestCase):
+    """Fused mode requests all sections in one call."""
+
+    def setUp(self):
+        self.agent = make_agent()
+        self.names = [name for name, _ in LegalIntelligenceAgent.SECTION_PLAN]
+
+    def _fused_text(self, overrides=None):
+        overrides = overrides or {}
+        parts = []
+        for name in self.names:
+            parts.append(LegalIntelligenceAgent.FUSED_SECTION_MARKER.format(name=name))
+            parts.append(overrides.get(name, GOOD_SECTION))
+        return "\n".join(parts)
+
+    def test_split_fused_response(self):
+        text = "Preamble to ignore\n" + self._fused_text()
+        sections = self.agent._split_fused_response(text, self.names)
+        self.assertEqual(list(sections), self.names)
+        self.assertTrue(all(content == GOOD_SECTION for content in sections.values()))
+
+    def test_low_urgency_uses_single_call(self):
+        self.agent.model.generate_content.return_value = make_response(self._fused_text(), 400, 800)
+
+        report = self.agent.generate_complete_report(make_scenario("low"))
+
+        self.assertEqual(self.agent.model.generate_content.call_count, 1)
+        self.assertEqual([item["title"] for item in report], self.names)
+        self.assertTrue(all(item["audit"]["generation_mode"] == "fused" for item in report))
+        self.assertEqual(sum(item["metrics"].output_tokens for item in report), 800)
+
+    def test_failing_section_regenerated_individually(self):
+        fused = self._fused_text({"Risk Assessment": "Too short."})
+        self.agent.model.generate_content.side_effect = [
+            make_response(fused),
+            make_response(GOOD_SECTION),
+        ]
+
+        report = self.agent.generate_complete_report(make_scenario(), fused=True)
+
+        self.assertEqual(self.agent.model.generate_content.call_count, 2)
+        modes = {item["title"]: item["audit"]["generation_mode"] for item in report}
+        self.assertEqual(modes["Risk Assessment"], "fused_regenerated")
+        self.assertEqual(modes["Market Overview"], "fused")
+
+    def test_standard_urgency_stays_sequential(self):
+        self.agent.model.generate_content.return_value = make_response(GOOD_SECTION)
+        self.agent.generate_complete_report(make_scenario("standard"))
+        self.assertEqual(self.agent.model.generate_content.call_count, len(self.names))
+
+    def test_degraded_plan(self):
+        self.agent.model.generate_content.return_value = make_response(GOOD_SECTION)
+        report = self.agent.generate_complete_report(
+            make_scenario(), sections=["Risk Assessment"], max_output_tokens=512
+        )
+        self.assertEqual([item["title"] for item in report], ["Risk Assessment"])
+        config = self.agent.model.generate_content.call_args.kwargs["generation_config"]
+        self.assertEqual(config._raw_generation_config.max_output_tokens, 512)
+
+
+class TestModelCascade(unittest.TestCase):
+    """Sections start on the cheap tier and escalate on low quality."""
+
+    def setUp(self):
+        self.agent = make_agent()
+        self.cheap = Mock()
+        self.agent.cascade = ["gemini-2.0-flash-lite", self.agent.model_name]
+        self.agent._tier_models["gemini-2.0-flash-lite"] = self.cheap
+
+    def test_cheap_tier_accepted(self):
+        self.cheap.generate_content.return_value = make_response(GOOD_SECTION)
+
+        content, usage, cost, info = self.agent._generate_section("Risk Assessment", "patent damages")
+
+        self.assertEqual(info["model"], "gemini-2.0-flash-lite")
+        self.assertEqual(info["tier"], 0)
+        self.agent.model.generate_content.assert_not_called()
+        self.assertAlmostEqual(cost, 100 * 0.000000075 + 50 * 0.0000003)
+
+    def test_escalates_on_low_quality(self):
+        self.cheap.generate_content.return_value = make_response("Too short.")
+        self.agent.model.generate_content.return_value = make_response(GOOD_SECTION)
+
+        content, usage, cost, info = self.agent._generate_section("Risk Assessment", "patent damages")
+
+        self.assertEqual(content, GOOD_SECTION)
+        self.assertEqual(info["model"], self.agent.model_name)
+        self.assertEqual([a["model"] for a in info["attempts"]], self.agent.cascade)
+        stats = self.agent.get_cascade_stats()
+        self.assertEqual(stats["gemini-2.0-flash-lite"]["escalations"], 1)
+        self.assertEqual(stats[self.agent.model_name]["hit_ratio"], 1.0)
+
+    def test_slo_exhausted_keeps_best_output(self):
+        self.agent.section_latency_slo = 0.0
+        self.cheap.generate_content.return_value = make_response("Too short.")
+
+        content, usage, cost, info = self.agent._generate_section("Risk Assessment", "patent damages")
+
+        self.assertEqual(content, "Too short.")
+        self.assertEqual(info["model"], "gemini-2.0-flash-lite")
+        self.agent.model.generate_content.assert_not_called()
+
+    def test_audit_trail_records_tier(self):
+        self.cheap.generate_content.return_value = make_response(GOOD_SECTION)
+        report = self.agent.generate_complete_report(make_scenario())
+        self.assertTrue(all(item["audit"]["model"] == "gemini-2.0-flash-lite" for item in report))
+        self.assertEqual(self.agent.get_token_usage_stats()["output_tokens"], 50 * len(report))
+
+
+class TestOutputBudget(unittest.TestCase):
+    """Sections are capped at their learned output length."""
+
+    def setUp(self):
+        self.agent = make_agent()
+        self.agent.output_model.min_samples = 2
+
+    def test_learned_cap_and_truncation(self):
+        self.agent.model.generate_content.return_value = make_response(GOOD_SECTION, output_tokens=400)
+        for _ in range(2):
+            self.agent._generate_section("Risk Assessment", "patent damages")
+
+        truncated = make_response(GOOD_SECTION, output_tokens=500)
+        truncated.candidates = [Mock(finish_reason=Mock())]
+        truncated.candidates[0].finish_reason.name = "MAX_TOKENS"
+        self.agent.model.generate_content.return_value = truncated
+        _, _, _, info = self.agent._generate_section("Risk Assessment", "patent damages")
+
+        config = self.agent.model.generate_content.call_args.kwargs["generation_config"]
+        self.assertEqual(config._raw_generation_config.max_output_tokens, 500)
+        self.assertTrue(info["attempts"][-1]["truncated"])
+        prompt = self.agent.model.generate_content.call_args.args[0]
+        self.assertIn("Aim for about 300 words", prompt)
+        self.assertEqual(self.agent.get_output_budget_stats()["Risk Assessment"]["truncated"], 1)
+
+    def test_missing_usage_charged_template_estimate(self):
+        response = make_response(GOOD_SECTION)
+        response.usage_metadata = None
+        self.agent.model.generate_content.return_value = response
+        _, usage, cost, info = self.agent._generate_section("Risk Assessment", "patent damages",
+                                                            persona="strategic_consultant")
+
+        estimate = info["attempts"][-1]["prompt_tokens_estimate"]
+        prompt = self.agent.model.generate_content.call_args.args[0]
+        self.assertAlmostEqual(estimate, len(prompt) / 4, delta=4)
+        self.assertEqual(usage.input_tokens, estimate)
+        self.assertGreater(cost, 0)
+
+
+class TestStreamValidation(unittest.TestCase):
+    """Degenerate streams are aborted and restarted without backoff."""
+
+    def setUp(self):
+        self.agent = make_agent()
+        self.agent.stream_validation = True
+        self.closed = []
+
+    def _stream(self, chunks):
+        try:
+            for text in chunks:
+                yield make_response(text, output_tokens=0)
+        finally:
+            self.closed.append(True)
+
+    def test_loop_aborted_and_restarted(self):
+        looping = ["The claim is pending. "] * 50
+        good = [GOOD_SECTION[i:i + 40] for i in range(0, len(GOOD_SECTION), 40)]
+        self.agent.model.generate_content.side_effect = [self._stream(looping), self._stream(good)]
+
+        start = time.time()
+        content, usage, cost, info = self.agent._generate_section("Risk Assessment", "patent damages")
+
+        self.assertLess(time.time() - start, 1.0)
+        self.assertEqual(content, GOOD_SECTION)
+        self.assertTrue(info["attempts"][0]["aborted"].startswith("repetition loop"))
+        self.assertEqual(self.closed, [True, True])
+        self.assertTrue(self.agent.model.generate_content.call_args.kwargs["stream"])
+        stats = self.agent.get_stream_stats()
+        self.assertEqual((stats["streams"], stats["aborts"]), (2, 1))
+        self.assertGreater(stats["output_tokens_saved"], 0)
+
+
+class TestParagraphRepair(unittest.TestCase):
+    """Low-scoring sections get their weak paragraphs rewritten in place."""
+
+    WEAK = ("The situation is complicated and many things could happen over the coming "
+            "months in various ways for everyone involved here.")
+    FIXED = ("Because the defendant's infringement cut revenue by 13%, damages exposure "
+             "exceeds $5 million and the litigation risk is material.")
+
+    def setUp(self):
+        self.agent = make_agent()
+        self.scores = iter([0.4, 0.8])
+        real = self.agent.validator.validate_response
+        self.agent.validator.validate_response = lambda content, context="": dict(
+            real(content, context), score=next(self.scores)
+        )
+
+    def test_weak_paragraph_spliced(self):
+        original = GOOD_SECTION + "\n\n" + self.WEAK
+        self.agent.model.generate_content.side_effect = [
+            make_response(original, 100, 300),
+            make_response(self.FIXED, 60, 40),
+        ]
+
+        content, usage, cost, info = self.agent._generate_section("Risk Assessment", "patent damages")
+
+        self.assertEqual(content, GOOD_SECTION + "\n\n" + self.FIXED)
+        self.assertEqual(self.agent.model.generate_content.call_count, 2)
+        repair_prompt = self.agent.model.generate_content.call_args.args[0]
+        self.assertIn(self.WEAK, repair_prompt)
+        self.assertNotIn("Revenue loss is documented", repair_prompt.split("PARAGRAPH TO REWRITE")[1])
+        self.assertEqual(usage.output_tokens, 340)
+        self.assertEqual(info["attempts"][0]["repaired_paragraphs"], [3])
+        self.assertEqual(info["attempts"][0]["score_before_repair"], 0.4)
+        self.assertEqual(self.agent.get_repair_stats()["accepted"], 1)
+
+    def test_mostly_weak_section_regenerated_whole(self):
+        self.scores = iter([0.4, 0.9])
+        self.agent.model.generate_content.side_effect = [
+            make_response(self.WEAK + "\n\n" + self.WEAK),
+            make_response(GOOD_SECTION),
+        ]
+        self.agent._sleep = lambda seconds, deadline=None: None
+
+        content, _, _, info = self.agent._generate_section("Risk Assessment", "patent damages")
+
+        self.assertEqual(content, GOOD_SECTION)
+        self.assertEqual(self.agent.model.generate_content.call_count, 2)
+        self.assertNotIn("repaired_paragraphs", info["attempts"][0])
+        self.assertEqual(self.agent.get_repair_stats()["attempts"], 0)
+
+class TestExecutiveSummary(unittest.TestCase):
+    """The executive summary is extractive unless LLM polish is requested."""
+
+    def setUp(self):
+        self.agent = make_agent()
+        self.items = [dict(title="Risk Assessment", content=GOOD_SECTION)]
+
+    def test_extractive_makes_no_model_call(self):
+        summary, stats = self.agent.summarize_report(self.items)
+        self.assertIn("patent infringement claim", summary)
+        self.assertEqual(stats["mode"], "extractive")
+        self.agent.model.generate_content.assert_not_called()
+
+    def test_llm_polish(self):
+        self.agent.model.generate_content.return_value = make_response("Polished summary.", 80, 20)
+        summary, stats = self.agent.summarize_report(self.items, make_scenario(), mode="llm")
+        self.assertEqual(summary, "Polished summary.")
+        self.assertEqual((stats["mode"], stats["polish_tokens"]), ("llm", 100))
+
+    def test_llm_failure_keeps_extractive(self):
+        self.agent.model.generate_content.side_effect = RuntimeError("quota")
+        summary, stats = self.agent.summarize_report(self.items, mode="llm")
+        self.assertEqual(stats["mode"], "extractive")
+        self.assertTrue(summary)
+
+
+class TestDeadlines(unittest.TestCase):
+    """Generation stops at the deadline and returns completed sections."""
+
+    def setUp(self):
+        self.agent = make_agent()
+
+    def test_cancel_returns_partial_report(self):
+        deadline = Deadline(30)
+
+        def generate(*args, **kwargs):
+            if self.agent.model.generate_content.call_count == 2:
+                deadline.cancel("client disconnected")
+            return make_response(GOOD_SECTION)
+
+        self.agent.model.generate_content.side_effect = generate
+        report = self.agent.generate_complete_report(make_scenario(), deadline=deadline)
+
+        self.assertEqual([item["title"] for item in report], ["Market Overview", "Competitive Analysis"])
+        self.assertEqual(self.agent.model.generate_content.call_count, 2)
+        self.assertEqual(self.agent.report_stats["failures"], 0)
+
+    def test_slow_model_call_abandoned(self):
+        self.agent.model.generate_content.side_effect = lambda *a, **k: time.sleep(1) or make_response(GOOD_SECTION)
+        start = time.time()
+        with self.assertRaises(DeadlineExceeded):
+            self.agent._generate_section("Risk Assessment", "patent damages", deadline=Deadline(0.1))
+        self.assertLess(time.time() - start, 0.8)
+
+
+class TestIncrementalReanalysis(unittest.TestCase):
+    """Amended complaints regenerate only the sections their changes reach."""
+
+    COMPLAINT = (
+        "Plaintiff TechFlow alleges DataSync infringed its data synchronization patent.\n\n"
+        "TechFlow's market share declined from 45% to 32% after DataSync launched CloudSync Pro.\n\n"
+        "WHEREFORE, TechFlow requests damages of $10 million and a permanent injunction."
+    )
+
+    def setUp(self):
+        self.agent = make_agent()
+        self.names = [name for name, _ in LegalIntelligenceAgent.SECTION_PLAN]
+
+    def test_unchanged_complaint_affects_nothing(self):
+        affected, diff = self.agent.affected_sections(self.COMPLAINT, self.COMPLAINT.replace("\n\n", "\n  \n"))
+        self.assertEqual(affected, [])
+        self.assertEqual(diff["changed_paragraphs"], 0)
+
+    def test_damages_change_affects_later_sections_only(self):
+        amended = self.COMPLAINT.replace("$10 million", "$40 million")
+        affected, diff = self.agent.affected_sections(self.COMPLAINT, amended)
+        self.assertEqual(affected, ["Risk Assessment", "Strategic Recommendations"])
+        self.assertEqual(diff["directly_affected"], ["Risk Assessment"])
+
+    def test_untopical_change_affects_everything(self):
+        amended = self.COMPLAINT + "\n\nThe parties are located in Delaware."
+        affected, _ = self.agent.affected_sections(self.COMPLAINT, amended)
+        self.assertEqual(affected, self.names)
+
+    def test_reused_sections_keep_audit_entries(self):
+        self.agent.model.generate_content.return_value = make_response(GOOD_SECTION)
+        previous = self.agent.generate_complete_report(make_scenario())
+        reuse = {item["title"]: item for item in previous[:2]}
+        self.agent.model.generate_content.reset_mock()
+
+        report = self.agent.generate_complete_report(make_scenario(), reuse=reuse)
+
+        self.assertEqual(self.agent.model.generate_content.call_count, 2)
+        self.assertEqual([item["title"] for item in report], self.names)
+        self.assertIs(report[0]["audit"], previous[0]["audit"])
+        self.assertIsNot(report[2]["audit"], previous[2]["audit"])
+        prompt = self.agent.model.generate_content.call_args_list[0].args[0]
+        self.assertIn("--- COMPLETED SECTION: Competitive Analysis ---", prompt)
+
+
+class TestConcurrentStats(unittest.TestCase):
+    """Counters stay exact when reports are generated concurrently."""
+
+    def test_counters_under_concurrent_reports(self):
+        agent = make_agent()
+        agent.model.generate_content.return_value = make_response(GOOD_SECTION)
+        reports, sections = 8, len(LegalIntelligenceAgent.SECTION_PLAN)
+
+        threads = [threading.Thread(target=agent.generate_complete_report, args=(make_scenario(),))
+                   for _ in range(reports)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(agent.report_stats["reports"], reports)
+        usage = agent.get_token_usage_stats()
+        self.assertEqual((usage["input_tokens"], usage["output_tokens"]), (100 * reports * sections, 50 * reports * sections))
+        tier = agent.get_cascade_stats()[agent.model_name]
+        self.assertEqual(tier["attempts"], agent.model.generate_content.call_count)
+        self.assertEqual(tier["accepted"], reports * sections)
+        self.assertEqual(agent.get_success_rate(), 1.0)
+
+
+class TestLazyStartup(unittest.TestCase):
+
+    def test_sdk_not_imported_until_used(self):
+        code = (
+            "import sys; from src.core.agent_system import LegalIntelligenceAgent; "
+            "LegalIntelligenceAgent('test-project'); print('vertexai' in sys.modules)"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True)
+        self.assertEqual(result.stdout.strip(), "False", result.stderr)
+
+    def test_model_connects_once_on_first_use(self):
+        agent = make_agent()
+        agent.model = None
+        model = Mock()
+        model.generate_content.return_value = make_response(GOOD_SECTION)
+        with patch("src.core.agent_system.vertexai") as vertexai, \
+                patch("src.core.agent_system.GenerativeModel", return_value=model):
+            agent.generate_section_content("Risk Assessment", "Patent infringement context")
+            agent.generate_section_content("Risk Assessment", "Patent infringement context")
+        vertexai.init.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
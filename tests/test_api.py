@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Endpoint tests for the FastAPI application.
+
+Requests go through a TestClient against main.app with a mock model, and
+the report database and audit store in a temporary directory.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+import main
+from src.core.admission import AdmissionController
+from src.core.agent_system import LegalIntelligenceAgent
+from src.core.quality_validator import QualityValidator
+from src.models.legal_models import AnalysisReport, LegalScenario, ReportSection
+from src.prompts.personas import LegalPersonas
+from src.utils.logger import shutdown_logging
+
+
+GOOD_SECTION = (
+    "## Analysis\n\n"
+    "The plaintiff's patent infringement claim shows damages of $5 million because "
+    "market share fell from 45% to 32%. Therefore the litigation risk is material.\n\n"
+    "- Revenue loss is documented in the complaint evidence\n"
+    "- Competitor growth indicates ongoing financial harm"
+)
+
+COMPLAINT = json.loads((project_root / "test_scenarios.json").read_text())["scenarios"][0]["complaint_text"]
+
+
+def make_response(text, prompt_tokens=100, output_tokens=50):
+    """Build a mock Vertex AI response."""
+    response = Mock()
+    response.text = text
+    response.usage_metadata = Mock(prompt_token_count=prompt_tokens, candidates_token_count=output_tokens)
+    response.candidates = []
+    return response
+
+
+def make_agent(directory):
+    """Create an initialized agent with a mock model and no network access."""
+    with patch.object(LegalIntelligenceAgent, "initialize_vertex_ai", return_value=False):
+        agent = LegalIntelligenceAgent("test-project")
+    agent.initialized = True
+    agent.model = Mock()
+    agent.model.generate_content.return_value = make_response(GOOD_SECTION)
+    agent.audit_trail_path = os.path.join(directory, "audit_trail.json")
+    return agent
+
+
+def tearDownModule():
+    # main installs the application's log handler on import
+    shutdown_logging()
+
+
+class ApiTestCase(unittest.TestCase):
+    """A TestClient over fresh stores, agent and admission state."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.agent = make_agent(self.directory)
+
+        patches = [
+            patch.dict(main.CONFIG, report_db_path=os.path.join(self.directory, "reports.db"),
+                       audit_store_dir=os.path.join(self.directory, "audit_store"), dedup_mode="reuse",
+                       profiling_enabled=False, profiling_token=""),
+            patch.dict(main.system_state, initialized=True, agent=self.agent, validator=QualityValidator(),
+                       personas=LegalPersonas(), analysis_count=0, last_analysis=None),
+            patch.dict(main.dedup_outcomes),
+            patch.object(main, "report_store", None),
+            patch.object(main, "audit_store", None),
+            patch.object(main, "admission", AdmissionController()),
+        ]
+        for active in patches:
+            active.start()
+            self.addCleanup(active.stop)
+        main.duplicate_index.clear()
+        self.addCleanup(main.duplicate_index.clear)
+        self.addCleanup(self._close_store)
+        self.client = TestClient(main.app)
+
+    def _close_store(self):
+        if main.report_store is not None:
+            main.report_store.close()
+
+    def analyze(self, complaint=COMPLAINT, case_name="TechFlow v. DataSync", **fields):
+        body = dict(case_name=case_name, complaint_text=complaint, case_type="IP", **fields)
+        return self.client.post("/analyze", json=body)
+
+    @property
+    def model_calls(self):
+        return self.agent.model.generate_content.call_count
+
+
+class TestAnalyze(ApiTestCase):
+    """/analyze, /analyze/stream and /reports/{report_id}."""
+
+    def test_report_generated_stored_and_served(self):
+        response = self.analyze()
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual([s["title"] for s in report["sections"]],
+                         [name for name, _ in LegalIntelligenceAgent.SECTION_PLAN])
+        self.assertIn("X-Request-ID", response.headers)
+        self.assertFalse(report["metadata"]["deadline"]["partial"])
+
+        stored = self.client.get(f"/reports/{report['metadata']['report_id']}", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(stored.status_code, 200)
+        self.assertEqual(stored.headers["content-encoding"], "gzip")
+        self.assertEqual(stored.json(), report)
+        self.assertEqual(self.client.get("/reports/missing").status_code, 404)
+
+    def test_blob_dictionary_trained_after_the_response(self):
+        blobs = main._report_store().blobs
+        blobs.train_after = 2
+        trained = []
+        train = blobs.train
+        blobs.train = lambda *args, **kwargs: trained.append(blobs.dictionary_id) or train(*args, **kwargs)
+
+        self.assertEqual(self.analyze().status_code, 200)
+        self.assertEqual(trained, [0])
+        self.assertFalse(blobs.training_due)
+
+    def test_not_initialized(self):
+        main.system_state["initialized"] = False
+        self.assertEqual(self.analyze().status_code, 503)
+
+    def test_streamed_complaint(self):
+        response = self.client.post("/analyze/stream", params=dict(case_name="Streamed", case_type="IP"),
+                                    content=COMPLAINT.encode("utf-8"))
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual(report["scenario"]["complaint_text"], COMPLAINT)
+        self.assertEqual(report["metadata"]["ingestion"]["bytes_read"], len(COMPLAINT.encode("utf-8")))
+        self.assertTrue(report["scenario"]["parties_involved"])
+
+    def test_streamed_complaint_limits(self):
+        params = dict(case_name="Streamed", case_type="IP")
+        self.assertEqual(self.client.post("/analyze/stream", params=params, content=b"  \n").status_code, 400)
+        with patch.dict(main.CONFIG, max_complaint_bytes=100):
+            response = self.client.post("/analyze/stream", params=params, content=COMPLAINT.encode("utf-8"))
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.model_calls, 0)
+
+
+class TestNearDuplicates(ApiTestCase):
+    """Reuse of stored reports for near-identical complaints."""
+
+    def test_identical_complaint_reuses_report(self):
+        first = self.analyze().json()
+        calls = self.model_calls
+        second = self.analyze(case_name="Refiled").json()
+        self.assertEqual(self.model_calls, calls)
+        self.assertEqual(second["metadata"]["near_duplicate"],
+                         dict(report_id=first["metadata"]["report_id"], similarity=1.0, mode="reused"))
+        self.assertEqual(second["scenario"]["case_name"], "Refiled")
+        self.assertEqual(second["sections"], first["sections"])
+        # The reused report is stored under its own ID
+        stored = self.client.get(f"/reports/{second['metadata']['report_id']}").json()
+        self.assertEqual(stored["metadata"]["near_duplicate"]["mode"], "reused")
+
+    def test_store_used_off_the_event_loop(self):
+        self.analyze()
+        store = main._report_store()
+        calls = list()
+
+        def tracked(method):
+            def call(*args, **kwargs):
+                try:
+                    asyncio.get_running_loop()
+                    calls.append((method.__name__, True))
+                except RuntimeError:
+                    calls.append((method.__name__, False))
+                return method(*args, **kwargs)
+            return call
+
+        with patch.object(store, "get", tracked(store.get)), patch.object(store, "get_items", tracked(store.get_items)), \
+                patch.object(store, "put", tracked(store.put)):
+            self.assertEqual(self.analyze(case_name="Refiled").status_code, 200)
+        self.assertEqual({name for name, _ in calls}, {"get", "get_items", "put"})
+        self.assertFalse(any(on_loop for _, on_loop in calls))
+
+    def test_reuse_can_be_declined(self):
+        self.analyze()
+        calls = self.model_calls
+        report = self.analyze(allow_reuse=False).json()
+        self.assertGreater(self.model_calls, calls)
+        self.assertNotIn("near_duplicate", report["metadata"])
+
+
+class TestReports(ApiTestCase):
+    """Listing, search, keyset cursors and NDJSON streaming."""
+
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            response = self.analyze(f"{COMPLAINT}\n\nAmendment {i}.", case_name=f"Case {i}", allow_reuse=False)
+            self.assertEqual(response.status_code, 200)
+
+    def test_pages_follow_cursor(self):
+        page = self.client.get("/reports", params=dict(limit=2)).json()
+        self.assertEqual([row["case_name"] for row in page["reports"]], ["Case 2", "Case 1"])
+        rest = self.client.get("/reports", params=dict(limit=2, cursor=page["next_cursor"])).json()
+        self.assertEqual([row["case_name"] for row in rest["reports"]], ["Case 0"])
+        self.assertIsNone(rest["next_cursor"])
+
+        filtered = self.client.get("/reports", params=dict(case_name="Case 1")).json()
+        self.assertEqual(filtered["count"], 1)
+
+    def test_ndjson(self):
+        response = self.client.get("/reports", params=dict(format="ndjson"))
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([row["case_name"] for row in rows], ["Case 2", "Case 1", "Case 0"])
+
+        page = self.client.get("/reports", params=dict(limit=1)).json()
+        response = self.client.get("/reports", params=dict(format="ndjson", cursor=page["next_cursor"]))
+        self.assertEqual(len(response.text.splitlines()), 2)
+
+    def test_search(self):
+        page = self.client.get("/reports/search", params=dict(q="litigation risk", limit=2)).json()
+        self.assertEqual(page["count"], 2)
+        self.assertIsNotNone(page["next_cursor"])
+        self.assertTrue(all(hit["score"] is not None for hit in page["reports"]))
+
+        lines = self.client.get("/reports/search", params=dict(q="litigation risk", format="ndjson")).text
+        self.assertEqual(len(lines.splitlines()), 3 * len(LegalIntelligenceAgent.SECTION_PLAN))
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.get("/reports", params=dict(cursor="!!!")).status_code, 400)
+        self.assertEqual(self.client.get("/reports", params=dict(format="xml")).status_code, 400)
+        self.assertEqual(self.client.get("/reports/search", params=dict(q=" ")).status_code, 400)
+        self.assertEqual(self.client.get("/reports/search", params=dict(q="x", format="ndjson", cursor="!!!")).status_code, 400)
+
+
+class TestReanalyze(ApiTestCase):
+    """Amended complaints regenerate only the affected sections."""
+
+    def test_only_affected_sections_regenerated(self):
+        first = self.analyze().json()
+        calls = self.model_calls
+        amended = COMPLAINT + "\n\nPlaintiff now also seeks enhanced damages for willful infringement."
+        response = self.client.post("/reanalyze", json=dict(report_id=first["metadata"]["report_id"],
+                                                              complaint_text=amended))
+        self.assertEqual(response.status_code, 200)
+        reanalysis = response.json()["metadata"]["reanalysis"]
+        self.assertEqual(reanalysis["previous_report_id"], first["metadata"]["report_id"])
+        self.assertEqual(reanalysis["reused_sections"], ["Market Overview", "Competitive Analysis"])
+        self.assertEqual(reanalysis["regenerated_sections"], ["Risk Assessment", "Strategic Recommendations"])
+        self.assertEqual(self.model_calls - calls, 2)
+        self.assertEqual(response.json()["scenario"]["complaint_text"], amended)
+
+    def test_diff_runs_off_the_event_loop(self):
+        first = self.analyze().json()
+        on_loop = list()
+        affected_sections = self.agent.affected_sections
+
+        def tracked(previous_text, new_text):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return affected_sections(previous_text, new_text)
+
+        with patch.object(self.agent, "affected_sections", tracked):
+            response = self.client.post("/reanalyze", json=dict(report_id=first["metadata"]["report_id"],
+                                                                  complaint_text=COMPLAINT + "\n\nAmended."))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(on_loop, [False])
+
+    def test_unknown_report(self):
+        response = self.client.post("/reanalyze", json=dict(report_id="missing", complaint_text=COMPLAINT))
+        self.assertEqual(response.status_code, 404)
+
+
+class TestOverload(ApiTestCase):
+    """Shedding and deadlines."""
+
+    def test_shed_with_retry_after(self):
+        with patch.object(main, "admission", AdmissionController(max_model_latency=1.0, probe_interval=60)), \
+                patch.object(self.agent.hedger.tracker, "mean", return_value=10.0):
+            response = self.analyze()
+        self.assertEqual(response.status_code, 503)
+        self.assertGreaterEqual(int(response.headers["retry-after"]), 1)
+        self.assertEqual(self.model_calls, 0)
+
+    def _slow_after(self, sections, seconds):
+        """Model calls for sections after the first `sections` take `seconds`."""
+        def generate(prompt, **kwargs):
+            if not any(f"'{name}'" in prompt for name, _ in LegalIntelligenceAgent.SECTION_PLAN[:sections]):
+                time.sleep(seconds)
+            return make_response(GOOD_SECTION)
+        self.agent.model.generate_content.side_effect = generate
+
+    def test_partial_report_at_deadline(self):
+        self._slow_after(1, 1.0)
+        response = self.analyze(timeout_seconds=0.5)
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual([s["title"] for s in report["sections"]], ["Market Overview"])
+        deadline = report["metadata"]["deadline"]
+        self.assertTrue(deadline["partial"])
+        self.assertEqual((deadline["sections_completed"], deadline["sections_planned"]), (1, 4))
+        # A partial report is stored but never offered for reuse
+        self.assertEqual(main.duplicate_index.stats()["indexed"], 0)
+
+    def test_deadline_before_any_section(self):
+        self._slow_after(0, 1.0)
+        response = self.analyze(timeout_seconds=0.3)
+        self.assertEqual(response.status_code, 504)
+        self.assertIn("before any section completed", response.json()["detail"])
+
+
+class TestAnalytics(ApiTestCase):
+    """/analytics aggregates over the audit store, and /metrics."""
+
+    def test_aggregates(self):
+        self.analyze()
+        self.analyze(f"{COMPLAINT}\n\nAmended.", allow_reuse=False)
+        result = self.client.get("/analytics", params=dict(metric="cost_usd", group_by="section")).json()
+        rows = {row["section"]: row for row in result["groups"]}
+        self.assertEqual(set(rows), {name for name, _ in LegalIntelligenceAgent.SECTION_PLAN})
+        self.assertTrue(all(row["count"] == 2 for row in rows.values()))
+
+        result = self.client.get("/analytics", params=dict(group_by="", case_type="Contract")).json()
+        self.assertEqual(result["groups"], [])
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.get("/analytics", params=dict(metric="bogus")).status_code, 400)
+        self.assertEqual(self.client.get("/analytics", params=dict(group_by="nope")).status_code, 400)
+
+    def test_metrics(self):
+        self.analyze()
+        metrics = self.client.get("/metrics").json()
+        self.assertEqual(metrics["total_analyses"], 1)
+        self.assertEqual(metrics["report_store"]["reports"], 1)
+        self.assertGreater(metrics["token_usage"]["total_tokens"], 0)
+
+
+class TestReportResponse(unittest.TestCase):
+    """Large report bodies are serialized off the event loop."""
+
+    def _serialized_on_loop(self, report):
+        on_loop = list()
+        serialize = main.report_serializer.serialize
+
+        def tracked(model):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return serialize(model)
+
+        with patch.object(main.report_serializer, "serialize", tracked):
+            response = asyncio.run(main._report_response(report))
+        self.assertEqual(json.loads(response.body)["scenario"]["case_name"], report.scenario.case_name)
+        return on_loop[0]
+
+    def test_large_complaint_with_short_sections(self):
+        scenario = LegalScenario(case_name="Large", complaint_text=COMPLAINT * 2000, case_type="IP",
+                                 filing_date="2024-01-01")
+        section = ReportSection(type="risk_assessment", title="Risk Assessment", content="Short.",
+                                agent_type="strategic_consultant", quality_score=0.8, tokens_used=10,
+                                cost=0.0, timestamp="2024-01-01T00:00:00")
+        report = AnalysisReport(scenario=scenario, sections=[section], executive_summary="Short.", total_cost=0.0,
+                                total_tokens=10, processing_time=1.0, confidence_score=0.8,
+                                timestamp="2024-01-01T00:00:00")
+        self.assertGreater(len(scenario.complaint_text), main.CONFIG["serialize_offload_bytes"])
+        self.assertFalse(self._serialized_on_loop(report))
+
+        small = report.model_copy(update=dict(scenario=scenario.model_copy(update=dict(complaint_text=COMPLAINT))))
+        self.assertTrue(self._serialized_on_loop(small))
+
+
+class TestProfiling(ApiTestCase):
+    """/debug/profile endpoints."""
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(main.profiler.stop)
+
+    def test_disabled_by_default(self):
+        self.assertEqual(self.client.post("/debug/profile", json=dict()).status_code, 404)
+        self.assertEqual(self.client.get("/debug/profile/result").status_code, 404)
+
+    def test_token_required(self):
+        with patch.dict(main.CONFIG, profiling_enabled=True, profiling_token="secret"):
+            self.assertEqual(self.client.get("/debug/profile").status_code, 403)
+            response = self.client.get("/debug/profile", headers={"X-Profile-Token": "wrong"})
+            self.assertEqual(response.status_code, 403)
+
+    def test_profile_a_request(self):
+        with patch.dict(main.CONFIG, profiling_enabled=True):
+            response = self.client.post("/debug/profile", json=dict(mode="cprofile", requests=1))
+            self.assertEqual(response.status_code, 202)
+            self.assertEqual(self.client.post("/debug/profile", json=dict(requests=1)).status_code, 409)
+            self.assertEqual(self.client.get("/debug/profile/result").status_code, 409)
+
+            self.assertEqual(self.analyze().status_code, 200)
+            status = self.client.get("/debug/profile").json()
+            self.assertFalse(status["running"])
+            self.assertEqual((status["requests_profiled"], status["stop_reason"]), (1, "limit"))
+
+            result = self.client.get("/debug/profile/result", params=dict(limit=200))
+            self.assertEqual(result.status_code, 200)
+            self.assertIn("generate_complete_report", result.text)
+            self.assertEqual(self.client.get("/debug/profile/result", params=dict(format="collapsed")).status_code, 400)
+            self.assertEqual(self.client.delete("/debug/profile").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar audit store.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.audit_store import COMPACT_FANIN, AuditStore
+from src.models.legal_models import TokenUsage
+
+
+def make_records(count, now, seed=0):
+    rng = np.random.default_rng(seed)
+    sections = ["Market Overview", "Risk Assessment"]
+    models = ["gemini-2.0-flash-lite", "gemini-2.5-pro"]
+    return [
+        dict(
+            timestamp=now - float(rng.uniform(0, 60 * 86400)),
+            latency_seconds=float(rng.gamma(2.0, 2.0)),
+            total_tokens=int(rng.integers(100, 2000)),
+            cost_usd=float(rng.uniform(0, 0.01)),
+            quality_score=float(rng.uniform(0.4, 1.0)),
+            section=sections[i % 2],
+            model=models[(i // 2) % 2],
+            case_type="Contract Dispute" if i % 3 else "Intellectual Property",
+            generation_mode="sequential",
+            urgency="standard"
+        )
+        for i in range(count)
+    ]
+
+
+class TestAuditStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.now = time.time()
+        self.records = make_records(2000, self.now)
+
+    def test_grouped_percentiles_match_numpy(self):
+        store = AuditStore(self.directory, segment_size=700)
+        store.append(self.records)
+        since = self.now - 30 * 86400
+
+        result = store.aggregate("latency_seconds", ["section", "model"], since=since, percentiles=[50, 95])
+
+        expected = [
+            r["latency_seconds"] for r in self.records
+            if r["section"] == "Risk Assessment" and r["model"] == "gemini-2.5-pro" and r["timestamp"] >= since
+        ]
+        group = next(g for g in result["groups"]
+                     if g["section"] == "Risk Assessment" and g["model"] == "gemini-2.5-pro")
+        self.assertEqual(group["count"], len(expected))
+        self.assertAlmostEqual(group["mean"], float(np.mean(np.float32(expected))), places=4)
+        self.assertAlmostEqual(group["p95"], float(np.percentile(np.float32(expected), 95)), places=4)
+        self.assertEqual(result["records"], sum(g["count"] for g in result["groups"]))
+        self.assertEqual(len(result["groups"]), 4)
+
+    def test_filters_and_overall_group(self):
+        store = AuditStore(self.directory)
+        store.append(self.records)
+
+        result = store.aggregate("cost_usd", [], filters={"case_type": "Intellectual Property"})
+        expected = [r["cost_usd"] for r in self.records if r["case_type"] == "Intellectual Property"]
+        self.assertEqual(len(result["groups"]), 1)
+        self.assertAlmostEqual(result["groups"][0]["sum"], sum(expected), places=5)
+        self.assertEqual(store.aggregate("cost_usd", [], filters={"model": "unknown"})["groups"], [])
+
+    def test_segments_persist_and_reload(self):
+        store = AuditStore(self.directory, segment_size=500)
+        store.append(self.records[:600])
+        store.append(self.records[600:1200])
+        self.assertEqual(store.stats()["segments"], 2)
+        store.flush()
+
+        reopened = AuditStore(self.directory)
+        self.assertEqual(reopened.stats()["stored_records"], 1200)
+        reopened.append(self.records[1200:])
+        counts = {g["case_type"]: g["count"] for g in reopened.aggregate("total_tokens", ["case_type"])["groups"]}
+        self.assertEqual(sum(counts.values()), 2000)
+        reopened.flush()
+        with open(os.path.join(self.directory, "manifest.json")) as f:
+            self.assertEqual(len(json.load(f)["segments"]), 3)
+
+    def test_time_range_skips_old_segments(self):
+        store = AuditStore(self.directory)
+        old = [dict(r, timestamp=self.now - 90 * 86400) for r in self.records[:100]]
+        store.append(old)
+        store.flush()
+        store.append(self.records[100:200])
+        store.flush()
+
+        with patch.object(store, "_segment", wraps=store._segment) as segment:
+            result = store.aggregate("latency_seconds", ["section"], since=self.now - 61 * 86400)
+        self.assertEqual(segment.call_count, 1)
+        self.assertEqual(result["records"], 100)
+
+    def test_small_segments_are_compacted(self):
+        store = AuditStore(self.directory, segment_size=1000)
+        for record in self.records[:50]:
+            store.append([record])
+            store.flush()
+        stats = store.stats()
+        self.assertLess(stats["segments"], COMPACT_FANIN)
+        self.assertEqual(stats["stored_records"], 50)
+        self.assertGreater(stats["compactions"], 0)
+        segment_dirs = [name for name in os.listdir(self.directory) if name.startswith("segment-")]
+        self.assertEqual(len(segment_dirs), stats["segments"])
+
+        fds_before = len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else None
+        result = store.aggregate("total_tokens", [])
+        self.assertEqual(result["groups"][0]["sum"], sum(r["total_tokens"] for r in self.records[:50]))
+        if fds_before is not None:
+            # Only the queried columns of the few remaining segments are mapped
+            self.assertLessEqual(len(os.listdir("/proc/self/fd")) - fds_before, 2 * COMPACT_FANIN)
+
+        reopened = AuditStore(self.directory)
+        self.assertEqual(reopened.aggregate("total_tokens", [])["groups"][0]["sum"], result["groups"][0]["sum"])
+
+    def test_mapped_columns_are_bounded(self):
+        store = AuditStore(self.directory, segment_size=10)
+        for start in range(0, 200, 10):
+            store.append(self.records[start:start + 10])
+        self.assertEqual(store.stats()["segments"], 20)
+        with patch("src.core.audit_store.MAX_MAPPED_COLUMNS", 6):
+            store.aggregate("latency_seconds", ["section", "model"])
+        self.assertLessEqual(store.stats()["mapped_columns"], 6)
+
+    def test_append_report_items(self):
+        store = AuditStore(self.directory)
+        items = [dict(
+            title="Risk Assessment",
+            metrics=TokenUsage(input_tokens=100, output_tokens=50, total_tokens=150),
+            audit=dict(timestamp="2024-01-01T00:00:00", latency_seconds=2.5, cost_usd=0.001,
+                       quality_score=0.8, model="gemini-2.0-flash", generation_mode="sequential")
+        )]
+        self.assertEqual(store.append_report(items, "Intellectual Property", "HIGH"), 1)
+        group = store.aggregate("output_tokens", ["model", "urgency"])["groups"][0]
+        self.assertEqual((group["model"], group["urgency"], group["sum"]), ("gemini-2.0-flash", "high", 50))
+
+    def test_rejects_unknown_columns(self):
+        store = AuditStore(self.directory)
+        with self.assertRaises(ValueError):
+            store.aggregate("bogus")
+        with self.assertRaises(ValueError):
+            store.aggregate("cost_usd", ["client"])
+        with self.assertRaises(ValueError):
+            store.aggregate("cost_usd", percentiles=[150])
+
+
+if __name__ == "__main__":
+    unittest.main()
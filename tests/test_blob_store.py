@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed blob store.
+"""
+
+import sqlite3
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.blob_store import BlobStore, content_hash, train_dictionary
+
+
+SECTION = (
+    "## Risk Assessment\n\n"
+    "The plaintiff's patent infringement claim exposes the defendant to damages of {amount} "
+    "because market share fell from 45% to 32% after the product launch.\n\n"
+    "- Willful infringement may support enhanced damages\n"
+    "- A preliminary injunction would halt further sales"
+)
+
+
+class TestBlobStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = BlobStore(sqlite3.connect(":memory:"), train_after=1000)
+
+    def test_round_trip_and_dedup(self):
+        text = SECTION.format(amount="$5 million")
+        key = self.store.put(text)
+        self.assertEqual(key, content_hash(text))
+        self.assertEqual(self.store.put(text), key)
+        self.assertEqual(self.store.get(key), text)
+        self.assertIsNone(self.store.get(content_hash("missing")))
+
+        stats = self.store.stats()
+        self.assertEqual((stats["blobs"], stats["writes"], stats["dedup_hits"]), (1, 1, 1))
+        self.assertGreater(stats["compression_ratio"], 1.0)
+
+    def test_dictionary_shrinks_similar_texts(self):
+        for n in range(20):
+            self.store.put(SECTION.format(amount=f"${n} million"))
+        plain = self.store.stats()["stored_bytes"] / 20
+
+        dict_id = self.store.train()
+        self.assertEqual(self.store.dictionary_id, dict_id)
+        keys = [self.store.put(SECTION.format(amount=f"${n} billion")) for n in range(20)]
+        trained = (self.store.stats()["stored_bytes"] - plain * 20) / 20
+
+        self.assertLess(trained, plain / 2)
+        # Blobs from before and after training both decode
+        self.assertEqual(self.store.get(keys[3]), SECTION.format(amount="$3 billion"))
+        self.assertEqual(self.store.get(content_hash(SECTION.format(amount="$3 million"))), SECTION.format(amount="$3 million"))
+
+    def test_training_due_but_never_run_by_put(self):
+        conn = sqlite3.connect(":memory:")
+        store = BlobStore(conn, train_after=5)
+        for n in range(5):
+            store.put(SECTION.format(amount=f"${n} million"))
+        self.assertEqual(store.dictionary_id, 0)
+        self.assertTrue(store.training_due)
+
+        self.assertEqual(store.train(), 1)
+        self.assertFalse(store.training_due)
+        key = store.put(SECTION.format(amount="$9 million"))
+
+        reopened = BlobStore(conn, train_after=5)
+        self.assertEqual(reopened.get(key), SECTION.format(amount="$9 million"))
+        # Blobs written with the newest dictionary count towards the next training
+        for n in range(4):
+            reopened.put(SECTION.format(amount=f"${n} thousand"))
+        self.assertTrue(reopened.training_due)
+        self.assertEqual(reopened.train(), 2)
+
+    def test_training_sample_capped_in_bytes(self):
+        large = " ".join(SECTION.format(amount=f"${n} trillion") for n in range(2000))
+        self.store.put(large)
+        for n in range(3):
+            self.store.put(SECTION.format(amount=f"${n} million"))
+        fetched = []
+        get = self.store.get
+        self.store.get = lambda key: fetched.append(key) or get(key)
+
+        self.store.train(max_bytes=len(large) - 1)
+        self.assertEqual(len(fetched), 3)
+        self.assertNotIn(content_hash(large), fetched)
+
+    def test_dictionary_keeps_shared_phrases_only(self):
+        dictionary = train_dictionary(["alpha beta gamma delta epsilon", "alpha beta gamma delta zeta", "unrelated text"])
+        self.assertIn(b"alpha beta gamma delta", dictionary)
+        self.assertNotIn(b"unrelated", dictionary)
+        self.assertEqual(train_dictionary(["one two three four", "five six seven eight"]), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
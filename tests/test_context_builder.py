@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the chained-context builder.
+"""
+
+import hashlib
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.context_builder import ChainedContext, context_segments
+from src.core.quality_validator import QualityValidator
+from src.core.semantic_scorer import SemanticGroundednessScorer
+
+
+def build(sections=3):
+    context = ChainedContext("Alpha v. Beta: patent infringement complaint", "Hearing scheduled")
+    text = "SCENARIO:\nAlpha v. Beta: patent infringement complaint\n\nADDITIONAL CONTEXT:\nHearing scheduled"
+    for n in range(sections):
+        content = f"Section {n} discusses willful infringement damages and injunction strategy."
+        context.add_section(f"Section {n}", content)
+        text += f"\n\n--- COMPLETED SECTION: Section {n} ---\n{content}"
+    return context, text
+
+
+class TestChainedContext(unittest.TestCase):
+
+    def test_renders_same_text_as_concatenation(self):
+        context, text = build()
+        self.assertEqual(str(context), text)
+        self.assertEqual(f"{context}", text)
+        self.assertEqual(len(context), len(text))
+        self.assertEqual(context.render_into("<", ">"), f"<{text}>")
+        self.assertEqual("".join(context_segments(context)), text)
+        self.assertEqual(context_segments("plain"), ("plain",))
+
+    def test_render_cached_until_append(self):
+        context, _ = build()
+        self.assertIs(context.render(), context.render())
+        before = context.render()
+        context.add_section("Extra", "More analysis.")
+        self.assertTrue(context.render().startswith(before))
+        self.assertEqual(len(context.render()), len(context))
+
+    def test_prefix_slices_read_leading_segments(self):
+        context, text = build()
+        for n in (0, 10, 95, 120, 300, 10000):
+            self.assertEqual(context[:n], text[:n])
+        self.assertEqual(context[5:20], text[5:20])
+        self.assertEqual(context[-10:], text[-10:])
+
+    def test_digest_tracks_content(self):
+        first, _ = build()
+        second, _ = build()
+        self.assertEqual(first.digest, second.digest)
+        second.add_section("Extra", "More analysis.")
+        self.assertNotEqual(first.digest, second.digest)
+        self.assertEqual(first.segment_hashes[0], hashlib.sha1(first.segments[0].encode("utf-8")).hexdigest())
+
+    def test_validators_match_plain_string_scores(self):
+        context, text = build()
+        content = "Willful infringement shows damages of $5 million, therefore an injunction is likely."
+        self.assertEqual(context.distinct_words(5), {w for w in text.lower().split() if len(w) > 5})
+        validator = QualityValidator()
+        self.assertEqual(validator.calculate_groundedness_score(content, context),
+                         validator.calculate_groundedness_score(content, text))
+        scorer = SemanticGroundednessScorer()
+        self.assertEqual(scorer.score(content, context)["score"], scorer.score(content, text)["score"])
+
+
+if __name__ == "__main__":
+    unittest.main()
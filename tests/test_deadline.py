@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for request deadlines.
+"""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.deadline import Deadline, DeadlineExceeded
+
+
+class TestDeadline(unittest.TestCase):
+
+    def test_unbounded(self):
+        deadline = Deadline()
+        self.assertIsNone(deadline.remaining())
+        self.assertFalse(deadline.expired)
+        deadline.check()
+
+    def test_expiry(self):
+        deadline = Deadline(0.01)
+        time.sleep(0.02)
+        self.assertTrue(deadline.expired)
+        with self.assertRaises(DeadlineExceeded):
+            deadline.check()
+        self.assertEqual(deadline.summary()["reason"], "timeout")
+
+    def test_sleep_is_capped_by_deadline(self):
+        deadline = Deadline(0.05)
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceeded):
+            deadline.sleep(5)
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_cancel_wakes_sleep(self):
+        deadline = Deadline(10)
+        threading.Timer(0.05, deadline.cancel, args=("client disconnected",)).start()
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceeded) as ctx:
+            deadline.sleep(5)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertIn("client disconnected", str(ctx.exception))
+        self.assertEqual(deadline.remaining(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
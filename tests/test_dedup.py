@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for near-duplicate complaint detection and the report store.
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.dedup import MinHasher, NearDuplicateIndex
+from src.core.report_store import ReportStore, new_report_id
+
+
+def load_complaints():
+    with open(project_root / "test_scenarios.json") as f:
+        return [scenario["complaint_text"] for scenario in json.load(f)["scenarios"]]
+
+
+class TestMinHasher(unittest.TestCase):
+
+    def test_signature_is_deterministic(self):
+        text = load_complaints()[0]
+        self.assertTrue((MinHasher().signature(text) == MinHasher().signature(text)).all())
+
+    def test_short_and_empty_text(self):
+        hasher = MinHasher(shingle_size=5)
+        self.assertEqual(len(hasher.shingles("two words")), 1)
+        self.assertEqual(len(hasher.shingles("")), 0)
+        self.assertEqual(len(hasher.signature("")), hasher.num_perm)
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.complaints = load_complaints()
+        self.index = NearDuplicateIndex(threshold=0.8)
+        for position, complaint in enumerate(self.complaints):
+            self.index.add(f"report-{position}", complaint)
+
+    def test_identical_complaint_matches(self):
+        matches = self.index.query(self.complaints[0])
+        self.assertEqual(matches[0], ("report-0", 1.0))
+
+    def test_amended_complaint_matches(self):
+        amended = self.complaints[0].replace("DataSync Corporation", "DataSync Holdings LLC", 1)
+        amended += "\n\nPlaintiff further alleges continued sales after the filing of the original complaint."
+        matches = self.index.query(amended)
+        self.assertEqual(matches[0][0], "report-0")
+        self.assertGreaterEqual(matches[0][1], 0.8)
+        self.assertLess(matches[0][1], 1.0)
+
+    def test_unrelated_complaint_does_not_match(self):
+        text = "Buyer alleges the seller delivered nonconforming goods under a supply contract governed by Ohio law."
+        self.assertEqual(self.index.query(text), [])
+
+    def test_eviction_and_replacement(self):
+        index = NearDuplicateIndex(max_entries=1)
+        index.add("old", self.complaints[0])
+        index.add("new", self.complaints[1])
+        self.assertEqual(index.query(self.complaints[0]), [])
+        index.add("new", self.complaints[0])
+        self.assertEqual(index.query(self.complaints[0])[0][0], "new")
+        self.assertEqual(index.stats()["indexed"], 1)
+
+    def test_bands_must_divide_signature(self):
+        with self.assertRaises(ValueError):
+            NearDuplicateIndex(bands=10, num_perm=128)
+
+
+class TestReportStore(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        store = ReportStore(max_reports=2)
+        store.put("a", "report a")
+        store.put("b", "report b")
+        store.get("a")
+        store.put("c", "report c")
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(store.get("a"), "report a")
+        self.assertEqual(len(store), 2)
+
+    def test_items_follow_their_report(self):
+        store = ReportStore(max_reports=1)
+        store.put("a", "report a", [{"title": "Market Overview"}])
+        self.assertEqual(store.get_items("a"), [{"title": "Market Overview"}])
+        store.put("b", "report b")
+        self.assertEqual(store.get_items("a"), [])
+        self.assertEqual(store.get_items("b"), [])
+
+    def test_report_ids_are_unique(self):
+        self.assertNotEqual(new_report_id(), new_report_id())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass legal entity and issue extractor.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.extractor import (
+    DEFAULT_ISSUES,
+    DEFAULT_PARTIES,
+    extract_key_issues,
+    extract_parties,
+    normalize_case_type
+)
+from src.models.legal_models import CaseType
+
+
+class TestCaseTypeNormalization(unittest.TestCase):
+    """Free-form case types resolve to CaseType members."""
+
+    def test_values_names_and_aliases(self):
+        self.assertEqual(normalize_case_type("IP"), CaseType.INTELLECTUAL_PROPERTY)
+        self.assertEqual(normalize_case_type("INTELLECTUAL_PROPERTY"), CaseType.INTELLECTUAL_PROPERTY)
+        self.assertEqual(normalize_case_type("Intellectual Property"), CaseType.INTELLECTUAL_PROPERTY)
+        self.assertEqual(normalize_case_type("breach of contract"), CaseType.CONTRACT)
+        self.assertEqual(normalize_case_type(CaseType.ANTITRUST), CaseType.ANTITRUST)
+        self.assertEqual(normalize_case_type("Employment/Labor"), CaseType.EMPLOYMENT)
+        self.assertEqual(normalize_case_type("maritime"), CaseType.OTHER)
+        self.assertEqual(normalize_case_type(None), CaseType.OTHER)
+
+
+class TestIssueExtraction(unittest.TestCase):
+    """Issue terms are matched in one pass with word boundaries."""
+
+    def test_ip_terms_with_inflections(self):
+        text = "Defendant infringed two Patents and misappropriated trade secrets."
+        issues = extract_key_issues(text, "IP")
+        self.assertEqual(issues[:2], ["Patent dispute", "Trade Secret dispute"])
+        self.assertIn("Infringement dispute", issues)
+        self.assertIn("Misappropriation claim", issues)
+
+    def test_word_boundaries(self):
+        """Short terms do not match inside longer words."""
+        issues = extract_key_issues("Section 4 of the agreement was never executed.", "Regulatory")
+        self.assertEqual(issues, DEFAULT_ISSUES)
+
+    def test_multiword_terms_across_whitespace(self):
+        issues = extract_key_issues("Acme engaged in price\n   fixing and Bid Rigging.", CaseType.ANTITRUST)
+        self.assertEqual(issues, ["Price fixing", "Bid rigging"])
+
+    def test_other_case_type_uses_full_taxonomy(self):
+        issues = extract_key_issues("Claims of harassment and a patent dispute.", "Other")
+        self.assertIn("Patent dispute", issues)
+        self.assertIn("Harassment claim", issues)
+
+
+class TestPartyExtraction(unittest.TestCase):
+    """Party names are matched across the whole document."""
+
+    def test_role_prefixed_names(self):
+        text = (
+            "Plaintiff MediTech Solutions LLC ('MediTech') alleges against "
+            "Defendant HealthStream Analytics Inc. ('HealthStream') as follows:"
+        )
+        self.assertEqual(extract_parties(text), ["MediTech Solutions LLC", "HealthStream Analytics Inc."])
+
+    def test_caption_and_late_mentions(self):
+        text = "\n" * 50 + "ACME CORP.,\n    Plaintiff,\nv.\nGLOBEX LLC,\n    Defendant.\n" \
+               "Defendant Globex's conduct was willful."
+        self.assertEqual(extract_parties(text), ["ACME CORP.", "GLOBEX LLC"])
+
+    def test_defaults_when_no_parties(self):
+        self.assertEqual(extract_parties("No named parties here."), DEFAULT_PARTIES)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for hedged model calls.
+"""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.hedging import HedgedCaller, LatencyTracker, RequestCancelled
+
+
+def warm(caller, key, seconds=0.01, samples=5):
+    for _ in range(samples):
+        caller.tracker.record(key, seconds)
+
+
+class TestLatencyTracker(unittest.TestCase):
+
+    def test_percentile_requires_samples(self):
+        tracker = LatencyTracker(min_samples=3)
+        tracker.record("a", 1.0)
+        self.assertIsNone(tracker.percentile("a", 95))
+        tracker.record("a", 2.0)
+        tracker.record("a", 3.0)
+        self.assertEqual(tracker.percentile("a", 95), 3.0)
+        self.assertEqual(tracker.percentile("a", 50), 2.0)
+        self.assertIsNone(tracker.percentile("b", 95))
+
+    def test_mean_over_recent_window(self):
+        tracker = LatencyTracker()
+        with patch("src.core.hedging.time.monotonic", return_value=100.0):
+            tracker.record("a", 40.0)
+        with patch("src.core.hedging.time.monotonic", return_value=150.0):
+            tracker.record("b", 2.0)
+            self.assertEqual(tracker.mean(), 21.0)
+            self.assertEqual(tracker.mean(max_age=30), 2.0)
+            self.assertIsNone(tracker.mean("a", max_age=30))
+        with patch("src.core.hedging.time.monotonic", return_value=500.0):
+            # No calls in the window: stale, not stuck at the last mean
+            self.assertIsNone(tracker.mean(max_age=60))
+
+
+class TestHedgedCaller(unittest.TestCase):
+
+    def test_cold_key_calls_directly(self):
+        caller = HedgedCaller(min_samples=5)
+        self.assertEqual(caller.call("a", lambda: threading.current_thread().name), threading.current_thread().name)
+        self.assertEqual(caller.stats()["hedged"], 0)
+
+    def test_hedge_wins_over_slow_primary(self):
+        caller = HedgedCaller(budget=1.0, min_samples=5)
+        warm(caller, "a")
+        calls = []
+
+        def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.5)
+                return "primary"
+            return "hedge"
+
+        start = time.time()
+        self.assertEqual(caller.call("a", fn), "hedge")
+        self.assertLess(time.time() - start, 0.4)
+        stats = caller.stats()
+        self.assertEqual((stats["hedged"], stats["hedge_wins"], stats["hedge_losses"]), (1, 1, 0))
+
+    def test_losing_stream_stops_reading(self):
+        caller = HedgedCaller(budget=1.0, min_samples=5)
+        warm(caller, "a")
+        chunks_read = []
+        primary_done = threading.Event()
+
+        def stream(cancel):
+            index = len(chunks_read)
+            chunks_read.append(0)
+            try:
+                # The primary streams slowly; the hedge finishes at once
+                for _ in range(50 if index == 0 else 1):
+                    if index == 0:
+                        time.sleep(0.02)
+                    chunks_read[index] += 1
+                    if cancel.is_set():
+                        raise RequestCancelled("no longer needed")
+                return "primary" if index == 0 else "hedge"
+            finally:
+                if index == 0:
+                    primary_done.set()
+
+        self.assertEqual(caller.call("a", stream, cancellable=True), "hedge")
+        self.assertTrue(primary_done.wait(1.0))
+        self.assertLess(chunks_read[0], 10)
+        self.assertEqual(caller.stats()["cancelled"], 1)
+
+    def test_abandoned_stream_is_cancelled(self):
+        caller = HedgedCaller(percentile=0)
+        stopped = threading.Event()
+
+        def stream(cancel):
+            while not cancel.wait(0.01):
+                pass
+            stopped.set()
+            raise RequestCancelled("abandoned")
+
+        with self.assertRaises(TimeoutError):
+            caller.call("a", stream, timeout=0.05, cancellable=True)
+        self.assertTrue(stopped.wait(1.0))
+
+    def test_budget_limits_hedges(self):
+        caller = HedgedCaller(budget=0.0, min_samples=5)
+        warm(caller, "a")
+
+        def slow():
+            time.sleep(0.05)
+            return "done"
+
+        self.assertEqual(caller.call("a", slow), "done")
+        stats = caller.stats()
+        self.assertEqual(stats["hedged"], 0)
+        self.assertEqual(stats["budget_denied"], 1)
+
+    def test_failed_request_falls_back_to_other(self):
+        caller = HedgedCaller(budget=1.0, min_samples=5)
+        warm(caller, "a")
+        calls = []
+
+        def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                raise RuntimeError("primary failed")
+            time.sleep(0.1)
+            return "hedge"
+
+        self.assertEqual(caller.call("a", fn), "hedge")
+
+    def test_disabled(self):
+        caller = HedgedCaller(percentile=0, min_samples=1)
+        warm(caller, "a")
+        self.assertEqual(caller.call("a", lambda: "ok"), "ok")
+        self.assertEqual(caller.stats()["hedged"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
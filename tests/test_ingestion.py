@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming complaint ingestion.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.ingestion import ComplaintIngestor, ComplaintTooLargeError
+
+
+COMPLAINT = (
+    "COMPLAINT FOR PATENT INFRINGEMENT\n\n"
+    "Plaintiff TechFlow brings this action against Defendant DataSync Corporation.\n\n"
+    "DataSync infringes the '456 patent and misappropriated a trade\nsecret.\n"
+)
+
+
+class TestComplaintIngestor(unittest.TestCase):
+    """Incremental ingestion matches whole-document extraction."""
+
+    def _ingest(self, data, chunk_size, **kwargs):
+        ingestor = ComplaintIngestor(case_type="IP", **kwargs)
+        for i in range(0, len(data), chunk_size):
+            ingestor.feed(data[i:i + chunk_size])
+        return ingestor.close()
+
+    def test_chunk_boundaries_do_not_change_result(self):
+        """Terms and lines split across byte chunks are still found."""
+        data = COMPLAINT.encode("utf-8")
+        whole = self._ingest(data, len(data))
+        split = self._ingest(data, 3)
+
+        self.assertEqual(split.text, COMPLAINT)
+        self.assertEqual(split.parties, whole.parties)
+        self.assertEqual(split.issues, whole.issues)
+        self.assertIn("Trade Secret dispute", split.issues)
+        self.assertEqual(split.parties, ["TechFlow", "DataSync Corporation"])
+
+    def test_multibyte_characters_across_chunks(self):
+        """UTF-8 sequences split between chunks decode correctly."""
+        text = "Plaintiff Société Générale alleges breach — damages of €5M.\n"
+        result = self._ingest(text.encode("utf-8"), 1)
+        self.assertEqual(result.text, text)
+
+    def test_chunks_cover_document(self):
+        """Recorded chunk offsets cover the text contiguously."""
+        result = self._ingest(COMPLAINT.encode("utf-8"), 16, chunk_chars=40)
+        self.assertEqual(result.chunks[0][0], 0)
+        self.assertEqual(result.chunks[-1][1], len(result.text))
+        for (_, end), (start, _) in zip(result.chunks, result.chunks[1:]):
+            self.assertEqual(end, start)
+
+    def test_memory_cap_enforced(self):
+        """Uploads beyond the cap are rejected while streaming."""
+        with self.assertRaises(ComplaintTooLargeError):
+            self._ingest(COMPLAINT.encode("utf-8") * 10, 64, max_bytes=100)
+
+    def test_peak_tracking(self):
+        """Peak buffer accounting reflects the retained text."""
+        result = self._ingest(COMPLAINT.encode("utf-8"), 8)
+        self.assertGreaterEqual(result.peak_chars, len(COMPLAINT))
+        self.assertEqual(result.stats()["bytes_read"], len(COMPLAINT.encode("utf-8")))
+
+    def test_long_line_without_newlines(self):
+        """A long unterminated line is kept in parts, then processed whole."""
+        line = "Plaintiff TechFlow alleges that DataSync infringes the patent. " * 2000
+        result = self._ingest((line + "\nDamages follow.").encode("utf-8"), 64)
+        self.assertEqual(result.text, line + "\nDamages follow.")
+        self.assertIn("Patent dispute", result.issues)
+        self.assertLessEqual(result.peak_chars, 2 * len(result.text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Tests for structured, queue-based logging.
+"""
+
+import io
+import json
+import logging
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.logger import (
+    ContextFilter,
+    JsonFormatter,
+    SamplingFilter,
+    configure_logging,
+    log_context,
+    logging_stats,
+    set_log_context,
+    shutdown_logging
+)
+
+
+def make_record(message="hello", level=logging.INFO, **extra):
+    record = logging.LogRecord("test", level, __file__, 1, message, None, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+class TestContext(unittest.TestCase):
+    """Request ID and section binding."""
+
+    def test_log_context_binds_and_restores(self):
+        context_filter = ContextFilter()
+        with log_context(request_id="req-1", section="Case Summary"):
+            record = make_record()
+            context_filter.filter(record)
+        self.assertEqual((record.request_id, record.section), ("req-1", "Case Summary"))
+
+        record = make_record()
+        context_filter.filter(record)
+        self.assertIsNone(record.request_id)
+        self.assertIsNone(record.section)
+
+    def test_explicit_fields_win(self):
+        with log_context(section="Bound"):
+            record = make_record(section="Explicit")
+            ContextFilter().filter(record)
+        self.assertEqual(record.section, "Explicit")
+
+    def test_context_is_per_thread(self):
+        seen = dict()
+
+        def worker():
+            set_log_context(request_id="worker")
+            seen["worker"] = make_record()
+            ContextFilter().filter(seen["worker"])
+
+        with log_context(request_id="main"):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+            record = make_record()
+            ContextFilter().filter(record)
+        self.assertEqual(seen["worker"].request_id, "worker")
+        self.assertEqual(record.request_id, "main")
+
+
+class TestJsonFormatter(unittest.TestCase):
+    """One JSON object per record."""
+
+    def test_fields_and_extras(self):
+        record = make_record("Section generated", request_id="req-2", section="Risk", latency_seconds=1.5, sample=True)
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertEqual(entry["message"], "Section generated")
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(entry["request_id"], "req-2")
+        self.assertEqual(entry["section"], "Risk")
+        self.assertEqual(entry["latency_seconds"], 1.5)
+        self.assertNotIn("sample", entry)
+        self.assertNotIn("lineno", entry)
+
+    def test_exception_included(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord("test", logging.ERROR, __file__, 1, "failed", None, sys.exc_info())
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertIn("ValueError: boom", entry["exception"])
+
+
+class TestSamplingFilter(unittest.TestCase):
+    """Rate limiting of per-section INFO logs."""
+
+    def test_unmarked_records_always_pass(self):
+        sampler = SamplingFilter(max_per_second=0, sample_rate=0)
+        self.assertTrue(all(sampler.filter(make_record()) for _ in range(100)))
+        self.assertEqual(sampler.dropped, 0)
+
+    def test_warnings_always_pass(self):
+        sampler = SamplingFilter(max_per_second=0, sample_rate=0)
+        self.assertTrue(sampler.filter(make_record(level=logging.WARNING, sample=True)))
+
+    def test_limit_then_sample(self):
+        sampler = SamplingFilter(max_per_second=10, sample_rate=0.1)
+        with patch("src.utils.logger.time.monotonic", return_value=100.0):
+            kept = sum(sampler.filter(make_record(sample=True)) for _ in range(110))
+        # 10 within the limit, then 1 in 10 of the remaining 100
+        self.assertEqual(kept, 20)
+        self.assertEqual(sampler.dropped, 90)
+
+    def test_window_resets(self):
+        sampler = SamplingFilter(max_per_second=1, sample_rate=0)
+        with patch("src.utils.logger.time.monotonic", return_value=100.0):
+            self.assertTrue(sampler.filter(make_record(sample=True)))
+            self.assertFalse(sampler.filter(make_record(sample=True)))
+        with patch("src.utils.logger.time.monotonic", return_value=101.0):
+            self.assertTrue(sampler.filter(make_record(sample=True)))
+
+
+class TestConfigureLogging(unittest.TestCase):
+    """Async (queue listener) and synchronous modes."""
+
+    def tearDown(self):
+        shutdown_logging()
+
+    def _run(self, async_mode):
+        stream = io.StringIO()
+        with patch("src.utils.logger.sys.stdout", stream):
+            configure_logging("INFO", json_format=True, async_mode=async_mode, max_per_second=1, sample_rate=0)
+            logger = logging.getLogger("test-logger")
+            with log_context(request_id="req-3", section="Strategy"):
+                logger.info("first", extra=dict(sample=True, latency_seconds=0.25))
+                logger.info("second", extra=dict(sample=True))
+                logger.debug("hidden")
+            stats = logging_stats()
+            shutdown_logging()
+        return [json.loads(line) for line in stream.getvalue().splitlines()], stats
+
+    def test_async_mode_writes_on_listener(self):
+        entries, stats = self._run(async_mode=True)
+        self.assertTrue(stats["async_mode"])
+        self.assertEqual([entry["message"] for entry in entries], ["first"])
+        self.assertEqual(entries[0]["request_id"], "req-3")
+        self.assertEqual(entries[0]["section"], "Strategy")
+        self.assertEqual(entries[0]["latency_seconds"], 0.25)
+        self.assertEqual(stats["sampled_dropped"], 1)
+
+    def _log_exception(self, json_format):
+        stream = io.StringIO()
+        with patch("src.utils.logger.sys.stdout", stream):
+            configure_logging("INFO", json_format=json_format, async_mode=True)
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logging.getLogger("test-logger").exception("failed %s", "section")
+            shutdown_logging()
+        return stream.getvalue()
+
+    def test_async_mode_keeps_exception(self):
+        entry = json.loads(self._log_exception(json_format=True))
+        self.assertEqual(entry["message"], "failed section")
+        self.assertIn("ValueError: boom", entry["exception"])
+        self.assertIn("Traceback", entry["exception"])
+
+    def test_async_text_mode_keeps_traceback(self):
+        output = self._log_exception(json_format=False)
+        self.assertIn("failed section\nTraceback", output)
+        self.assertEqual(output.count("ValueError: boom"), 1)
+
+    def test_sync_mode(self):
+        entries, stats = self._run(async_mode=False)
+        self.assertFalse(stats["async_mode"])
+        self.assertEqual([entry["message"] for entry in entries], ["first"])
+        self.assertEqual(entries[0]["request_id"], "req-3")
+
+    def test_reconfiguring_replaces_handler(self):
+        root = logging.getLogger()
+        before = len(root.handlers)
+        configure_logging("INFO", async_mode=True)
+        configure_logging("INFO", async_mode=True)
+        self.assertEqual(len(root.handlers), before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for adaptive output token budgets.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.output_budget import OutputLengthModel
+
+
+class TestOutputLengthModel(unittest.TestCase):
+
+    def test_default_until_enough_samples(self):
+        model = OutputLengthModel(min_samples=3, max_tokens=2048)
+        model.record("Risk Assessment", 400)
+        self.assertEqual(model.max_output_tokens("Risk Assessment"), 2048)
+        self.assertIsNone(model.length_hint("Risk Assessment"))
+
+    def test_budget_follows_percentile(self):
+        model = OutputLengthModel(percentile=95, headroom=1.25, min_samples=3, min_tokens=100)
+        for tokens in (380, 400, 420, 400):
+            model.record("Market Overview", tokens)
+        self.assertEqual(model.max_output_tokens("Market Overview"), 525)
+        self.assertIn("300 words", model.length_hint("Market Overview"))
+        # Other sections keep the default
+        self.assertEqual(model.max_output_tokens("Risk Assessment"), 2048)
+
+    def test_bounds(self):
+        model = OutputLengthModel(min_samples=1, min_tokens=256, max_tokens=1024)
+        model.record("short", 10)
+        model.record("long", 5000)
+        self.assertEqual(model.max_output_tokens("short"), 256)
+        self.assertEqual(model.max_output_tokens("long"), 1024)
+
+    def test_truncation_raises_budget(self):
+        model = OutputLengthModel(percentile=50, headroom=1.25, min_samples=2, min_tokens=100)
+        model.record("s", 400)
+        model.record("s", 400)
+        cap = model.max_output_tokens("s")
+        for _ in range(3):
+            model.record("s", cap, truncated=True)
+        self.assertGreater(model.max_output_tokens("s"), cap)
+        stats = model.stats()["s"]
+        self.assertEqual(stats["truncated"], 3)
+        self.assertEqual(stats["truncation_rate"], 0.6)
+
+    def test_hinted_responses_do_not_ratchet(self):
+        model = OutputLengthModel(percentile=95, headroom=1.25, min_samples=3, min_tokens=100, unhinted_every=0)
+        for tokens in (400, 400, 400):
+            model.record("s", tokens)
+        hint, cap = model.length_hint("s"), model.max_output_tokens("s")
+        # Responses come in under the hint, round after round
+        for tokens in range(380, 100, -20):
+            model.record("s", tokens, hinted=True)
+        self.assertEqual(model.length_hint("s"), hint)
+        self.assertEqual(model.max_output_tokens("s"), cap)
+        stats = model.stats()["s"]
+        self.assertEqual(stats["hinted"], 14)
+        self.assertEqual(stats["baseline_p50_output_tokens"], 400)
+        self.assertLess(stats["p50_output_tokens"], 400)
+
+    def test_truncated_hinted_responses_raise_budget(self):
+        model = OutputLengthModel(percentile=50, headroom=1.25, min_samples=2, min_tokens=100)
+        model.record("s", 400)
+        model.record("s", 400)
+        cap = model.max_output_tokens("s")
+        for _ in range(3):
+            model.record("s", cap, truncated=True, hinted=True)
+        self.assertGreater(model.max_output_tokens("s"), cap)
+
+    def test_periodic_unhinted_calls(self):
+        model = OutputLengthModel(min_samples=1, unhinted_every=4)
+        self.assertIsNone(model.length_hint("s"))
+        model.record("s", 400)
+        hints = [model.length_hint("s") for _ in range(8)]
+        self.assertEqual([hint is None for hint in hints], [False, False, False, True] * 2)
+        # An unhinted response moves the hint
+        model.record("s", 800)
+        model.record("s", 800)
+        self.assertIn("600 words", model.length_hint("s"))
+
+
+if __name__ == "__main__":
+    unittest.main()
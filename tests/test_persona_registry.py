@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the persona prompt registry.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.context_builder import ChainedContext
+from src.prompts.personas import LegalPersonas, PERSONA_REGISTRY, SECTION_PERSONAS
+from src.prompts.registry import MAX_RESOLVED_KEYS, PersonaRegistry, normalize_whitespace
+
+
+class TestPersonaRegistry(unittest.TestCase):
+
+    def test_whitespace_normalized(self):
+        persona = LegalPersonas.get_persona("business_analyst")
+        self.assertTrue(persona.startswith("You are a Senior Business Analyst"))
+        self.assertNotIn("\n    ", persona)
+        self.assertNotIn("\n\n\n", persona)
+        self.assertEqual(persona.split(), LegalPersonas.BUSINESS_ANALYST_PERSONA.split())
+        self.assertEqual(normalize_whitespace("  a  \n\n\n\n   b\n"), "a\n\nb")
+
+    def test_lookup_by_key_and_alias(self):
+        self.assertEqual(PERSONA_REGISTRY.get("Market_Researcher").key, "market_researcher")
+        self.assertEqual(PERSONA_REGISTRY.get("consultant").key, "strategic_consultant")
+        # Unregistered keys resolve to the first alias they contain, as before
+        self.assertEqual(PERSONA_REGISTRY.get("senior_market_analyst").key, "business_analyst")
+        self.assertIsNone(PERSONA_REGISTRY.get("paralegal"))
+        self.assertEqual(LegalPersonas.get_persona("paralegal"), "")
+
+    def test_resolved_keys_bounded(self):
+        registry = PersonaRegistry(
+            {"business_analyst": LegalPersonas.BUSINESS_ANALYST_PERSONA}, aliases=(("analyst", "business_analyst"),)
+        )
+        self.assertEqual(registry.get("lead_analyst").key, "business_analyst")
+        for i in range(MAX_RESOLVED_KEYS + 10):
+            self.assertIsNone(registry.get(f"agent_{i}"))
+        self.assertEqual(registry.stats()["resolved_keys"], MAX_RESOLVED_KEYS)
+        # Registered keys and aliases are never evicted; evicted keys resolve again
+        self.assertEqual(registry.get("analyst").key, "business_analyst")
+        self.assertEqual(registry.get("lead_analyst").key, "business_analyst")
+
+    def test_hash_and_tokens_stable(self):
+        again = PersonaRegistry({"business_analyst": LegalPersonas.BUSINESS_ANALYST_PERSONA})
+        persona = PERSONA_REGISTRY.get("business_analyst")
+        self.assertEqual(again.get("business_analyst").hash, persona.hash)
+        self.assertGreater(persona.tokens, 0)
+
+    def test_section_templates_built_at_load(self):
+        registry = PersonaRegistry(
+            {"strategic_consultant": LegalPersonas.STRATEGIC_CONSULTANT_PERSONA},
+            sections=(("Risk Assessment", "strategic_consultant"), ("Strategic Recommendations", "strategic_consultant"))
+        )
+        self.assertEqual(registry.stats()["templates"], 2)
+        persona = registry.get("strategic_consultant").text
+        registry.template(persona, "Risk Assessment")
+        self.assertEqual(registry.stats()["templates"], 2)
+        self.assertGreaterEqual(PERSONA_REGISTRY.stats()["templates"], len(SECTION_PERSONAS))
+
+    def test_template_fill_matches_prompt_layout(self):
+        persona = LegalPersonas.get_persona("strategic_consultant")
+        template = PERSONA_REGISTRY.template(persona, "Risk Assessment")
+        self.assertIs(PERSONA_REGISTRY.template(persona, "Risk Assessment"), template)
+
+        context = ChainedContext("Alpha v. Beta")
+        context.add_section("Market Overview", "Market analysis.")
+        expected = (
+            f"{persona}\n\nCONTEXT:\n{context}\n\nTASK:\nGenerate the 'Risk Assessment' section of the legal report.\n"
+            "Focus on professional, clear, and actionable analysis.\nAim for about 400 words."
+        )
+        self.assertEqual(template.fill(context, "Aim for about 400 words."), expected)
+        self.assertEqual(template.fill(str(context), "Aim for about 400 words."), expected)
+        self.assertAlmostEqual(template.prompt_tokens(context, "Aim for about 400 words."), len(expected) / 4, delta=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-demand request profiler.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.profiler import ProfilerBusyError, RequestProfiler, _current_session, run_in_threadpool
+
+
+def busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(200))
+    return total
+
+
+class TestSessions(unittest.TestCase):
+    """Starting, claiming and finishing sessions."""
+
+    def setUp(self):
+        self.profiler = RequestProfiler()
+
+    def tearDown(self):
+        self.profiler.stop()
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            self.profiler.start(mode="tracing", requests=1)
+        with self.assertRaises(ValueError):
+            self.profiler.start()
+        with self.assertRaises(ValueError):
+            self.profiler.start(requests=0)
+
+    def test_one_session_at_a_time(self):
+        self.profiler.start(requests=1)
+        with self.assertRaises(ProfilerBusyError):
+            self.profiler.start(requests=1)
+
+    def test_request_budget(self):
+        session = self.profiler.start(mode="cprofile", requests=2)
+        self.assertIsNone(self.profiler.claim("/health"))
+        self.assertIsNone(self.profiler.claim("/debug/profile"))
+        claimed = [self.profiler.claim("/analyze"), self.profiler.claim("/analyze/stream")]
+        self.assertEqual(claimed, [session, session])
+        self.assertIsNone(self.profiler.claim("/analyze"))
+
+        self.profiler.release(session)
+        self.assertTrue(session.running)
+        self.profiler.release(session)
+        self.assertFalse(session.running)
+        self.assertEqual(session.stop_reason, "limit")
+        self.assertEqual(session.status()["requests_profiled"], 2)
+        self.assertIs(self.profiler.current(), session)
+
+    def test_time_window(self):
+        session = self.profiler.start(mode="cprofile", seconds=0.05)
+        time.sleep(0.1)
+        self.assertIsNone(self.profiler.claim("/analyze"))
+        self.assertIs(self.profiler.current(), session)
+        self.assertFalse(session.running)
+
+    def test_stop_early(self):
+        session = self.profiler.start(mode="cprofile", requests=5)
+        self.assertIs(self.profiler.stop(), session)
+        self.assertEqual(session.stop_reason, "stopped")
+        self.assertIsNone(self.profiler.stop())
+        self.profiler.start(requests=1)
+
+    def test_result_needs_finished_session(self):
+        session = self.profiler.start(mode="cprofile", requests=1)
+        with self.assertRaises(RuntimeError):
+            session.render()
+        self.profiler.stop()
+        with self.assertRaises(ValueError):
+            session.render("collapsed")
+
+
+class TestProfiles(unittest.TestCase):
+    """Collected stacks and stats."""
+
+    def setUp(self):
+        self.profiler = RequestProfiler()
+
+    def tearDown(self):
+        self.profiler.stop()
+
+    def _run_in_worker(self, session, seconds):
+        def work():
+            with session.thread():
+                busy_loop(seconds)
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+
+    def test_sampling_collapsed_stacks(self):
+        session = self.profiler.start(mode="sampling", requests=1, interval_ms=1)
+        self._run_in_worker(session, 0.2)
+        self.profiler.stop()
+
+        collapsed = session.render()
+        self.assertIn("tests/test_profiler.py:busy_loop", collapsed)
+        stack, count = collapsed.splitlines()[0].rsplit(" ", 1)
+        self.assertGreater(int(count), 0)
+        self.assertNotIn("profiler.py:", stack.replace("test_profiler.py:", ""))
+        self.assertGreater(session.status()["samples"], 10)
+
+    def test_idle_threads_not_kept(self):
+        session = self.profiler.start(mode="sampling", requests=1, interval_ms=1)
+        # A waiting thread with no frame from this project (as an idle event loop)
+        namespace = dict()
+        exec(compile(
+            "def idle(session, event):\n    with session.thread():\n        event.wait(0.1)\n",
+            "/usr/lib/python3/idle_worker.py", "exec"
+        ), namespace)
+
+        thread = threading.Thread(target=namespace["idle"], args=(session, threading.Event()))
+        thread.start()
+        thread.join()
+        self.profiler.stop()
+
+        status = session.status()
+        self.assertGreater(status["samples"], 0)
+        self.assertEqual(status["distinct_stacks"], 0)
+        self.assertEqual(status["idle_samples"], status["samples"])
+
+    def test_cprofile_pstats(self):
+        session = self.profiler.start(mode="cprofile", requests=1)
+        self._run_in_worker(session, 0.05)
+        self.profiler.stop()
+
+        report = session.render(limit=20)
+        self.assertIn("busy_loop", report)
+        self.assertIn("cumulative", report)
+
+    def test_run_in_threadpool(self):
+        session = self.profiler.start(mode="cprofile", requests=1)
+
+        async def call(bound):
+            token = _current_session.set(session if bound else None)
+            try:
+                return await run_in_threadpool(busy_loop, 0.01)
+            finally:
+                _current_session.reset(token)
+
+        self.assertGreater(asyncio.run(call(bound=False)), 0)
+        self.assertEqual(session.status()["profiled_threads"], 0)
+        self.assertGreater(asyncio.run(call(bound=True)), 0)
+        self.assertEqual(session.status()["profiled_threads"], 1)
+        self.profiler.stop()
+        self.assertIn("busy_loop", session.render())
+
+
+if __name__ == "__main__":
+    unittest.main()
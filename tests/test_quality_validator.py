@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for QualityValidator extensions beyond the TODO suite.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.quality_validator import QualityValidator, StreamCheck, split_paragraphs
+from src.models.legal_models import AnalysisReport, LegalScenario, ReportSection
+
+
+class TestStreamCheck(unittest.TestCase):
+
+    def test_on_topic_stream_passes(self):
+        check = StreamCheck(domain_check_words=20)
+        text = ("The plaintiff's patent claim shows damages because market share fell. " * 2 +
+                "Competitor growth indicates further revenue loss and litigation risk for the defendant. ")
+        for i in range(0, len(text), 7):
+            self.assertIsNone(check.feed(text[i:i + 7]))
+        self.assertIn("patent", check.domain_terms)
+
+    def test_off_topic_aborts_after_word_budget(self):
+        check = StreamCheck(domain_check_words=20)
+        reason = None
+        for word in ("Once upon a time there was a dragon who lived in a cave near the sea "
+                     "and every evening he sang songs to the moon and stars above").split():
+            reason = check.feed(word + " ")
+        self.assertTrue(reason.startswith("no domain terms"))
+
+    def test_repetition_loop_aborts(self):
+        check = StreamCheck(ngram=4, repeat_limit=3)
+        reason = None
+        for _ in range(5):
+            reason = check.feed("the court held that ") or reason
+        self.assertTrue(reason.startswith("repetition loop"))
+
+    def test_words_split_across_chunks(self):
+        check = StreamCheck()
+        check.feed("infri")
+        check.feed("ngement claim ")
+        self.assertEqual(check.words, ["infringement", "claim"])
+        self.assertIn("infringement", check.domain_terms)
+
+    def test_validator_counts_aborts(self):
+        validator = QualityValidator()
+        validator.start_stream()
+        validator.record_stream_abort("repetition loop after 40 words")
+        metrics = validator.get_quality_metrics()
+        self.assertEqual(metrics["stream_checks"], 1)
+        self.assertEqual(metrics["stream_aborts"], {"repetition loop": 1})
+
+
+STRONG = ("The plaintiff's patent infringement claim shows damages of $5 million because "
+          "market share fell from 45% to 32%.")
+WEAK = ("The situation is complicated and many things could happen over the coming "
+        "months in various ways for everyone involved here.")
+
+
+class TestParagraphValidation(unittest.TestCase):
+
+    def test_split_keeps_separators(self):
+        content = "## Heading\n\n" + STRONG + "\n \n\n" + WEAK
+        parts = split_paragraphs(content)
+        self.assertEqual(parts[::2], ["## Heading", STRONG, WEAK])
+        self.assertEqual("".join(parts), content)
+
+    def test_weak_paragraph_identified(self):
+        validator = QualityValidator()
+        results = validator.validate_paragraphs("## Heading\n\n" + STRONG + "\n\n" + WEAK, "patent damages")
+        self.assertIsNone(results[0]["score"])
+        self.assertEqual([r["weak"] for r in results], [False, False, True])
+        self.assertEqual(results[2]["index"], 2)
+
+    def test_validate_report(self):
+        scenario = LegalScenario(case_name="Case", complaint_text="Patent damages complaint",
+                                 case_type="IP", filing_date="2024-01-01")
+        section = ReportSection(type="risk", title="Risk Assessment", content="## Risk\n\n" + STRONG + "\n\n" + WEAK,
+                                agent_type="strategic_consultant", quality_score=0.9, tokens_used=10,
+                                cost=0.0, timestamp="2024-01-01T00:00:00")
+        report = AnalysisReport(scenario=scenario, sections=[section], executive_summary="", total_cost=0.0,
+                                total_tokens=10, processing_time=1.0, confidence_score=0.9,
+                                timestamp="2024-01-01T00:00:00")
+
+        result = QualityValidator().validate_report(report)
+
+        self.assertTrue(result.passed)
+        self.assertIn("Risk Assessment", result.section_scores)
+        self.assertTrue(any("paragraph 3 is weakly grounded" in issue for issue in result.issues))
+        self.assertEqual(len(result.recommendations), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
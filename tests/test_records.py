@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the slotted per-section records.
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.models.legal_models import TokenUsage
+from src.models.records import AuditRecord, SectionRecord, UsageRecord
+
+
+def make_section(content="Patent damages are material. " * 20, context="SCENARIO: Alpha v. Beta " * 30):
+    usage = UsageRecord(100, 50)
+    audit = AuditRecord(
+        section="Risk Assessment", timestamp="2024-01-01T00:00:00", latency_seconds=2.5, cost_usd=0.001,
+        tokens_used=usage.total_tokens, quality_score=0.8, generation_mode="sequential",
+        model="gemini-2.0-flash-lite", cascade_tier=0, cascade_attempts=[], content=content,
+        context=context, content_hash="abc"
+    )
+    return SectionRecord("Risk Assessment", "strategic_consultant", content, usage, audit)
+
+
+class TestRecords(unittest.TestCase):
+
+    def test_slotted(self):
+        section = make_section()
+        for record in (section, section.metrics, section.audit):
+            self.assertFalse(hasattr(record, "__dict__"))
+        with self.assertRaises(AttributeError):
+            section.extra = 1
+
+    def test_mapping_access(self):
+        section = make_section()
+        self.assertEqual(section["title"], "Risk Assessment")
+        self.assertEqual(section["audit"]["model"], "gemini-2.0-flash-lite")
+        self.assertEqual(section.get("missing", "default"), "default")
+        self.assertEqual(set(dict(section)), {"title", "agent_type", "content", "metrics", "audit"})
+        with self.assertRaises(KeyError):
+            section["_content"]
+
+    def test_previews_derived_on_access(self):
+        section = make_section()
+        audit = dict(section.audit)
+        self.assertEqual(audit["output_preview"], section.content[:300] + "...")
+        self.assertEqual(len(audit["input_context_preview"]), 303)
+        self.assertNotIn("_content", audit)
+        self.assertEqual(json.loads(json.dumps(audit))["quality_score"], 0.8)
+
+    def test_usage_conversion(self):
+        usage = UsageRecord(100, 50) + UsageRecord(10, 5)
+        self.assertEqual(usage.total_tokens, 165)
+        self.assertEqual(usage.to_model(), TokenUsage(input_tokens=110, output_tokens=55, total_tokens=165))
+        self.assertEqual(usage, dict(input_tokens=110, output_tokens=55, total_tokens=165))
+
+
+if __name__ == "__main__":
+    unittest.main()
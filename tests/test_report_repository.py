@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite report repository.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.report_repository import ReportRepository, decode_cursor, encode_cursor
+from src.models.legal_models import AnalysisReport, LegalScenario, ReportSection, TokenUsage
+
+
+def make_report(case_name, case_type="Intellectual Property", urgency="standard",
+                filing_date="2024-01-01", content="Patent infringement damages are material."):
+    scenario = LegalScenario(
+        case_name=case_name,
+        complaint_text=f"Complaint in {case_name}",
+        case_type=case_type,
+        filing_date=filing_date,
+        urgency_level=urgency
+    )
+    section = ReportSection(
+        type="risk_assessment", title="Risk Assessment", content=content, agent_type="strategic_consultant",
+        quality_score=0.8, tokens_used=150, cost=0.001, timestamp="2024-01-01T00:00:00"
+    )
+    return AnalysisReport(
+        scenario=scenario, sections=[section], executive_summary="Summary.", total_cost=0.001,
+        total_tokens=150, processing_time=1.0, confidence_score=0.8, timestamp="2024-01-01T00:00:00"
+    )
+
+
+def make_item():
+    return dict(
+        title="Risk Assessment",
+        agent_type="strategic_consultant",
+        content="Patent infringement damages are material.",
+        metrics=TokenUsage(input_tokens=100, output_tokens=50, total_tokens=150),
+        audit={
+            "section": "Risk Assessment",
+            "cost_usd": 0.001,
+            "input_context_preview": "SCENARIO: Alpha v. Beta...",
+            "output_preview": "Patent infringement damages are material." + "..."
+        }
+    )
+
+
+def make_legacy_database(reports):
+    """A schema 1 database (inline text, report_sections_fts) holding (report_id, case_name) reports."""
+    path = os.path.join(tempfile.mkdtemp(), "reports.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE reports (id INTEGER PRIMARY KEY AUTOINCREMENT, report_id TEXT NOT NULL UNIQUE, "
+        "case_name TEXT NOT NULL, case_type TEXT NOT NULL, filing_date TEXT NOT NULL, urgency TEXT NOT NULL, "
+        "created_at TEXT NOT NULL, confidence_score REAL NOT NULL, total_cost REAL NOT NULL, "
+        "reusable INTEGER NOT NULL DEFAULT 0, report_json TEXT NOT NULL, items_json TEXT NOT NULL);"
+        "CREATE VIRTUAL TABLE report_sections_fts USING fts5 (report_id UNINDEXED, title, content);"
+    )
+    item = dict(make_item(), metrics=make_item()["metrics"].model_dump())
+    for report_id, case_name in reports:
+        conn.execute(
+            "INSERT INTO reports (report_id, case_name, case_type, filing_date, urgency, created_at, "
+            "confidence_score, total_cost, reusable, report_json, items_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (report_id, case_name, "Intellectual Property", "2024-01-01", "standard", "2024-01-01", 0.8, 0.001, 1,
+             make_report(case_name).model_dump_json(), json.dumps([item]))
+        )
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestReportRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.repository = ReportRepository(":memory:")
+
+    def tearDown(self):
+        self.repository.close()
+
+    def test_round_trip_through_database(self):
+        self.repository.put("r1", make_report("Alpha v. Beta"), [make_item()], reusable=True)
+        self.repository.cache = type(self.repository.cache)(max_reports=10)
+
+        report = self.repository.get("r1")
+        self.assertEqual(report.scenario.case_name, "Alpha v. Beta")
+        items = self.repository.get_items("r1")
+        self.assertEqual(items[0]["metrics"].total_tokens, 150)
+        self.assertEqual(items[0]["audit"], make_item()["audit"])
+        self.assertEqual(items[0]["content"], make_item()["content"])
+        self.assertIsNone(self.repository.get("missing"))
+        self.assertEqual(list(self.repository.reusable_complaints(10)), [("r1", "Complaint in Alpha v. Beta")])
+
+    def test_list_paginates_newest_first(self):
+        for n in range(5):
+            self.repository.put(f"r{n}", make_report(f"Case {n}"))
+
+        page, cursor = self.repository.list_reports(limit=2)
+        self.assertEqual([row["report_id"] for row in page], ["r4", "r3"])
+        page, cursor = self.repository.list_reports(limit=2, cursor=cursor)
+        self.assertEqual([row["report_id"] for row in page], ["r2", "r1"])
+        page, cursor = self.repository.list_reports(limit=2, cursor=cursor)
+        self.assertEqual([row["report_id"] for row in page], ["r0"])
+        self.assertIsNone(cursor)
+
+    def test_list_filters(self):
+        self.repository.put("ip", make_report("IP case", urgency="high", filing_date="2024-03-01"))
+        self.repository.put("contract", make_report("Contract case", case_type="Contract Dispute"))
+
+        self.assertEqual([r["report_id"] for r in self.repository.list_reports(case_type="Contract Dispute")[0]], ["contract"])
+        self.assertEqual([r["report_id"] for r in self.repository.list_reports(urgency="HIGH")[0]], ["ip"])
+        self.assertEqual([r["report_id"] for r in self.repository.list_reports(filed_after="2024-02-01")[0]], ["ip"])
+        self.assertEqual([r["report_id"] for r in self.repository.list_reports(case_name="Contract case")[0]], ["contract"])
+
+    def test_search_sections(self):
+        self.repository.put("a", make_report("A", content="Willful infringement supports treble damages."))
+        self.repository.put("b", make_report("B", content="The supply contract was breached."))
+
+        hits, cursor = self.repository.search("treble damages")
+        self.assertEqual([hit["report_id"] for hit in hits], ["a"])
+        self.assertEqual(hits[0]["section"], "Risk Assessment")
+        self.assertIn("[damages]", hits[0]["snippet"])
+        self.assertIsNone(cursor)
+        # FTS syntax in user input is matched literally
+        self.assertEqual(self.repository.search('"contract" OR (')[0], [])
+        with self.assertRaises(ValueError):
+            self.repository.search("   ")
+
+    def test_replacing_report_reindexes_sections(self):
+        self.repository.put("a", make_report("A", content="Original patent analysis."))
+        self.repository.put("a", make_report("A", content="Revised trademark analysis."))
+        self.assertEqual(self.repository.search("patent")[0], [])
+        self.assertEqual(len(self.repository.search("trademark")[0]), 1)
+        self.assertEqual(len(self.repository), 1)
+
+    def test_iterate_streams_every_row(self):
+        for n in range(7):
+            self.repository.put(f"r{n}", make_report(f"Case {n}"))
+        with patch("src.core.report_repository.STREAM_BATCH_SIZE", 3):
+            rows = list(self.repository.iterate())
+        self.assertEqual([row["report_id"] for row in rows], [f"r{n}" for n in reversed(range(7))])
+        self.assertEqual(len(list(self.repository.iterate("damages"))), 7)
+
+    def test_persists_across_connections(self):
+        path = os.path.join(tempfile.mkdtemp(), "reports.db")
+        repository = ReportRepository(path)
+        repository.put("r1", make_report("Persisted"))
+        repository.close()
+
+        reopened = ReportRepository(path)
+        self.assertEqual(reopened.get("r1").scenario.case_name, "Persisted")
+        reopened.close()
+
+    def test_shared_text_stored_once(self):
+        self.repository.put("r1", make_report("A"), [make_item()])
+        self.repository.put("r2", make_report("B"), [make_item()])
+        # Section content (shared by both reports and their items), two complaints, one context preview
+        self.assertEqual(self.repository.stats()["blobs"]["blobs"], 4)
+
+    def test_blob_dictionary_trained_outside_put(self):
+        self.repository.blobs.train_after = 4
+        self.repository.put("r1", make_report("A"), [make_item()])
+        self.repository.put("r2", make_report("B"), [make_item()])
+        self.assertEqual(self.repository.blobs.dictionary_id, 0)
+        self.assertTrue(self.repository.blobs.training_due)
+
+        self.repository.train_blob_dictionary()
+        self.assertFalse(self.repository.blobs.training_due)
+        self.assertIsNone(self.repository.train_blob_dictionary())
+        self.assertEqual(self.repository.get("r2").scenario.case_name, "B")
+
+    def test_migrates_inline_text_databases(self):
+        path = make_legacy_database([("old", "Legacy")])
+
+        repository = ReportRepository(path)
+        self.assertEqual(repository.get("old").scenario.case_name, "Legacy")
+        self.assertEqual(repository.get_items("old")[0]["audit"], make_item()["audit"])
+        self.assertEqual(repository.search("damages")[0][0]["report_id"], "old")
+        self.assertEqual(list(repository.reusable_complaints(5)), [("old", "Complaint in Legacy")])
+        repository.close()
+
+    def test_failed_migration_keeps_legacy_reports(self):
+        path = make_legacy_database([("old-1", "Legacy 1"), ("old-2", "Legacy 2"), ("old-3", "Legacy 3")])
+        write = ReportRepository._write
+
+        def fail_on_second(repository, report_id, *args):
+            if report_id == "old-2":
+                raise RuntimeError("disk full")
+            return write(repository, report_id, *args)
+
+        with patch.object(ReportRepository, "_write", fail_on_second):
+            with self.assertRaises(RuntimeError):
+                ReportRepository(path)
+
+        conn = sqlite3.connect(path)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0], 3)
+        self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], 0)
+        self.assertIsNotNone(conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'report_sections_fts'"
+        ).fetchone())
+        conn.close()
+
+        repository = ReportRepository(path)
+        self.assertEqual([repository.get(f"old-{i}").scenario.case_name for i in (1, 2, 3)],
+                         ["Legacy 1", "Legacy 2", "Legacy 3"])
+        repository.close()
+
+    def test_cursor_encoding(self):
+        self.assertEqual(decode_cursor(encode_cursor(12345)), 12345)
+        with self.assertRaises(ValueError):
+            decode_cursor("not a cursor!")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the urgency scheduler.
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.scheduler import SchedulerRejectedError, UrgencyScheduler, normalize_urgency
+from src.models.legal_models import UrgencyLevel
+
+
+class TestUrgencyScheduler(unittest.IsolatedAsyncioTestCase):
+
+    async def _run_queued(self, scheduler, urgencies):
+        """Hold the only slot, queue the given urgencies, then record service order."""
+        order = []
+        holder = await scheduler.acquire("standard")
+
+        async def job(urgency):
+            async with scheduler.slot(urgency):
+                order.append(urgency)
+
+        tasks = [asyncio.create_task(job(u)) for u in urgencies]
+        await asyncio.sleep(0)
+        scheduler.release(holder)
+        await asyncio.gather(*tasks)
+        return order
+
+    def test_normalize_urgency(self):
+        self.assertEqual(normalize_urgency("CRITICAL"), UrgencyLevel.CRITICAL)
+        self.assertEqual(normalize_urgency("unknown"), UrgencyLevel.STANDARD)
+
+    async def test_critical_served_before_queued_low(self):
+        scheduler = UrgencyScheduler(max_concurrency=1)
+        order = await self._run_queued(scheduler, ["low", "low", "low", "critical"])
+        self.assertEqual(order[0], "critical")
+
+    async def test_weighted_share(self):
+        scheduler = UrgencyScheduler(max_concurrency=1)
+        order = await self._run_queued(scheduler, ["low"] * 4 + ["critical"] * 16)
+        # LOW is not starved: it gets a slot within the first weight-sum of dispatches
+        self.assertIn("low", order[:10])
+        self.assertEqual(order[:8].count("critical"), 7)
+
+    async def test_aging_promotes_old_requests(self):
+        scheduler = UrgencyScheduler(max_concurrency=1, aging_seconds=0.0)
+        order = await self._run_queued(scheduler, ["low", "critical", "high"])
+        self.assertEqual(order, ["low", "critical", "high"])
+        self.assertEqual(scheduler.stats()["levels"]["low"]["aged"], 1)
+
+    async def test_full_queue_preempts_lower_urgency(self):
+        scheduler = UrgencyScheduler(max_concurrency=1, max_queue=1)
+        holder = await scheduler.acquire("standard")
+        low = asyncio.create_task(scheduler.acquire("low"))
+        await asyncio.sleep(0)
+        critical = asyncio.create_task(scheduler.acquire("critical"))
+        await asyncio.sleep(0)
+
+        with self.assertRaises(SchedulerRejectedError) as ctx:
+            await low
+        self.assertGreaterEqual(ctx.exception.retry_after, 1)
+
+        # Equal or lower urgency is rejected rather than preempting
+        with self.assertRaises(SchedulerRejectedError):
+            await scheduler.acquire("low")
+
+        scheduler.release(holder)
+        ticket = await critical
+        self.assertEqual(ticket.urgency, UrgencyLevel.CRITICAL)
+        scheduler.release(ticket)
+
+        stats = scheduler.stats()
+        self.assertEqual(stats["levels"]["low"]["preempted"], 1)
+        self.assertEqual(stats["levels"]["low"]["rejected"], 1)
+        self.assertEqual(stats["in_flight"], 0)
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        scheduler = UrgencyScheduler(max_concurrency=1)
+        holder = await scheduler.acquire("standard")
+        waiter = asyncio.create_task(scheduler.acquire("high"))
+        await asyncio.sleep(0)
+        self.assertEqual(scheduler.queued, 1)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertEqual(scheduler.queued, 0)
+        scheduler.release(holder)
+        self.assertEqual(scheduler.in_flight, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
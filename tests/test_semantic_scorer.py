@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the semantic groundedness scorer.
+"""
+
+import json
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.quality_validator import QualityValidator
+from src.core.semantic_scorer import SemanticGroundednessScorer
+
+
+COMPLAINT = json.loads((project_root / "test_scenarios.json").read_text())["scenarios"][0]["complaint_text"]
+GROUNDED = ("TechFlow's market share fell from 45% to 32% after DataSync launched CloudSync. "
+            "CloudSync appears to practice the '456 Patent's real-time inventory tracking claims.")
+UNGROUNDED = "The weather was pleasant and the team enjoyed a picnic by the lake."
+
+
+class TestSemanticGroundednessScorer(unittest.TestCase):
+
+    def setUp(self):
+        self.scorer = SemanticGroundednessScorer()
+
+    def test_grounded_beats_ungrounded(self):
+        grounded = self.scorer.score(GROUNDED, COMPLAINT)
+        ungrounded = self.scorer.score(UNGROUNDED, COMPLAINT)
+        self.assertGreater(grounded["score"], 0.5)
+        self.assertEqual(ungrounded["score"], 0.0)
+        self.assertEqual(grounded["grounded_fraction"], 1.0)
+
+    def test_per_sentence_scores(self):
+        result = self.scorer.score(GROUNDED + " " + UNGROUNDED, COMPLAINT)
+        self.assertEqual(len(result["sentences"]), 3)
+        similarities = [s["similarity"] for s in result["sentences"]]
+        self.assertEqual(similarities[2], 0.0)
+        self.assertTrue(all(s > 0 for s in similarities[:2]))
+        self.assertAlmostEqual(result["grounded_fraction"], 0.67)
+
+    def test_passages_cached_across_growing_context(self):
+        self.scorer.score(GROUNDED, COMPLAINT)
+        misses = self.scorer.cache_misses
+        chained = COMPLAINT + "\n\n--- COMPLETED SECTION: Market Overview ---\n" + GROUNDED
+        self.scorer.score(GROUNDED, chained)
+        # Only the appended passages are vectorized again
+        self.assertLessEqual(self.scorer.cache_misses - misses, 2)
+        self.scorer.score(UNGROUNDED, chained)
+        self.assertEqual(self.scorer.stats()["cached_contexts"], 2)
+
+    def test_concurrent_scoring(self):
+        scorer = SemanticGroundednessScorer(passage_cache_size=4, context_cache_size=2)
+        expected = scorer.score(GROUNDED, COMPLAINT)
+        contexts = [f"{COMPLAINT}\n\nNote {i}: CloudSync shipped release {i}." for i in range(6)]
+        results, errors = list(), list()
+
+        def worker():
+            try:
+                for context in contexts * 5:
+                    scorer.score(GROUNDED, context)
+                results.append(scorer.score(GROUNDED, COMPLAINT))
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(results, [expected] * 8)
+        stats = scorer.stats()
+        self.assertLessEqual(stats["cached_passages"], 4)
+        self.assertLessEqual(stats["cached_contexts"], 2)
+
+    def test_hashing_is_deterministic(self):
+        other = SemanticGroundednessScorer()
+        self.assertEqual(self.scorer.score(GROUNDED, COMPLAINT), other.score(GROUNDED, COMPLAINT))
+
+
+class TestSemanticValidator(unittest.TestCase):
+
+    def test_semantic_groundedness_in_validation(self):
+        validator = QualityValidator(semantic=True)
+        result = validator.validate_response(GROUNDED + "\n\n" + UNGROUNDED, COMPLAINT)
+        self.assertIn("sentence_scores", result)
+        self.assertEqual(len(result["sentence_scores"]), 3)
+        # Keyword counting is still used without context
+        self.assertNotIn("sentence_scores", validator.validate_response(GROUNDED))
+
+
+if __name__ == "__main__":
+    unittest.main()
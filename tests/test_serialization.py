@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for report response serialization.
+"""
+
+import asyncio
+import gzip
+import json
+import sys
+import threading
+import unittest
+import zlib
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.serialization import ReportSerializer, negotiate_encoding
+from src.models.legal_models import AnalysisReport, LegalScenario, ReportSection
+
+
+def make_report(case_name, content):
+    scenario = LegalScenario(
+        case_name=case_name, complaint_text="Complaint.", case_type="IP", filing_date="2024-01-01"
+    )
+    section = ReportSection(
+        type="risk_assessment", title="Risk Assessment", content=content, agent_type="strategic_consultant",
+        quality_score=0.8, tokens_used=150, cost=0.001, timestamp="2024-01-01T00:00:00"
+    )
+    return AnalysisReport(
+        scenario=scenario, sections=[section], executive_summary="Summary.", total_cost=0.001,
+        total_tokens=150, processing_time=1.0, confidence_score=0.8, timestamp="2024-01-01T00:00:00"
+    )
+
+
+class TestNegotiateEncoding(unittest.TestCase):
+
+    def test_preference_and_q_values(self):
+        self.assertEqual(negotiate_encoding("gzip, deflate, br"), "gzip")
+        self.assertEqual(negotiate_encoding("deflate;q=1, gzip;q=0.5"), "deflate")
+        self.assertEqual(negotiate_encoding("gzip;q=0, deflate"), "deflate")
+        self.assertEqual(negotiate_encoding("*"), "gzip")
+        self.assertEqual(negotiate_encoding("*, gzip;q=0"), "deflate")
+
+    def test_uncompressed(self):
+        for header in (None, "", "identity", "br", "gzip;q=0", "gzip;q=bad"):
+            self.assertIsNone(negotiate_encoding(header), header)
+
+
+class TestReportSerializer(unittest.TestCase):
+
+    def setUp(self):
+        self.serializer = ReportSerializer(min_compress_bytes=1024)
+        self.report = make_report("Alpha v. Beta", content="Patent infringement damages are material. " * 100)
+
+    def test_body_matches_model_dump(self):
+        response = self.serializer.response(self.report)
+        self.assertEqual(json.loads(response.body), self.report.model_dump())
+        self.assertEqual(response.media_type, "application/json")
+        self.assertNotIn("content-encoding", response.headers)
+
+    def test_compressed_bodies(self):
+        gzipped = self.serializer.response(self.report, "gzip")
+        self.assertEqual(gzipped.headers["content-encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(gzipped.body)), self.report.model_dump())
+        self.assertLess(len(gzipped.body), int(gzipped.headers["x-uncompressed-length"]))
+
+        deflated = self.serializer.response(self.report, "deflate")
+        self.assertEqual(json.loads(zlib.decompress(deflated.body)), self.report.model_dump())
+        self.assertIn("serialize;dur=", deflated.headers["server-timing"])
+
+    def test_small_bodies_not_compressed(self):
+        response = self.serializer.response(make_report("Small", content="Short."), "gzip")
+        self.assertNotIn("content-encoding", response.headers)
+
+    def test_stats(self):
+        self.serializer.response(self.report, "gzip")
+        self.serializer.response(self.report)
+        stats = self.serializer.stats()
+        self.assertEqual((stats["responses"], stats["compressed"]), (2, 1))
+        self.assertGreater(stats["bytes_raw"], stats["bytes_out"])
+
+    def test_large_bodies_serialized_off_the_event_loop(self):
+        serializer = ReportSerializer(offload_bytes=4096)
+        threads = list()
+        serialize = serializer.serialize
+
+        def tracked(model):
+            threads.append(threading.get_ident())
+            return serialize(model)
+
+        serializer.serialize = tracked
+
+        async def respond(size_hint):
+            return await serializer.response_async(self.report, "gzip", size_hint=size_hint), threading.get_ident()
+
+        response, loop_thread = asyncio.run(respond(size_hint=100))
+        self.assertEqual(threads[-1], loop_thread)
+        response, loop_thread = asyncio.run(respond(size_hint=4096))
+        self.assertNotEqual(threads[-1], loop_thread)
+        self.assertEqual(json.loads(gzip.decompress(response.body)), self.report.model_dump())
+        self.assertEqual(serializer.stats()["offloaded"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
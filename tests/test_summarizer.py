@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the extractive executive summarizer and text utilities.
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.summarizer import ExtractiveSummarizer
+from src.utils.text import split_sentences, tokenize
+
+
+SECTIONS = [
+    ("Market Overview", (
+        "## Market\n\n"
+        "TechFlow's share of the logistics software market fell from 45% to 32% after DataSync launched its product. "
+        "The market for real-time inventory tracking grew 18% last year.\n\n"
+        "- Revenue impact is estimated at $15 million annually"
+    )),
+    ("Risk Assessment", (
+        "DataSync faces substantial damages exposure because the infringement appears willful after the notice letter. "
+        "Willful infringement can support enhanced damages of up to three times actual damages. "
+        "The weather in the region was unremarkable during the quarter."
+    )),
+    ("Strategic Recommendations", (
+        "TechFlow should seek a preliminary injunction to stop further market share loss to DataSync. "
+        "Settlement negotiations should anchor on the $15 million annual revenue impact and the willful infringement."
+    )),
+]
+
+
+class TestTextUtils(unittest.TestCase):
+
+    def test_split_sentences(self):
+        text = "## Heading\n\nDataSync Corp. infringed the patent. Damages are high!\n\n- **Bullet** point"
+        self.assertEqual(split_sentences(text), [
+            "Heading", "DataSync Corp. infringed the patent.", "Damages are high!", "Bullet point"
+        ])
+
+    def test_tokenize_keeps_figures(self):
+        self.assertEqual(tokenize("The damages were $5 million, or 45% of revenue."),
+                         ["damages", "$5", "million", "45%", "revenue"])
+
+
+class TestExtractiveSummarizer(unittest.TestCase):
+
+    def test_summary_covers_sections_in_order(self):
+        summary, stats = ExtractiveSummarizer(max_sentences=4).summarize(SECTIONS)
+
+        self.assertEqual(stats["sentences"], 4)
+        self.assertNotIn("weather", summary)
+        positions = [summary.find(text) for text in ("TechFlow's share", "DataSync faces", "TechFlow should seek")]
+        self.assertTrue(all(p >= 0 for p in positions), summary)
+        self.assertEqual(positions, sorted(positions))
+
+    def test_redundant_sentences_skipped(self):
+        repeated = [(f"Section {i}", SECTIONS[1][1]) for i in range(4)]
+        summary, stats = ExtractiveSummarizer(max_sentences=5).summarize(repeated)
+        self.assertEqual(summary.count("DataSync faces"), 1)
+
+    def test_empty_sections(self):
+        self.assertEqual(ExtractiveSummarizer().summarize([("A", "Too short.")])[0], "")
+
+    def test_large_report_is_fast(self):
+        scenarios = json.loads((project_root / "test_scenarios.json").read_text())["scenarios"]
+        sections = [(s["case_name"], s["complaint_text"]) for s in scenarios] * 10
+        _, stats = ExtractiveSummarizer().summarize(sections)
+        self.assertLess(stats["elapsed_ms"], 500)
+
+
+if __name__ == "__main__":
+    unittest.main()